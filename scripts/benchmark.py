@@ -0,0 +1,608 @@
+"""
+Benchmarks for the sffloat package. Run from the repository root:
+
+    python scripts/benchmark.py [group ...]
+
+Each benchmark reports the best time per call, in microseconds. Use --json for
+machine-readable results, --save [FILE] to store them as a baseline and
+--compare [FILE] to report the change against a stored baseline (FILE defaults
+to scripts/benchmark_baseline.json, the committed baseline); the comparison
+exits with status 1 if any benchmark is slower than the baseline by more than
+--threshold (10% by default).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import operator
+import os
+import pickle
+import platform
+import subprocess
+import sys
+import timeit
+from math import pi
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# pylint: disable=wrong-import-position
+import sffloat
+from sffloat import (
+    SFFloat,
+    SFArray,
+    SFExact,
+    SFTraced,
+    SFUncertain,
+    SFUncertainArray,
+    SFQuantity,
+    SFQuantityArray,
+    sfsin,
+    sfmath,
+    sfsum,
+    sfprod,
+    sfstdev,
+)
+from sffloat.sfformat import format_sigfigs
+from sffloat.sftable import format_many
+from sffloat.sfparse import parse, iter_values, iter_batches
+from sffloat import sfstore, sfcache, sfparallel, sfprofile, sfstream
+from sffloat.sfexpr import var
+from sffloat.sfcompile import compile as sfcompile
+
+BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json"
+)
+
+BENCHMARKS = {}
+
+
+def benchmark(group, name):
+    """
+    Register a benchmark. The decorated function performs any setup and returns
+    the zero-argument callable that is timed, or a tuple of that callable and a
+    cleanup function to call afterwards.
+    """
+
+    def register(setup):
+        BENCHMARKS.setdefault(group, []).append((name, setup))
+        return setup
+
+    return register
+
+
+@benchmark("core", "SFFloat.sigfigs")
+def _bench_sigfigs():
+    value = SFFloat(pi, lsd=-3)
+    return lambda: value.sigfigs
+
+
+@benchmark("core", "sorted(1000 SFFloat)")
+def _bench_sorted():
+    values = [SFFloat(pi * (i * 7919 % 1000), 3) for i in range(1000)]
+    return lambda: sorted(values)
+
+
+@benchmark("core", "sorted(1000 SFFloat, key=SFFloat.sort_key)")
+def _bench_sort_key():
+    values = [SFFloat(pi * (i * 7919 % 1000), 3) for i in range(1000)]
+    return lambda: sorted(values, key=SFFloat.sort_key)
+
+
+@benchmark("import", "python -c 'import sffloat'")
+def _bench_import():
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    command = [sys.executable, "-c", "import sffloat"]
+    return lambda: subprocess.run(command, cwd=root, check=True)
+
+
+@benchmark("construction", "SFFloat(value, sigfigs)")
+def _bench_new_sigfigs():
+    return lambda: SFFloat(pi, 4)
+
+
+@benchmark("construction", "SFFloat(value, lsd=lsd)")
+def _bench_new_lsd():
+    return lambda: SFFloat(pi, lsd=-3)
+
+
+@benchmark("construction", "SFFloat(value)")
+def _bench_new_unlimited():
+    return lambda: SFFloat(pi)
+
+
+OPERATORS = [
+    ("+", operator.add),
+    ("-", operator.sub),
+    ("*", operator.mul),
+    ("/", operator.truediv),
+    ("**", operator.pow),
+]
+COMPARISONS = [
+    ("<", operator.lt),
+    (">", operator.gt),
+    ("<=", operator.le),
+    (">=", operator.ge),
+    ("==", operator.eq),
+    ("!=", operator.ne),
+]
+
+
+def _register_binary(group, symbol, func):
+    """
+    Register benchmarks of a binary operator with SFFloat and mixed operands.
+    """
+    a, b = SFFloat(pi, 4), SFFloat(2.5, lsd=-1)
+    for name, left, right in [
+        (f"SFFloat {symbol} SFFloat", a, b),
+        (f"SFFloat {symbol} float", a, 2.5),
+        (f"float {symbol} SFFloat", 2.5, a),
+    ]:
+        benchmark(group, name)(lambda x=left, y=right: lambda: func(x, y))
+
+
+for _symbol, _func in OPERATORS:
+    _register_binary("arithmetic", _symbol, _func)
+for _symbol, _func in COMPARISONS:
+    _register_binary("comparison", _symbol, _func)
+
+
+@benchmark("arithmetic", "SFFloat + SFFloat (sfprofile)")
+def _bench_add_profiled():
+    a, b = SFFloat(pi, 4), SFFloat(2.5, lsd=-1)
+    sfprofile.enable()
+    return (lambda: a + b), sfprofile.disable
+
+
+@benchmark("arithmetic", "SFTraced + SFTraced")
+def _bench_add_traced():
+    a, b = SFTraced(pi, 4), SFTraced(2.5, lsd=-1)
+    return lambda: a + b
+
+
+@benchmark("arithmetic", "-SFFloat")
+def _bench_neg():
+    a = SFFloat(pi, 4)
+    return lambda: -a
+
+
+@benchmark("arithmetic", "abs(SFFloat)")
+def _bench_abs():
+    a = SFFloat(-pi, 4)
+    return lambda: abs(a)
+
+
+MATH_FUNCTIONS = [
+    ("sfsin", (0.5,)),
+    ("sfcos", (0.5,)),
+    ("sftan", (0.5,)),
+    ("sflog", (0.5,)),
+    ("sflog10", (0.5,)),
+    ("sfasin", (0.5,)),
+    ("sfacos", (0.5,)),
+    ("sfatan", (0.5,)),
+    ("sfatan2", (0.5, 2.5)),
+    ("sfexp", (0.5,)),
+    ("sfpow", (0.5, 2.5)),
+    ("sfsqrt", (0.5,)),
+    ("sfdegrees", (0.5,)),
+    ("sfradians", (0.5,)),
+    ("sfexp2", (0.5,)),
+    ("sfexpm1", (0.5,)),
+    ("sflog1p", (0.5,)),
+    ("sfsinh", (0.5,)),
+    ("sfcosh", (0.5,)),
+    ("sftanh", (0.5,)),
+    ("sfasinh", (0.5,)),
+    ("sfacosh", (1.5,)),
+    ("sfatanh", (0.5,)),
+    ("sflog2", (0.5,)),
+    ("sfcbrt", (0.5,)),
+    ("sfhypot", (0.5, 2.5)),
+]
+
+for _name, _args in MATH_FUNCTIONS:
+    benchmark("math", f"{_name}(SFFloat)")(
+        lambda f=getattr(sffloat, _name), a=tuple(SFFloat(x, 3) for x in _args): (
+            lambda: f(*a)
+        )
+    )
+
+
+@benchmark("math", "sfsin(float)")
+def _bench_sfsin_float():
+    return lambda: sfsin(0.5)
+
+
+@benchmark("math", "sfsin over 1000 values")
+def _bench_sfsin_loop():
+    values = [SFFloat(i / 1000, 3) for i in range(1000)]
+    return lambda: [sfsin(v) for v in values]
+
+
+@benchmark("math", "sfmath.sin(list of 1000)")
+def _bench_sfmath_list():
+    values = [SFFloat(i / 1000, 3) for i in range(1000)]
+    return lambda: sfmath.sin(values)
+
+
+@benchmark("math", "sfmath.sin(SFArray of 1000)")
+def _bench_sfmath_array():
+    values = SFArray([i / 1000 for i in range(1000)], 3)
+    return lambda: sfmath.sin(values)
+
+
+@benchmark("reduce", "sum(1000 SFFloat)")
+def _bench_sum():
+    values = [SFFloat(i * 0.0137, 4) for i in range(1, 1001)]
+    return lambda: sum(values)
+
+
+@benchmark("reduce", "sfsum(1000 SFFloat)")
+def _bench_sfsum():
+    values = [SFFloat(i * 0.0137, 4) for i in range(1, 1001)]
+    return lambda: sfsum(values)
+
+
+@benchmark("reduce", "sfsum(SFArray of 1000)")
+def _bench_sfsum_array():
+    values = SFArray([i * 0.0137 for i in range(1, 1001)], 4)
+    return lambda: sfsum(values)
+
+
+@benchmark("reduce", "math.prod(1000 SFFloat)")
+def _bench_prod():
+    values = [SFFloat(1 + i * 1e-4, 4) for i in range(1, 1001)]
+    return lambda: math.prod(values)
+
+
+@benchmark("reduce", "sfprod(1000 SFFloat)")
+def _bench_sfprod():
+    values = [SFFloat(1 + i * 1e-4, 4) for i in range(1, 1001)]
+    return lambda: sfprod(values)
+
+
+@benchmark("reduce", "sfstdev(1000 SFFloat)")
+def _bench_sfstdev():
+    values = [SFFloat(i * 0.0137, 4) for i in range(1, 1001)]
+    return lambda: sfstdev(values)
+
+
+def _register_exact(cls):
+    """
+    Register the benchmarks of the exact group for SFFloat or SFExact.
+    """
+    name = cls.__name__
+    a, b = cls(pi, 4), cls(2.5, lsd=-1)
+    benchmark("exact", f"{name}(value, sigfigs)")(lambda: lambda: cls(pi, 4))
+    for symbol, func in OPERATORS[:4]:
+        benchmark("exact", f"{name} {symbol} {name}")(lambda f=func: lambda: f(a, b))
+    benchmark("exact", f"str({name})")(lambda: lambda: str(a))
+
+
+_register_exact(SFFloat)
+_register_exact(SFExact)
+
+
+@benchmark("uncertain", "SFUncertain * SFUncertain")
+def _bench_uncertain_mul():
+    a, b = SFUncertain(pi, 0.002), SFUncertain(2.5, 0.05)
+    return lambda: a * b
+
+
+@benchmark("uncertain", "sfsin(SFUncertain)")
+def _bench_uncertain_sin():
+    a = SFUncertain(pi, 0.002)
+    return lambda: sfsin(a)
+
+
+@benchmark("uncertain", "sfmath.sin(list of 1000 SFUncertain)")
+def _bench_uncertain_list():
+    values = [SFUncertain(i / 1000, 0.002) for i in range(1000)]
+    return lambda: sfmath.sin(values)
+
+
+@benchmark("uncertain", "sfmath.sin(SFUncertainArray of 1000)")
+def _bench_uncertain_array():
+    values = SFUncertainArray([i / 1000 for i in range(1000)], 0.002)
+    return lambda: sfmath.sin(values)
+
+
+@benchmark("units", "SFQuantity + SFQuantity, same unit")
+def _bench_quantity_add():
+    a, b = SFQuantity(1.5, 3, "km"), SFQuantity(0.25, 3, "km")
+    return lambda: a + b
+
+
+@benchmark("units", "SFQuantity + SFQuantity, converted")
+def _bench_quantity_add_converted():
+    a, b = SFQuantity(1.5, 3, "km"), SFQuantity(250.0, 3, "m")
+    return lambda: a + b
+
+
+@benchmark("units", "SFQuantity * SFQuantity")
+def _bench_quantity_mul():
+    a, b = SFQuantity(1.5, 3, "km"), SFQuantity(2.0, 2, "h")
+    return lambda: a * b
+
+
+@benchmark("units", "SFQuantityArray of 1000 + converted")
+def _bench_quantity_array():
+    a = SFQuantityArray([i / 1000 for i in range(1000)], 3, "km")
+    b = SFQuantityArray([float(i) for i in range(1000)], 3, "m")
+    return lambda: a + b
+
+
+@benchmark("parse", "iter_values over 1000 literals")
+def _bench_iter_values():
+    lines = [f"{i * 0.0137:.4f}" for i in range(1000)]
+    return lambda: list(iter_values(lines))
+
+
+@benchmark("parse", "iter_batches over 1000 rows")
+def _bench_iter_batches():
+    lines = [f"{i * 0.0137:.4f},{i}" for i in range(1000)]
+    return lambda: list(iter_batches(lines))
+
+
+@benchmark("stream", "sfstream parse, sin and format of 10000 readings")
+def _bench_stream():
+    lines = [f"{i * 0.0137:.4f}" for i in range(10000)]
+
+    async def pipeline():
+        batches = sfstream.parse(sfstream.memory_feed(lines))
+        async for _ in sfstream.format(sfstream.transform(batches, sfmath.sin)):
+            pass
+
+    return lambda: asyncio.run(pipeline())
+
+
+@benchmark("stream", "one at a time parse, sfsin and str of 10000 readings")
+def _bench_stream_scalar():
+    lines = [f"{i * 0.0137:.4f}" for i in range(10000)]
+
+    async def pipeline():
+        async for line in sfstream.memory_feed(lines):
+            str(sfsin(parse(line)))
+
+    return lambda: asyncio.run(pipeline())
+
+
+@benchmark("store", "pickle round trip of 10000 SFFloat")
+def _bench_pickle():
+    values = [SFFloat(i * 0.0137, 4) for i in range(10000)]
+    return lambda: pickle.loads(pickle.dumps(values, pickle.HIGHEST_PROTOCOL))
+
+
+@benchmark("store", "sfstore round trip of 10000 values")
+def _bench_sfstore():
+    values = SFArray([i * 0.0137 for i in range(10000)], 4)
+    return lambda: sfstore.loads(sfstore.dumps(values))
+
+
+@benchmark("expr", "eager (x*y+1)/(x*y+1)")
+def _bench_eager():
+    x, y = SFFloat(0.5, 3), SFFloat(1.25, 2)
+    return lambda: (x * y + 1) / (x * y + 1)
+
+
+@benchmark("expr", "deferred (x*y+1)/(x*y+1)")
+def _bench_deferred():
+    x, y = var("x"), var("y")
+    expr = (x * y + 1) / (x * y + 1)
+    xv, yv = SFFloat(0.5, 3), SFFloat(1.25, 2)
+    return lambda: expr.evaluate(x=xv, y=yv)
+
+
+@benchmark("expr", "compiled (x*y+1)/(x*y+1)")
+def _bench_compiled():
+    kernel = sfcompile("(x*y+1)/(x*y+1)", vars=["x", "y"])
+    xv, yv = SFFloat(0.5, 3), SFFloat(1.25, 2)
+    return lambda: kernel(xv, yv)
+
+
+def _register_parallel(workers):
+    """
+    Register a benchmark of sfparallel.map with a number of worker processes.
+    """
+
+    @benchmark("parallel", f"kernel over 1000000 values, {workers} worker(s)")
+    def _bench_parallel():
+        values = SFArray([i * 1e-6 for i in range(1, 1000001)], 4)
+        kernel = sfcompile("sqrt(x) * exp(-x) + sin(x) ** 2", vars=["x"])
+        return lambda: sfparallel.map(kernel, values, workers=workers)
+
+
+for _workers in (1, 2, 4, 8):
+    _register_parallel(_workers)
+
+
+@benchmark("format", "SFFloat.__str__")
+def _bench_str():
+    values = [SFFloat(pi * 10**e, 4) for e in range(-6, 7)]
+    return lambda: [str(v) for v in values]
+
+
+@benchmark("format", "SFFloat.__format__")
+def _bench_format():
+    values = [SFFloat(pi * 10**e, 4) for e in range(-6, 7)]
+    return lambda: [f"{v:.3f}" for v in values]
+
+
+@benchmark("format", "SFFloat.__str__ (sfcache)")
+def _bench_str_cached():
+    values = [SFFloat(pi * 10**e, 4) for e in range(-6, 7)]
+    sfcache.enable()
+    return (lambda: [str(v) for v in values]), sfcache.disable
+
+
+@benchmark("format", "sfformat.format_sigfigs")
+def _bench_format_sigfigs():
+    values = [pi * 10**e for e in range(-6, 7)]
+    return lambda: [format_sigfigs(v, 4) for v in values]
+
+
+@benchmark("format", "sigfig.round (reference)")
+def _bench_sigfig_round():
+    try:
+        import sigfig  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    values = [pi * 10**e for e in range(-6, 7)]
+    notations = ["std" if 0.001 < v < 1000 else "sci" for v in values]
+
+    def run():
+        return [sigfig.round(v, 4, notation=n) for v, n in zip(values, notations)]
+
+    return run
+
+
+@benchmark("format", "str of SFArray of 10000")
+def _bench_str_array():
+    values = SFArray([i * 0.0137 for i in range(10000)], lsd=-3)
+    return lambda: [str(value) for value in values]
+
+
+@benchmark("format", "format_many of SFArray of 10000")
+def _bench_format_many_array():
+    values = SFArray([i * 0.0137 for i in range(10000)], lsd=-3)
+    return lambda: format_many(values)
+
+
+@benchmark("format", "str of list of 10000 SFFloat")
+def _bench_str_list():
+    values = [SFFloat(i * 0.0137, lsd=-3) for i in range(10000)]
+    return lambda: [str(value) for value in values]
+
+
+@benchmark("format", "format_many of list of 10000 SFFloat")
+def _bench_format_many_list():
+    values = [SFFloat(i * 0.0137, lsd=-3) for i in range(10000)]
+    return lambda: format_many(values)
+
+
+def run_benchmark(setup, repeat=5):
+    """
+    Return the best time per call of a benchmark, in seconds, or None if the
+    benchmark is not available.
+    """
+    func = setup()
+    if func is None:
+        return None
+    func, cleanup = func if isinstance(func, tuple) else (func, None)
+    try:
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        return min(timer.repeat(repeat, number)) / number
+    finally:
+        if cleanup is not None:
+            cleanup()
+
+
+def run_groups(groups, repeat=5, verbose=True):
+    """
+    Run the benchmark groups (all groups if none are given), printing the results
+    if verbose. Return the results as {group: {name: seconds per call}}.
+    """
+    results = {}
+    for group in groups or BENCHMARKS:
+        if group not in BENCHMARKS:
+            raise SystemExit(f"Unknown benchmark group {group!r}.")
+        results[group] = {}
+        if verbose:
+            print(f"[{group}]")
+        for name, setup in BENCHMARKS[group]:
+            best = run_benchmark(setup, repeat)
+            results[group][name] = best
+            if not verbose:
+                continue
+            if best is None:
+                print(f"  {name:44s} unavailable")
+            else:
+                print(f"  {name:44s} {best * 1e6:12.2f} us")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the change of every result against a baseline and return the list of
+    (group, name, ratio) for results slower than the baseline by more than the
+    threshold fraction.
+    """
+    regressions = []
+    for group, times in results.items():
+        print(f"[{group}]")
+        for name, best in times.items():
+            old = baseline.get(group, {}).get(name)
+            if best is None or old is None:
+                print(f"  {name:44s} {'no baseline' if old is None else 'unavailable'}")
+                continue
+            ratio = best / old
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions.append((group, name, ratio))
+            print(f"  {name:44s} {best * 1e6:12.2f} us {ratio - 1:+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    """
+    Run benchmarks from the command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("groups", nargs="*", help="benchmark groups to run")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument(
+        "--save",
+        metavar="FILE",
+        nargs="?",
+        const=BASELINE,
+        help="save results as a baseline (default: the committed baseline)",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        nargs="?",
+        const=BASELINE,
+        help="compare with a baseline (default: the committed baseline)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown fraction reported as a regression (default 0.1)",
+    )
+    args = parser.parse_args(argv)
+    if args.list:
+        for group, entries in BENCHMARKS.items():
+            for name, _ in entries:
+                print(f"{group}: {name}")
+        return 0
+    quiet = args.json or args.compare is not None
+    results = run_groups(args.groups, args.repeat, verbose=not quiet)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": sffloat.sffloat.BACKEND,
+        "results": results,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as stream:
+            baseline = json.load(stream)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 #!/bin/bash
 black --check sffloat || { echo 'black failed (use black first)' ; exit 1; }
 python3 -m pylint -r n sffloat || { echo 'pylint failed' ; exit 1; }
-python3 -m nose2 || { echo 'automatic test failed' ; exit 1; }
\ No newline at end of file
+python3 -m nose2 || { echo 'automatic test failed' ; exit 1; }
+SFFLOAT_PURE_PYTHON=1 python3 -m nose2 || { echo 'pure Python test failed' ; exit 1; }
\ No newline at end of file
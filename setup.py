@@ -19,7 +19,12 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/tiggerntatie/sffloat",
     packages=setuptools.find_packages(),
-    install_requires=['sigfig>=1.1.8',],
+    # the accelerated core is optional: sffloat falls back to pure Python without it
+    ext_modules=[
+        setuptools.Extension("sffloat._sfcore", ["sffloat/_sfcore.c"], optional=True)
+    ],
+    install_requires=[],
+    extras_require={'array': ['numpy'], 'sigfig': ['sigfig>=1.1.8'],},
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
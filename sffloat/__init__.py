@@ -1,5 +1,9 @@
 """
 sffloat package defines names that may be imported directly
+
+SFArray, SFUncertain, SFUncertainArray, SFQuantity, SFQuantityArray, format_many and
+compile, which need NumPy, are imported on first use so that importing the package
+stays fast.
 """
 
 from .__version__ import VERSION
@@ -16,3 +20,79 @@ from .sffloat import (
     sfatan2,
 )
 from .sffloat import sfexp, sfpow, sfsqrt, sfdegrees, sfradians
+from .sffloat import sfsinh, sfcosh, sftanh, sfasinh, sfacosh, sfatanh
+from .sffloat import sflog2, sflog1p, sfexp2, sfexpm1, sfcbrt, sfhypot
+from .sfexact import SFExact
+from .sftrace import SFTraced
+from .sfreduce import sfsum, sffsum, sfprod, sfmean, sfstdev
+
+# compile is left out so that "from sffloat import *" keeps the builtin
+__all__ = [
+    "VERSION",
+    "SFFloat",
+    "SFArray",  # pylint: disable=undefined-all-variable
+    "SFExact",
+    "SFTraced",
+    "SFUncertain",  # pylint: disable=undefined-all-variable
+    "SFUncertainArray",  # pylint: disable=undefined-all-variable
+    "SFQuantity",  # pylint: disable=undefined-all-variable
+    "SFQuantityArray",  # pylint: disable=undefined-all-variable
+    "format_many",  # pylint: disable=undefined-all-variable
+    "sfsin",
+    "sfcos",
+    "sftan",
+    "sflog",
+    "sflog10",
+    "sfasin",
+    "sfacos",
+    "sfatan",
+    "sfatan2",
+    "sfexp",
+    "sfpow",
+    "sfsqrt",
+    "sfdegrees",
+    "sfradians",
+    "sfsinh",
+    "sfcosh",
+    "sftanh",
+    "sfasinh",
+    "sfacosh",
+    "sfatanh",
+    "sflog2",
+    "sflog1p",
+    "sfexp2",
+    "sfexpm1",
+    "sfcbrt",
+    "sfhypot",
+    "sfsum",
+    "sffsum",
+    "sfprod",
+    "sfmean",
+    "sfstdev",
+]
+
+
+def __getattr__(name):
+    """
+    Import SFArray, SFUncertain, SFUncertainArray, SFQuantity, SFQuantityArray,
+    format_many and compile on first use.
+    """
+    # pylint: disable=import-outside-toplevel
+    if name == "SFArray":
+        from .sfarray import SFArray as value
+    elif name in ("SFUncertain", "SFUncertainArray"):
+        from . import sfuncertain
+
+        value = getattr(sfuncertain, name)
+    elif name in ("SFQuantity", "SFQuantityArray"):
+        from . import sfunits
+
+        value = getattr(sfunits, name)
+    elif name == "format_many":
+        from .sftable import format_many as value
+    elif name == "compile":
+        from .sfcompile import compile as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -0,0 +1,314 @@
+"""
+The _pycore module defines the pure Python :class:`SFCore` class, the base of
+:class:`SFFloat` that stores the value and least significant digit and implements
+arithmetic, comparisons and the significant figures computation.
+
+The optional ``sffloat._sfcore`` C extension defines an accelerated SFCore with
+exactly the same behavior, which is used when it is available. The C class falls
+back on this module's :meth:`SFCore.__init__` for uncommon constructor arguments.
+"""
+
+import math
+
+
+class SFCore:
+    """
+    The _pycore :class:`SFCore` class is the pure Python core of :class:`SFFloat`.
+    See :class:`SFFloat` for the constructor arguments."""
+
+    # _sf holds inf for unlimited precision, otherwise the sigfigs once computed
+    __slots__ = ("_val", "_lsd", "_sf")
+
+    inf = float("inf")
+
+    def __new__(cls, val, sigfigs=None, **_):
+        if isinstance(val, cls) and sigfigs is None:
+            return val
+        return super().__new__(cls)
+
+    def __init__(self, value, sigfigs=None, **kwargs):
+        if sigfigs and not isinstance(sigfigs, int) and sigfigs != self.inf:
+            raise ValueError("Invalid value for sigfigs.")
+        if sigfigs == self.inf:
+            sigfigs = None  # unlimited precision
+        if sigfigs is None and self is value:
+            return  # just passthru
+        self._lsd = kwargs.get("lsd", None)
+        if self._lsd is not None and sigfigs is not None:
+            raise ValueError("Can not specify both lsd and sigfigs.")
+        # passing value only - infinite sigfigs
+        if self._lsd is None and sigfigs is None:
+            self._sf = self.inf
+        # passing lsd value, set _sf to None until sigfigs is needed
+        elif self._lsd is not None:
+            self._sf = None
+        # sigfigs must be set - figure out lsd
+        else:
+            msd = self._msd_from_val(value)
+            self._lsd = msd - (sigfigs - 1)
+            self._sf = msd - self._lsd + 1
+        self._val = float(value)
+
+    @classmethod
+    def _from_parts(cls, val, lsd, sf=None):
+        """
+        Return a new instance built from trusted parts, skipping validation and
+        coercion: val must be a float, lsd the lsd position (None for unlimited
+        precision) and sf the sigfigs, if already known.
+        """
+        retval = object.__new__(cls)
+        retval._val = val
+        retval._lsd = lsd
+        retval._sf = cls.inf if lsd is None else sf
+        return retval
+
+    @classmethod
+    def _parts_of(cls, other):
+        """
+        Return the value, lsd and sigfigs of other, an SFFloat or a number.
+        """
+        if isinstance(other, SFCore):
+            return other.value, other.lsd, other.sigfigs
+        if isinstance(other, (float, int)):
+            return float(other), None, cls.inf
+        other = cls(other)
+        return other.value, other.lsd, other.sigfigs
+
+    @classmethod
+    def _value_of(cls, other):
+        """
+        Return the value of other, an SFFloat or a number, for comparisons.
+        """
+        if isinstance(other, SFCore):
+            return other._val  # pylint: disable=protected-access
+        if isinstance(other, (float, int)):
+            return float(other)
+        return cls(other).value
+
+    @classmethod
+    def _sigfigs_of(cls, other):
+        """
+        Return the sigfigs of other, an SFFloat or a number, for comparisons.
+        """
+        if isinstance(other, SFCore):
+            return other.sigfigs
+        if isinstance(other, (float, int)):
+            return cls.inf
+        return cls(other).sigfigs
+
+    @property
+    def sigfigs(self):
+        """
+        Return the number of significant figures for this value
+        """
+        if self._sf is None:
+            self._sf = self._msd_from_val(self._val) - self._lsd + 1
+        return self._sf
+
+    @property
+    def value(self):
+        """
+        Return the full-precision internal value
+        """
+        return self._val
+
+    @property
+    def lsd(self):
+        """
+        Return the position of the least significant digit.
+        0 means 1's place, 1 means 10's place, -1 means 0.1's place, etc.
+        """
+        return self._lsd
+
+    @staticmethod
+    def _msd_from_val(val):
+        """
+        Return the position of the most significant digit.
+        0 means 1's place, 1 means 10's place, -1 means 0.1's place, etc.
+        """
+        if not val:
+            return 0
+        return math.floor(math.log10(abs(val)))
+
+    @classmethod
+    def _multiplicative_func(cls, func, arg1, arg2):
+        """
+        Perform method func on its object arg1, and other arg2.
+        """
+        try:
+            val2, _, sf2 = cls._parts_of(arg2)
+        except TypeError:
+            return NotImplemented
+        minsigfig = min(arg1.sigfigs, sf2)
+        if minsigfig <= 0:
+            raise ValueError(
+                f"Precision of {func} with zero sigfig operand is undefined."
+            )
+        val = func(arg1.value, val2)
+        if not isinstance(val, float):
+            val = float(val)  # e.g. complex result of a fractional power
+        if minsigfig == cls.inf:
+            return cls._from_parts(val, None)
+        lsd = cls._msd_from_val(val) - (minsigfig - 1)
+        return cls._from_parts(val, lsd, minsigfig)
+
+    @classmethod
+    def _additive_func(cls, func, arg1, arg2):
+        """
+        Perform method func on its object arg1, and other arg2.
+        """
+        try:
+            val2, lsd2, _ = cls._parts_of(arg2)
+        except TypeError:
+            return NotImplemented
+        lsd = arg1.lsd
+        if lsd is None:
+            lsd = lsd2
+        elif lsd2 is not None and lsd2 > lsd:
+            lsd = lsd2
+        return cls._from_parts(func(arg1.value, val2), lsd)
+
+    def __float__(self):
+        return self._val
+
+    def __add__(self, other):
+        """
+        Implements addition.
+        """
+        return self._additive_func(float.__add__, self, other)
+
+    def __radd__(self, other):
+        """
+        Implements reflected addition.
+        """
+        return self + other
+
+    def __sub__(self, other):
+        """
+        Implements subtraction.
+        """
+        return self._additive_func(float.__sub__, self, other)
+
+    def __rsub__(self, other):
+        """
+        Implements reflected subtraction.
+        """
+        return self._additive_func(float.__rsub__, self, other)
+
+    def __mul__(self, other):
+        """
+        Implements multiplication.
+        """
+        return self._multiplicative_func(float.__mul__, self, other)
+
+    def __rmul__(self, other):
+        """
+        Implements reflected multiplication.
+        """
+        return self._multiplicative_func(float.__rmul__, self, other)
+
+    def __truediv__(self, other):
+        """
+        Implements true division.
+        """
+        return self._multiplicative_func(float.__truediv__, self, other)
+
+    def __rtruediv__(self, other):
+        """
+        Implements reflected true division.
+        """
+        return self._multiplicative_func(float.__rtruediv__, self, other)
+
+    def __pow__(self, other):
+        """
+        Implements behavior for exponents using the ** operator.
+        """
+        return self._multiplicative_func(float.__pow__, self, other)
+
+    def __rpow__(self, other):
+        """
+        Implements behavior for reflected exponents using the ** operator.
+        """
+        return self._multiplicative_func(float.__rpow__, self, other)
+
+    def __eq__(self, other):
+        """
+        Implements equality operator: ==
+        Checks for matching value and sigfigs. Values that are not numbers (e.g.
+        None) are left to other, then compared by identity.
+        """
+        try:
+            val = self._value_of(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+        return self._val == val and self.sigfigs == self._sigfigs_of(other)
+
+    def __hash__(self):
+        """
+        Implements hashing, consistent with the == operator: equal values with
+        equal sigfigs hash equally. A value with unlimited sigfigs is equal to,
+        and hashes the same as, the corresponding float.
+        """
+        if self._sf is self.inf:
+            return hash(self._val)
+        return hash((self._val, self.sigfigs))
+
+    def __ne__(self, other):
+        """
+        Implements not equal operator: !=
+        Checks for mismatching value or sigfig.
+        """
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __lt__(self, other):
+        """
+        Implements less than operator: <
+        This compares the raw values and considers sig figs
+        """
+        return self._val < self._value_of(other)
+
+    def __gt__(self, other):
+        """
+        Implements greater than operator: >
+        This compares the raw values and considers sig figs
+        """
+        return self._val > self._value_of(other)
+
+    def __le__(self, other):
+        """
+        Implements less than operator: <
+        This compares the raw values and considers sig figs
+        """
+        val = self._value_of(other)
+        return self._val < val or (
+            self._val == val and self.sigfigs == self._sigfigs_of(other)
+        )
+
+    def __ge__(self, other):
+        """
+        Implements greater than operator: >
+        This compares the raw values and considers sig figs
+        """
+        val = self._value_of(other)
+        return self._val > val or (
+            self._val == val and self.sigfigs == self._sigfigs_of(other)
+        )
+
+    def __pos__(self):
+        """
+        Implements the unary + operator. This does nothing.
+        """
+        return self
+
+    def __neg__(self):
+        """
+        Implements the unary - operator. Makes value negative.
+        """
+        return self._from_parts(-self._val, self._lsd, self._sf)
+
+    def __abs__(self):
+        """
+        Implements the absolute value function.
+        """
+        return self._from_parts(abs(self._val), self._lsd, self._sf)
@@ -0,0 +1,899 @@
+/*
+ * The _sfcore extension module defines SFCore, the accelerated base class of
+ * SFFloat. It stores the value and least significant digit and implements the
+ * arithmetic, comparisons and significant figures computation of the pure Python
+ * class in sffloat/_pycore.py, with exactly the same behavior. Uncommon
+ * constructor arguments are handed to the pure Python SFCore.__init__.
+ *
+ * lsd and sigfigs are kept as Python objects, as in the pure Python class: lsd is
+ * None for unlimited precision, and sf is the inf class attribute for unlimited
+ * precision, None until sigfigs are first computed, or the sigfigs.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <structmember.h>
+#include <math.h>
+
+typedef struct {
+    PyObject_HEAD
+    double val;
+    PyObject *lsd;
+    PyObject *sf;
+} SFCoreObject;
+
+static PyTypeObject SFCoreType;
+
+#define SFCore_Check(op) PyObject_TypeCheck(op, &SFCoreType)
+
+static PyObject *INF;        /* float("inf"), the SFCore.inf class attribute */
+static PyObject *ZERO;
+static PyObject *ONE;
+static PyObject *py_init;    /* pure Python SFCore.__init__ */
+static PyObject *py_msd;     /* pure Python SFCore._msd_from_val */
+
+/* float methods named in error messages, as the pure Python class does */
+enum { OP_MUL, OP_RMUL, OP_DIV, OP_RDIV, OP_POW, OP_RPOW, OP_COUNT };
+static const char *float_method_names[OP_COUNT] = {
+    "__mul__", "__rmul__", "__truediv__", "__rtruediv__", "__pow__", "__rpow__",
+};
+static PyObject *float_methods[OP_COUNT];
+
+/* Return the position of the most significant digit of val, as an int. */
+static PyObject *
+msd_from_double(double val)
+{
+    if (val == 0.0) {
+        return PyLong_FromLong(0);
+    }
+    return PyLong_FromDouble(floor(log10(fabs(val))));
+}
+
+/* Return lsd - (sigfigs - 1) style results: a - (b - c). */
+static PyObject *
+sub_sub(PyObject *a, PyObject *b, PyObject *c)
+{
+    PyObject *t = PyNumber_Subtract(b, c);
+    PyObject *result;
+    if (t == NULL) {
+        return NULL;
+    }
+    result = PyNumber_Subtract(a, t);
+    Py_DECREF(t);
+    return result;
+}
+
+/* Return a new instance of type from its parts. */
+static PyObject *
+from_parts(PyTypeObject *type, double val, PyObject *lsd, PyObject *sf)
+{
+    SFCoreObject *self = (SFCoreObject *)type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    self->val = val;
+    Py_INCREF(lsd);
+    self->lsd = lsd;
+    if (lsd == Py_None) {
+        sf = INF;
+    }
+    Py_INCREF(sf);
+    self->sf = sf;
+    return (PyObject *)self;
+}
+
+/* Return the sigfigs of self, computing and caching them if needed. */
+static PyObject *
+core_sigfigs(SFCoreObject *self)
+{
+    PyObject *msd, *diff, *sf;
+    if (self->sf != Py_None) {
+        Py_INCREF(self->sf);
+        return self->sf;
+    }
+    msd = msd_from_double(self->val);
+    if (msd == NULL) {
+        return NULL;
+    }
+    diff = PyNumber_Subtract(msd, self->lsd);
+    Py_DECREF(msd);
+    if (diff == NULL) {
+        return NULL;
+    }
+    sf = PyNumber_Add(diff, ONE);
+    Py_DECREF(diff);
+    if (sf == NULL) {
+        return NULL;
+    }
+    Py_INCREF(sf);
+    Py_SETREF(self->sf, sf);
+    return sf;
+}
+
+/* Convert other with cls(other), for operands that are not SFCore or numbers. */
+static PyObject *
+convert(PyTypeObject *cls, PyObject *other)
+{
+    PyObject *result = PyObject_CallOneArg((PyObject *)cls, other);
+    if (result != NULL && !SFCore_Check(result)) {
+        PyErr_SetString(PyExc_TypeError, "conversion did not return an SFCore");
+        Py_CLEAR(result);
+    }
+    return result;
+}
+
+/*
+ * Get the value, lsd and sigfigs of other, an SFCore or a number, as
+ * SFCore._parts_of does. lsd and sf are new references. Return -1 on error.
+ */
+static int
+parts_of(PyTypeObject *cls, PyObject *other, double *val, PyObject **lsd,
+         PyObject **sf)
+{
+    if (SFCore_Check(other)) {
+        SFCoreObject *core = (SFCoreObject *)other;
+        *sf = core_sigfigs(core);
+        if (*sf == NULL) {
+            return -1;
+        }
+        *val = core->val;
+        Py_INCREF(core->lsd);
+        *lsd = core->lsd;
+        return 0;
+    }
+    if (PyFloat_Check(other) || PyLong_Check(other)) {
+        *val = PyFloat_AsDouble(other);
+        if (*val == -1.0 && PyErr_Occurred()) {
+            return -1;
+        }
+        Py_INCREF(Py_None);
+        *lsd = Py_None;
+        Py_INCREF(INF);
+        *sf = INF;
+        return 0;
+    }
+    other = convert(cls, other);
+    if (other == NULL) {
+        return -1;
+    }
+    if (parts_of(cls, other, val, lsd, sf) < 0) {
+        Py_DECREF(other);
+        return -1;
+    }
+    Py_DECREF(other);
+    return 0;
+}
+
+/* Get the value of other for comparisons, as SFCore._value_of does. */
+static int
+value_of(PyTypeObject *cls, PyObject *other, double *val)
+{
+    if (SFCore_Check(other)) {
+        *val = ((SFCoreObject *)other)->val;
+        return 0;
+    }
+    if (!PyFloat_Check(other) && !PyLong_Check(other)) {
+        other = convert(cls, other);
+        if (other == NULL) {
+            return -1;
+        }
+        *val = ((SFCoreObject *)other)->val;
+        Py_DECREF(other);
+        return 0;
+    }
+    *val = PyFloat_AsDouble(other);
+    return (*val == -1.0 && PyErr_Occurred()) ? -1 : 0;
+}
+
+/* Return the sigfigs of other for comparisons, as SFCore._sigfigs_of does. */
+static PyObject *
+sigfigs_of(PyTypeObject *cls, PyObject *other)
+{
+    PyObject *result;
+    if (SFCore_Check(other)) {
+        return core_sigfigs((SFCoreObject *)other);
+    }
+    if (PyFloat_Check(other) || PyLong_Check(other)) {
+        Py_INCREF(INF);
+        return INF;
+    }
+    other = convert(cls, other);
+    if (other == NULL) {
+        return NULL;
+    }
+    result = core_sigfigs((SFCoreObject *)other);
+    Py_DECREF(other);
+    return result;
+}
+
+/* Sort out the SFCore operand of a binary operation. */
+static int
+binary_operands(PyObject *a, PyObject *b, SFCoreObject **self, PyObject **other)
+{
+    if (SFCore_Check(a)) {
+        *self = (SFCoreObject *)a;
+        *other = b;
+        return 0;
+    }
+    *self = (SFCoreObject *)b;
+    *other = a;
+    return 1;
+}
+
+/* Return NotImplemented if the current error is a TypeError. */
+static PyObject *
+not_implemented_on_type_error(void)
+{
+    if (PyErr_ExceptionMatches(PyExc_TypeError)) {
+        PyErr_Clear();
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    return NULL;
+}
+
+/* Implements addition and subtraction: the result has the larger lsd. */
+static PyObject *
+additive(PyObject *a, PyObject *b, int subtract)
+{
+    SFCoreObject *self;
+    PyObject *other, *lsd, *lsd2, *sf2, *result;
+    double val, val2;
+    int reflected = binary_operands(a, b, &self, &other);
+
+    if (parts_of(Py_TYPE(self), other, &val2, &lsd2, &sf2) < 0) {
+        return not_implemented_on_type_error();
+    }
+    Py_DECREF(sf2);
+    lsd = self->lsd;
+    if (lsd == Py_None) {
+        lsd = lsd2;
+    }
+    else if (lsd2 != Py_None) {
+        int greater = PyObject_RichCompareBool(lsd2, lsd, Py_GT);
+        if (greater < 0) {
+            Py_DECREF(lsd2);
+            return NULL;
+        }
+        if (greater) {
+            lsd = lsd2;
+        }
+    }
+    if (!subtract) {
+        val = self->val + val2;
+    }
+    else {
+        val = reflected ? val2 - self->val : self->val - val2;
+    }
+    result = from_parts(Py_TYPE(self), val, lsd, Py_None);
+    Py_DECREF(lsd2);
+    return result;
+}
+
+/* Return the value of a multiplicative operation on two floats. */
+static int
+multiplicative_value(int op, double x, double y, double *val)
+{
+    PyObject *fx, *fy, *result, *converted;
+    switch (op) {
+    case OP_MUL:
+    case OP_RMUL:
+        *val = x * y;
+        return 0;
+    case OP_DIV:
+    case OP_RDIV:
+        if (op == OP_RDIV) {
+            double t = x;
+            x = y;
+            y = t;
+        }
+        if (y == 0.0) {
+            PyErr_SetString(PyExc_ZeroDivisionError, "float division by zero");
+            return -1;
+        }
+        *val = x / y;
+        return 0;
+    default:
+        /* float.__pow__ has many special cases, so let it do the work */
+        fx = PyFloat_FromDouble(op == OP_RPOW ? y : x);
+        fy = PyFloat_FromDouble(op == OP_RPOW ? x : y);
+        result = (fx && fy) ? PyNumber_Power(fx, fy, Py_None) : NULL;
+        Py_XDECREF(fx);
+        Py_XDECREF(fy);
+        if (result == NULL) {
+            return -1;
+        }
+        if (!PyFloat_Check(result)) {
+            /* e.g. complex result of a fractional power */
+            converted = PyNumber_Float(result);
+            Py_DECREF(result);
+            if (converted == NULL) {
+                return -1;
+            }
+            result = converted;
+        }
+        *val = PyFloat_AsDouble(result);
+        Py_DECREF(result);
+        return 0;
+    }
+}
+
+/* Implements multiplication, division and powers: the result has the fewer sigfigs. */
+static PyObject *
+multiplicative(PyObject *a, PyObject *b, int op)
+{
+    SFCoreObject *self;
+    PyObject *other, *lsd2, *sf1, *sf2, *minsf, *msd, *lsd, *result = NULL;
+    double val, val2;
+    int cmp;
+
+    if (binary_operands(a, b, &self, &other)) {
+        op += 1; /* the reflected operation */
+    }
+    if (parts_of(Py_TYPE(self), other, &val2, &lsd2, &sf2) < 0) {
+        return not_implemented_on_type_error();
+    }
+    Py_DECREF(lsd2);
+    sf1 = core_sigfigs(self);
+    if (sf1 == NULL) {
+        Py_DECREF(sf2);
+        return NULL;
+    }
+    cmp = PyObject_RichCompareBool(sf2, sf1, Py_LT);
+    if (cmp < 0) {
+        goto done;
+    }
+    minsf = cmp ? sf2 : sf1;
+    cmp = PyObject_RichCompareBool(minsf, ZERO, Py_LE);
+    if (cmp < 0) {
+        goto done;
+    }
+    if (cmp) {
+        PyErr_Format(PyExc_ValueError,
+                     "Precision of %S with zero sigfig operand is undefined.",
+                     float_methods[op]);
+        goto done;
+    }
+    if (multiplicative_value(op, self->val, val2, &val) < 0) {
+        goto done;
+    }
+    cmp = PyObject_RichCompareBool(minsf, INF, Py_EQ);
+    if (cmp < 0) {
+        goto done;
+    }
+    if (cmp) {
+        result = from_parts(Py_TYPE(self), val, Py_None, Py_None);
+        goto done;
+    }
+    msd = msd_from_double(val);
+    if (msd == NULL) {
+        goto done;
+    }
+    lsd = sub_sub(msd, minsf, ONE);
+    Py_DECREF(msd);
+    if (lsd == NULL) {
+        goto done;
+    }
+    result = from_parts(Py_TYPE(self), val, lsd, minsf);
+    Py_DECREF(lsd);
+done:
+    Py_DECREF(sf1);
+    Py_DECREF(sf2);
+    return result;
+}
+
+static PyObject *
+SFCore_add(PyObject *a, PyObject *b)
+{
+    return additive(a, b, 0);
+}
+
+static PyObject *
+SFCore_subtract(PyObject *a, PyObject *b)
+{
+    return additive(a, b, 1);
+}
+
+static PyObject *
+SFCore_multiply(PyObject *a, PyObject *b)
+{
+    return multiplicative(a, b, OP_MUL);
+}
+
+static PyObject *
+SFCore_true_divide(PyObject *a, PyObject *b)
+{
+    return multiplicative(a, b, OP_DIV);
+}
+
+static PyObject *
+SFCore_power(PyObject *a, PyObject *b, PyObject *mod)
+{
+    if (mod != Py_None) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    return multiplicative(a, b, OP_POW);
+}
+
+static PyObject *
+SFCore_negative(SFCoreObject *self)
+{
+    return from_parts(Py_TYPE(self), -self->val, self->lsd, self->sf);
+}
+
+static PyObject *
+SFCore_positive(SFCoreObject *self)
+{
+    Py_INCREF(self);
+    return (PyObject *)self;
+}
+
+static PyObject *
+SFCore_absolute(SFCoreObject *self)
+{
+    return from_parts(Py_TYPE(self), fabs(self->val), self->lsd, self->sf);
+}
+
+static PyObject *
+SFCore_float(SFCoreObject *self)
+{
+    return PyFloat_FromDouble(self->val);
+}
+
+/* Return whether self and other have equal sigfigs, or -1 on error. */
+static int
+equal_sigfigs(SFCoreObject *self, PyObject *other)
+{
+    PyObject *sf1, *sf2;
+    int result;
+    sf1 = core_sigfigs(self);
+    if (sf1 == NULL) {
+        return -1;
+    }
+    sf2 = sigfigs_of(Py_TYPE(self), other);
+    if (sf2 == NULL) {
+        Py_DECREF(sf1);
+        return -1;
+    }
+    result = PyObject_RichCompareBool(sf1, sf2, Py_EQ);
+    Py_DECREF(sf1);
+    Py_DECREF(sf2);
+    return result;
+}
+
+static PyObject *
+SFCore_richcompare(SFCoreObject *self, PyObject *other, int op)
+{
+    PyObject *equal;
+    double val;
+    int result;
+
+    if (op == Py_NE) {
+        equal = PyObject_RichCompare((PyObject *)self, other, Py_EQ);
+        if (equal == NULL) {
+            return NULL;
+        }
+        result = PyObject_Not(equal);
+        Py_DECREF(equal);
+        if (result < 0) {
+            return NULL;
+        }
+        return PyBool_FromLong(result);
+    }
+    if (value_of(Py_TYPE(self), other, &val) < 0) {
+        /* == with a value that is not a number is left to other, then identity */
+        if (op == Py_EQ && (PyErr_ExceptionMatches(PyExc_TypeError) ||
+                            PyErr_ExceptionMatches(PyExc_ValueError))) {
+            PyErr_Clear();
+            Py_RETURN_NOTIMPLEMENTED;
+        }
+        return NULL;
+    }
+    switch (op) {
+    case Py_LT:
+        return PyBool_FromLong(self->val < val);
+    case Py_GT:
+        return PyBool_FromLong(self->val > val);
+    case Py_LE:
+        if (self->val < val) {
+            Py_RETURN_TRUE;
+        }
+        break;
+    case Py_GE:
+        if (self->val > val) {
+            Py_RETURN_TRUE;
+        }
+        break;
+    }
+    /* ==, or <= and >= with values that are not < or >: equal values with equal sigfigs */
+    if (self->val != val) {
+        Py_RETURN_FALSE;
+    }
+    result = equal_sigfigs(self, other);
+    if (result < 0) {
+        return NULL;
+    }
+    return PyBool_FromLong(result);
+}
+
+static Py_hash_t
+SFCore_hash(SFCoreObject *self)
+{
+    PyObject *val, *sf, *key;
+    Py_hash_t hash;
+    val = PyFloat_FromDouble(self->val);
+    if (val == NULL) {
+        return -1;
+    }
+    if (self->sf == INF) {
+        hash = PyObject_Hash(val);
+        Py_DECREF(val);
+        return hash;
+    }
+    sf = core_sigfigs(self);
+    if (sf == NULL) {
+        Py_DECREF(val);
+        return -1;
+    }
+    key = PyTuple_Pack(2, val, sf);
+    Py_DECREF(val);
+    Py_DECREF(sf);
+    if (key == NULL) {
+        return -1;
+    }
+    hash = PyObject_Hash(key);
+    Py_DECREF(key);
+    return hash;
+}
+
+static PyObject *
+SFCore_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    SFCoreObject *self;
+    PyObject *sigfigs = NULL;
+    Py_ssize_t nargs = PyTuple_GET_SIZE(args);
+
+    if (nargs < 1 || nargs > 2) {
+        PyErr_Format(PyExc_TypeError,
+                     "%s() takes a value and optional sigfigs argument",
+                     type->tp_name);
+        return NULL;
+    }
+    if (nargs == 2) {
+        sigfigs = PyTuple_GET_ITEM(args, 1);
+    }
+    else if (kwds != NULL) {
+        sigfigs = PyDict_GetItemString(kwds, "sigfigs");
+    }
+    if ((sigfigs == NULL || sigfigs == Py_None) &&
+        PyObject_TypeCheck(PyTuple_GET_ITEM(args, 0), type)) {
+        PyObject *value = PyTuple_GET_ITEM(args, 0);
+        Py_INCREF(value);
+        return value;
+    }
+    self = (SFCoreObject *)type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    Py_INCREF(Py_None);
+    self->lsd = Py_None;
+    Py_INCREF(INF);
+    self->sf = INF;
+    return (PyObject *)self;
+}
+
+/* Hand the constructor arguments to the pure Python SFCore.__init__. */
+static int
+python_init(SFCoreObject *self, PyObject *args, PyObject *kwds)
+{
+    PyObject *full_args, *result;
+    Py_ssize_t i, nargs = PyTuple_GET_SIZE(args);
+    full_args = PyTuple_New(nargs + 1);
+    if (full_args == NULL) {
+        return -1;
+    }
+    Py_INCREF(self);
+    PyTuple_SET_ITEM(full_args, 0, (PyObject *)self);
+    for (i = 0; i < nargs; i++) {
+        PyObject *item = PyTuple_GET_ITEM(args, i);
+        Py_INCREF(item);
+        PyTuple_SET_ITEM(full_args, i + 1, item);
+    }
+    result = PyObject_Call(py_init, full_args, kwds);
+    Py_DECREF(full_args);
+    if (result == NULL) {
+        return -1;
+    }
+    Py_DECREF(result);
+    return 0;
+}
+
+static int
+SFCore_init(SFCoreObject *self, PyObject *args, PyObject *kwds)
+{
+    PyObject *value, *sigfigs = Py_None, *lsd = Py_None, *msd, *new_lsd, *sf;
+    Py_ssize_t nargs = PyTuple_GET_SIZE(args);
+    double val;
+
+    if (nargs < 1 || nargs > 2) {
+        return python_init(self, args, kwds);
+    }
+    value = PyTuple_GET_ITEM(args, 0);
+    if (nargs == 2) {
+        sigfigs = PyTuple_GET_ITEM(args, 1);
+    }
+    if (kwds != NULL) {
+        PyObject *item = PyDict_GetItemString(kwds, "sigfigs");
+        if (item != NULL) {
+            if (nargs == 2) {
+                return python_init(self, args, kwds);
+            }
+            sigfigs = item;
+        }
+        item = PyDict_GetItemString(kwds, "lsd");
+        if (item != NULL) {
+            lsd = item;
+        }
+    }
+    /* the fast path takes an int or float value, int sigfigs and int lsd */
+    if (PyFloat_Check(sigfigs) && PyFloat_AS_DOUBLE(sigfigs) == Py_HUGE_VAL) {
+        sigfigs = Py_None; /* unlimited precision */
+    }
+    if (sigfigs == Py_None && (PyObject *)self == value) {
+        return 0; /* just passthru */
+    }
+    if ((sigfigs != Py_None && !PyLong_CheckExact(sigfigs)) ||
+        (lsd != Py_None && !PyLong_CheckExact(lsd))) {
+        return python_init(self, args, kwds);
+    }
+    if (PyFloat_CheckExact(value)) {
+        val = PyFloat_AS_DOUBLE(value);
+    }
+    else if (PyLong_CheckExact(value)) {
+        val = PyLong_AsDouble(value);
+        if (val == -1.0 && PyErr_Occurred()) {
+            PyErr_Clear();
+            return python_init(self, args, kwds);
+        }
+    }
+    else {
+        return python_init(self, args, kwds);
+    }
+    if (lsd != Py_None && sigfigs != Py_None) {
+        PyErr_SetString(PyExc_ValueError, "Can not specify both lsd and sigfigs.");
+        return -1;
+    }
+    if (sigfigs == Py_None) {
+        Py_INCREF(lsd);
+        Py_SETREF(self->lsd, lsd);
+        sf = lsd == Py_None ? INF : Py_None;
+        Py_INCREF(sf);
+        Py_SETREF(self->sf, sf);
+    }
+    else {
+        msd = msd_from_double(val);
+        if (msd == NULL) {
+            return -1;
+        }
+        new_lsd = sub_sub(msd, sigfigs, ONE);
+        if (new_lsd == NULL) {
+            Py_DECREF(msd);
+            return -1;
+        }
+        sf = sub_sub(msd, new_lsd, ONE); /* msd - lsd + 1 */
+        Py_DECREF(msd);
+        if (sf == NULL) {
+            Py_DECREF(new_lsd);
+            return -1;
+        }
+        Py_SETREF(self->lsd, new_lsd);
+        Py_SETREF(self->sf, sf);
+    }
+    self->val = val;
+    return 0;
+}
+
+static void
+SFCore_dealloc(SFCoreObject *self)
+{
+    Py_XDECREF(self->lsd);
+    Py_XDECREF(self->sf);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject *
+SFCore_from_parts(PyTypeObject *cls, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"val", "lsd", "sf", NULL};
+    double val;
+    PyObject *lsd, *sf = Py_None;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "dO|O:_from_parts", kwlist, &val,
+                                     &lsd, &sf)) {
+        return NULL;
+    }
+    return from_parts(cls, val, lsd, sf);
+}
+
+static PyObject *
+SFCore_parts_of(PyTypeObject *cls, PyObject *other)
+{
+    PyObject *lsd, *sf, *val, *result;
+    double value;
+    if (parts_of(cls, other, &value, &lsd, &sf) < 0) {
+        return NULL;
+    }
+    val = PyFloat_FromDouble(value);
+    result = val ? PyTuple_Pack(3, val, lsd, sf) : NULL;
+    Py_XDECREF(val);
+    Py_DECREF(lsd);
+    Py_DECREF(sf);
+    return result;
+}
+
+static PyObject *
+SFCore_msd_from_val(PyObject *Py_UNUSED(cls), PyObject *val)
+{
+    if (PyFloat_CheckExact(val)) {
+        return msd_from_double(PyFloat_AS_DOUBLE(val));
+    }
+    return PyObject_CallOneArg(py_msd, val);
+}
+
+static PyObject *
+SFCore_get_sigfigs(SFCoreObject *self, void *Py_UNUSED(closure))
+{
+    return core_sigfigs(self);
+}
+
+static PyObject *
+SFCore_get_value(SFCoreObject *self, void *Py_UNUSED(closure))
+{
+    return PyFloat_FromDouble(self->val);
+}
+
+static PyObject *
+SFCore_get_object(SFCoreObject *self, void *closure)
+{
+    PyObject *result = closure ? self->sf : self->lsd;
+    Py_INCREF(result);
+    return result;
+}
+
+static int
+SFCore_set_object(SFCoreObject *self, PyObject *value, void *closure)
+{
+    if (value == NULL) {
+        PyErr_SetString(PyExc_AttributeError, "can't delete attribute");
+        return -1;
+    }
+    Py_INCREF(value);
+    if (closure) {
+        Py_SETREF(self->sf, value);
+    }
+    else {
+        Py_SETREF(self->lsd, value);
+    }
+    return 0;
+}
+
+static PyMethodDef SFCore_methods[] = {
+    {"_from_parts", (PyCFunction)(void (*)(void))SFCore_from_parts,
+     METH_VARARGS | METH_KEYWORDS | METH_CLASS,
+     "Return a new instance built from trusted parts: the value, the lsd\n"
+     "position (None for unlimited precision) and the sigfigs, if known."},
+    {"_parts_of", (PyCFunction)SFCore_parts_of, METH_O | METH_CLASS,
+     "Return the value, lsd and sigfigs of other, an SFFloat or a number."},
+    {"_msd_from_val", (PyCFunction)SFCore_msd_from_val, METH_O | METH_STATIC,
+     "Return the position of the most significant digit.\n"
+     "0 means 1's place, 1 means 10's place, -1 means 0.1's place, etc."},
+    {NULL},
+};
+
+static PyMemberDef SFCore_members[] = {
+    {"_val", T_DOUBLE, offsetof(SFCoreObject, val), 0, NULL},
+    {NULL},
+};
+
+static PyGetSetDef SFCore_getset[] = {
+    {"sigfigs", (getter)SFCore_get_sigfigs, NULL,
+     "Return the number of significant figures for this value", NULL},
+    {"value", (getter)SFCore_get_value, NULL,
+     "Return the full-precision internal value", NULL},
+    {"lsd", (getter)SFCore_get_object, NULL,
+     "Return the position of the least significant digit.\n"
+     "0 means 1's place, 1 means 10's place, -1 means 0.1's place, etc.",
+     NULL},
+    {"_lsd", (getter)SFCore_get_object, (setter)SFCore_set_object, NULL, NULL},
+    {"_sf", (getter)SFCore_get_object, (setter)SFCore_set_object, NULL,
+     (void *)1},
+    {NULL},
+};
+
+static PyNumberMethods SFCore_as_number = {
+    .nb_add = SFCore_add,
+    .nb_subtract = SFCore_subtract,
+    .nb_multiply = SFCore_multiply,
+    .nb_true_divide = SFCore_true_divide,
+    .nb_power = SFCore_power,
+    .nb_negative = (unaryfunc)SFCore_negative,
+    .nb_positive = (unaryfunc)SFCore_positive,
+    .nb_absolute = (unaryfunc)SFCore_absolute,
+    .nb_float = (unaryfunc)SFCore_float,
+};
+
+static PyTypeObject SFCoreType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "sffloat._sfcore.SFCore",
+    .tp_doc = "The _sfcore SFCore class is the accelerated core of SFFloat.",
+    .tp_basicsize = sizeof(SFCoreObject),
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    .tp_new = SFCore_new,
+    .tp_init = (initproc)SFCore_init,
+    .tp_dealloc = (destructor)SFCore_dealloc,
+    .tp_as_number = &SFCore_as_number,
+    .tp_richcompare = (richcmpfunc)SFCore_richcompare,
+    .tp_hash = (hashfunc)SFCore_hash,
+    .tp_methods = SFCore_methods,
+    .tp_members = SFCore_members,
+    .tp_getset = SFCore_getset,
+};
+
+static struct PyModuleDef sfcore_module = {
+    PyModuleDef_HEAD_INIT,
+    .m_name = "sffloat._sfcore",
+    .m_doc = "Accelerated core of the SFFloat class.",
+    .m_size = -1,
+};
+
+PyMODINIT_FUNC
+PyInit__sfcore(void)
+{
+    PyObject *module, *pycore, *pyclass;
+    int i;
+
+    INF = PyFloat_FromDouble(Py_HUGE_VAL);
+    ZERO = PyLong_FromLong(0);
+    ONE = PyLong_FromLong(1);
+    if (INF == NULL || ZERO == NULL || ONE == NULL) {
+        return NULL;
+    }
+    for (i = 0; i < OP_COUNT; i++) {
+        float_methods[i] =
+            PyObject_GetAttrString((PyObject *)&PyFloat_Type, float_method_names[i]);
+        if (float_methods[i] == NULL) {
+            return NULL;
+        }
+    }
+    pycore = PyImport_ImportModule("sffloat._pycore");
+    if (pycore == NULL) {
+        return NULL;
+    }
+    pyclass = PyObject_GetAttrString(pycore, "SFCore");
+    Py_DECREF(pycore);
+    if (pyclass == NULL) {
+        return NULL;
+    }
+    py_init = PyObject_GetAttrString(pyclass, "__init__");
+    py_msd = PyObject_GetAttrString(pyclass, "_msd_from_val");
+    Py_DECREF(pyclass);
+    if (py_init == NULL || py_msd == NULL) {
+        return NULL;
+    }
+    if (PyType_Ready(&SFCoreType) < 0) {
+        return NULL;
+    }
+    if (PyDict_SetItemString(SFCoreType.tp_dict, "inf", INF) < 0) {
+        return NULL;
+    }
+    PyType_Modified(&SFCoreType);
+    module = PyModule_Create(&sfcore_module);
+    if (module == NULL) {
+        return NULL;
+    }
+    Py_INCREF(&SFCoreType);
+    if (PyModule_AddObject(module, "SFCore", (PyObject *)&SFCoreType) < 0) {
+        Py_DECREF(&SFCoreType);
+        Py_DECREF(module);
+        return NULL;
+    }
+    return module;
+}
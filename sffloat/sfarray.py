@@ -0,0 +1,362 @@
+"""
+The sfarray module defines the :class:`SFArray` class, a NumPy backed container of
+values that carry significant figures. It applies the same precision rules as the
+:class:`SFFloat` arithmetic, but operates on whole arrays at once.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .sffloat import SFFloat
+
+
+def _require_numpy():
+    """
+    Raise an informative error if NumPy is not available.
+    """
+    if np is None:
+        raise ImportError("SFArray requires numpy: pip install numpy")
+
+
+def _msd(vals):
+    """
+    Return the positions of the most significant digits of an array of values.
+    Zero values are assigned position 0, as in :meth:`SFFloat._msd_from_val`.
+    """
+    with np.errstate(divide="ignore"):
+        msd = np.floor(np.log10(np.abs(vals)))
+    return np.where(vals == 0.0, 0.0, msd)
+
+
+def _power(bases, exponents):
+    """
+    Return bases raised to exponents, raising the exceptions of :class:`SFFloat`
+    powers instead of giving nan or inf.
+    """
+    bases, exponents = np.broadcast_arrays(bases, exponents)
+    if np.any((bases == 0.0) & (exponents < 0.0)):
+        raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+    fractional = np.isfinite(exponents) & (exponents != np.floor(exponents))
+    if np.any((bases < 0.0) & fractional):
+        raise TypeError("a negative number cannot be raised to a fractional power")
+    try:
+        with np.errstate(over="raise"):
+            return np.power(bases, exponents, dtype=np.float64)
+    except FloatingPointError:
+        raise OverflowError("Numerical result out of range") from None
+
+
+class SFArray:
+    """
+    The sffloat :class:`SFArray` class stores a one dimensional array of values
+    together with the position of the least significant digit of each value. The
+    values and the lsd positions are kept in two parallel NumPy arrays, so that
+    arithmetic can track significant figures with whole-array operations. Each
+    element of the result matches the corresponding :class:`SFFloat` computation.
+
+    :Required Arguments:
+        * **values** [iterable] The numeric values of the new instance. Elements
+            may be float, int or :class:`SFFloat`. An :class:`SFArray` or NumPy
+            array may also be used.
+
+    :Optional Arguments:
+        * **sigfigs** [int or iterable of int] The number of significant digits of
+            the values. Use `float('inf')` for unlimited significant digits. If
+            this argument and **lsd** are omitted then the precision of any
+            :class:`SFFloat` elements is used, and all other elements have
+            unlimited significant digits.
+
+    :Optional Keyword Arguments:
+        * **lsd** [int or iterable of int] The place of the least significant digit
+            of the values, as in :class:`SFFloat`. Note that the **sigfigs**
+            argument and the **lsd** argument may not be used at the same time."""
+
+    # lsd marker for values with unlimited significant figures. Being the smallest
+    # representable lsd, it never wins the max lsd rule of addition.
+    LSD_INF = -32768
+    LSD_DTYPE = "int16"
+
+    # make NumPy defer to the reflected SFArray operators
+    __array_priority__ = 1000
+
+    def __init__(self, values, sigfigs=None, lsd=None):
+        _require_numpy()
+        if lsd is not None and sigfigs is not None:
+            raise ValueError("Can not specify both lsd and sigfigs.")
+        if isinstance(values, SFArray):
+            vals, lsds = values._val, values._lsd
+        elif isinstance(values, np.ndarray) and values.dtype != object:
+            vals, lsds = values.astype(np.float64, copy=False), None
+        else:
+            vals, lsds = self._unpack(values)
+        if vals.ndim != 1:
+            raise ValueError("SFArray values must be one dimensional.")
+        if lsd is not None:
+            lsds = self._lsd_array(lsd, vals.shape)
+        elif sigfigs is not None:
+            sigfigs = np.broadcast_to(np.asarray(sigfigs), vals.shape)
+            if sigfigs.dtype.kind not in "iuf" or np.any(
+                (sigfigs != np.round(sigfigs)) & np.isfinite(sigfigs)
+            ):
+                raise ValueError("Invalid value for sigfigs.")
+            lsds = self._lsd_from_sigfigs(vals, sigfigs)
+        elif lsds is None:
+            lsds = np.full(vals.shape, self.LSD_INF, dtype=self.LSD_DTYPE)
+        self._val = vals
+        self._lsd = lsds
+
+    @classmethod
+    def _from_arrays(cls, vals, lsds):
+        """
+        Return a new instance built directly from value and lsd arrays.
+        """
+        retval = cls.__new__(cls)
+        retval._val = vals
+        retval._lsd = lsds
+        return retval
+
+    @classmethod
+    def _unpack(cls, values):
+        """
+        Split an iterable of float or SFFloat into value and lsd arrays.
+        """
+        vals = []
+        lsds = []
+        for item in values:
+            if isinstance(item, SFFloat):
+                vals.append(item.value)
+                lsds.append(cls.LSD_INF if item.lsd is None else item.lsd)
+            else:
+                vals.append(item)
+                lsds.append(cls.LSD_INF)
+        lsds = np.array(lsds, dtype=np.int64)
+        cls._check_lsd_range(lsds[lsds != cls.LSD_INF])
+        return np.array(vals, dtype=np.float64), lsds.astype(cls.LSD_DTYPE)
+
+    @classmethod
+    def _check_lsd_range(cls, lsds):
+        """
+        Raise ValueError unless every lsd position fits in :attr:`LSD_DTYPE` without
+        colliding with :attr:`LSD_INF`.
+        """
+        info = np.iinfo(cls.LSD_DTYPE)
+        if lsds.size and (lsds.min() <= info.min or lsds.max() > info.max):
+            raise ValueError("lsd value out of range.")
+
+    @classmethod
+    def _lsd_array(cls, lsd, shape):
+        """
+        Return an lsd array of the given shape, checking its range.
+        """
+        lsd = np.asarray(lsd)
+        if lsd.dtype.kind not in "iu":
+            raise ValueError("Invalid value for lsd.")
+        cls._check_lsd_range(lsd)
+        return np.array(np.broadcast_to(lsd, shape), dtype=cls.LSD_DTYPE)
+
+    @classmethod
+    def _lsd_from_sigfigs(cls, vals, sigfigs):
+        """
+        Return the lsd array for values with the given significant figures,
+        checking its range.
+        """
+        with np.errstate(invalid="ignore"):
+            lsds = _msd(vals) - (sigfigs - 1)
+        cls._check_lsd_range(lsds[np.isfinite(lsds)])
+        return np.where(np.isinf(sigfigs), cls.LSD_INF, lsds).astype(cls.LSD_DTYPE)
+
+    @classmethod
+    def _sigfigs_of(cls, vals, lsds):
+        """
+        Return the significant figures for value and lsd arrays.
+        """
+        return np.where(lsds == cls.LSD_INF, np.inf, _msd(vals) - lsds + 1)
+
+    @property
+    def sigfigs(self):
+        """
+        Return the number of significant figures for each value
+        """
+        return self._sigfigs_of(self._val, self._lsd)
+
+    @property
+    def value(self):
+        """
+        Return the full-precision internal values
+        """
+        return self._val
+
+    @property
+    def lsd(self):
+        """
+        Return the positions of the least significant digits. Values with
+        unlimited significant figures have the position :attr:`LSD_INF`.
+        """
+        return self._lsd
+
+    def copy(self):
+        """
+        Return a new instance of SFArray that is a copy.
+        """
+        return self._from_arrays(self._val.copy(), self._lsd.copy())
+
+    def tolist(self):
+        """
+        Return the contents as a list of SFFloat.
+        """
+        return list(self)
+
+    def _item(self, index):
+        """
+        Return the element at index as an SFFloat.
+        """
+        lsd = int(self._lsd[index])
+        if lsd == self.LSD_INF:
+            return SFFloat(float(self._val[index]))
+        return SFFloat(float(self._val[index]), lsd=lsd)
+
+    def __len__(self):
+        return len(self._val)
+
+    def __iter__(self):
+        for index in range(len(self._val)):
+            yield self._item(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self._item(index)
+        return self._from_arrays(self._val[index], self._lsd[index])
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.tolist()!r})"
+
+    def __str__(self):
+        return "[" + ", ".join(str(item) for item in self) + "]"
+
+    # Array arithmetic
+
+    @classmethod
+    def _operand(cls, arg):
+        """
+        Return the value and lsd of arg, an SFArray, SFFloat, scalar or sequence.
+        """
+        if isinstance(arg, SFArray):
+            return arg.value, arg.lsd
+        if isinstance(arg, SFFloat):
+            return arg.value, np.int16(cls.LSD_INF if arg.lsd is None else arg.lsd)
+        if isinstance(arg, (int, float, np.number)):
+            return float(arg), np.int16(cls.LSD_INF)
+        arg = cls(arg)
+        return arg._val, arg._lsd
+
+    @classmethod
+    def _multiplicative_func(cls, func, arg1, arg2):
+        """
+        Perform ufunc func on arg1 and arg2, propagating the minimum sigfigs.
+        """
+        val1, lsd1 = cls._operand(arg1)
+        val2, lsd2 = cls._operand(arg2)
+        minsigfig = np.minimum(cls._sigfigs_of(val1, lsd1), cls._sigfigs_of(val2, lsd2))
+        if np.any(minsigfig <= 0):
+            raise ValueError(
+                f"Precision of {func.__name__} with zero sigfig operand is undefined."
+            )
+        if func is np.true_divide and np.any(np.asarray(val2) == 0.0):
+            raise ZeroDivisionError("float division by zero")
+        if func is np.power:
+            vals = _power(val1, val2)
+        else:
+            vals = np.asarray(func(val1, val2), dtype=np.float64)
+        minsigfig = np.broadcast_to(minsigfig, vals.shape)
+        return cls._from_arrays(vals, cls._lsd_from_sigfigs(vals, minsigfig))
+
+    @classmethod
+    def _additive_func(cls, func, arg1, arg2):
+        """
+        Perform ufunc func on arg1 and arg2, propagating the maximum lsd.
+        """
+        val1, lsd1 = cls._operand(arg1)
+        val2, lsd2 = cls._operand(arg2)
+        vals = np.asarray(func(val1, val2), dtype=np.float64)
+        lsds = np.broadcast_to(np.maximum(lsd1, lsd2), vals.shape)
+        return cls._from_arrays(vals, lsds.astype(cls.LSD_DTYPE))
+
+    def __add__(self, other):
+        """
+        Implements addition.
+        """
+        return self._additive_func(np.add, self, other)
+
+    def __radd__(self, other):
+        """
+        Implements reflected addition.
+        """
+        return self._additive_func(np.add, other, self)
+
+    def __sub__(self, other):
+        """
+        Implements subtraction.
+        """
+        return self._additive_func(np.subtract, self, other)
+
+    def __rsub__(self, other):
+        """
+        Implements reflected subtraction.
+        """
+        return self._additive_func(np.subtract, other, self)
+
+    def __mul__(self, other):
+        """
+        Implements multiplication.
+        """
+        return self._multiplicative_func(np.multiply, self, other)
+
+    def __rmul__(self, other):
+        """
+        Implements reflected multiplication.
+        """
+        return self._multiplicative_func(np.multiply, other, self)
+
+    def __truediv__(self, other):
+        """
+        Implements true division.
+        """
+        return self._multiplicative_func(np.true_divide, self, other)
+
+    def __rtruediv__(self, other):
+        """
+        Implements reflected true division.
+        """
+        return self._multiplicative_func(np.true_divide, other, self)
+
+    def __pow__(self, other):
+        """
+        Implements behavior for exponents using the ** operator.
+        """
+        return self._multiplicative_func(np.power, self, other)
+
+    def __rpow__(self, other):
+        """
+        Implements behavior for reflected exponents using the ** operator.
+        """
+        return self._multiplicative_func(np.power, other, self)
+
+    def __pos__(self):
+        """
+        Implements the unary + operator. This does nothing.
+        """
+        return self
+
+    def __neg__(self):
+        """
+        Implements the unary - operator. Makes values negative.
+        """
+        return self._from_arrays(-self._val, self._lsd)
+
+    def __abs__(self):
+        """
+        Implements the absolute value function.
+        """
+        return self._from_arrays(np.abs(self._val), self._lsd)
@@ -0,0 +1,120 @@
+"""
+The sfcache module provides a process-wide, bounded LRU cache of the strings that
+:class:`SFFloat` values render to with `str()` and `format()`. Applications that
+display the same readings many times can enable it to skip repeated rounding:
+
+    from sffloat import sfcache
+    sfcache.enable(maxsize=4096)
+    ...
+    sfcache.info()      # CacheInfo(hits=..., misses=..., maxsize=4096, currsize=...)
+    sfcache.disable()
+
+Rendered strings are keyed by value, lsd and format spec. While enabled,
+:meth:`SFFloat.__str__` and :meth:`SFFloat.__format__` are replaced by cached
+versions, so disabled caching costs nothing. The cache is safe to use from
+multiple threads.
+"""
+
+# pylint: disable=protected-access
+
+import functools
+import inspect
+import math
+import threading
+from .sffloat import SFFloat
+
+DEFAULT_MAXSIZE = 4096
+
+_LOCK = threading.Lock()
+# unwrapped, in case this module is first imported while sfprofile is collecting
+_STR = inspect.unwrap(SFFloat.__str__)
+_FORMAT = inspect.unwrap(SFFloat.__format__)
+
+
+def _render(val, lsd, format_spec):
+    """
+    Return the string for an SFFloat with value val and lsd, formatted with
+    format_spec (None for str).
+    """
+    value = SFFloat._from_parts(val, lsd)
+    if format_spec is None:
+        return _STR(value)
+    return _FORMAT(value, format_spec)
+
+
+_cached_render = functools.lru_cache(maxsize=DEFAULT_MAXSIZE)(_render)
+
+
+def _cached_str(self):
+    """
+    Implements str() with the cache.
+    """
+    val = self._val
+    if not val or math.isnan(val):  # keep -0.0 apart from 0.0, nan never matches
+        return _STR(self)
+    return _cached_render(val, self._lsd, None)
+
+
+def _cached_format(self, format_spec):
+    """
+    Implements format() with the cache.
+    """
+    val = self._val
+    if not val or math.isnan(val):
+        return _FORMAT(self, format_spec)
+    return _cached_render(val, self._lsd, format_spec)
+
+
+def enable(maxsize=None):
+    """
+    Turn on caching of SFFloat strings. If maxsize is given, the cache is resized
+    to hold at most maxsize strings.
+    """
+    if maxsize is not None:
+        resize(maxsize)
+    with _LOCK:
+        SFFloat.__str__ = _cached_str
+        SFFloat.__format__ = _cached_format
+
+
+def disable():
+    """
+    Turn off caching of SFFloat strings. The cache contents and statistics are
+    kept until :func:`clear` is called.
+    """
+    with _LOCK:
+        SFFloat.__str__ = _STR
+        SFFloat.__format__ = _FORMAT
+
+
+def enabled():
+    """
+    Return True if caching of SFFloat strings is turned on.
+    """
+    return SFFloat.__str__ is _cached_str
+
+
+def resize(maxsize):
+    """
+    Set the maximum number of cached strings, least recently used strings being
+    evicted first. Resizing empties the cache and resets its statistics.
+    """
+    global _cached_render  # pylint: disable=global-statement
+    if not isinstance(maxsize, int) or maxsize < 0:
+        raise ValueError("maxsize must be a non-negative integer.")
+    with _LOCK:
+        _cached_render = functools.lru_cache(maxsize=maxsize)(_render)
+
+
+def clear():
+    """
+    Empty the cache and reset its statistics.
+    """
+    _cached_render.cache_clear()
+
+
+def info():
+    """
+    Return the cache statistics as a named tuple (hits, misses, maxsize, currsize).
+    """
+    return _cached_render.cache_info()
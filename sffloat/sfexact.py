@@ -0,0 +1,403 @@
+"""
+The sfexact module defines the :class:`SFExact` class, an opt-in variant of
+:class:`SFFloat` that holds its value exactly, as an integer coefficient scaled by a
+power of ten.
+
+The significant figures of an :class:`SFFloat` are computed from the binary float
+value with ``floor(log10(abs(val)))``, which can put the most significant digit of
+values very close to a power of ten (e.g. 999.9999999999999) in the wrong place.
+:class:`SFExact` computes the most significant digit, the lsd, the rounding and the
+display from its exact decimal digits instead. Addition, subtraction,
+multiplication and integer powers are exact; quotients and other powers are
+rounded to :attr:`SFExact.division_digits` significant digits, or more if needed.
+
+:class:`SFExact` is written in Python on top of either core. Its construction and
+arithmetic cost 1.5 to 3 times as much as the pure Python :class:`SFFloat` core
+(``SFFLOAT_PURE_PYTHON=1``), but 10 to 25 times as much as the default C core.
+"""
+
+# pylint: disable=protected-access
+
+import math
+from .sffloat import SFFloat
+from .sfformat import format_std, format_sci, round_digit_string
+from .sfformat import digits_display_key, std_text_key
+
+
+def _normalize(coef, exp):
+    """
+    Return coef and exp with the trailing zeros of coef moved into exp.
+    """
+    if not coef:
+        return 0, 0
+    while not coef % 10:
+        coef //= 10
+        exp += 1
+    return coef, exp
+
+
+def _parse(text):
+    """
+    Return the (coef, exp) parts of a decimal string, e.g. "-1.50e3".
+    """
+    mantissa, _, exponent = text.strip().lower().partition("e")
+    sign = ""
+    if mantissa[:1] in "+-":
+        sign, mantissa = mantissa[:1], mantissa[1:]
+    whole, _, fraction = mantissa.partition(".")
+    digits = whole + fraction
+    if not (digits.isdigit() and digits.isascii()) or (
+        exponent and not exponent.lstrip("+-").isdigit()
+    ):
+        raise ValueError(f"Invalid decimal value {text!r}.")
+    return _normalize(
+        int(sign + digits), (int(exponent) if exponent else 0) - len(fraction)
+    )
+
+
+def _decimal_parts(value):
+    """
+    Return the exact (coef, exp) parts of value. A float is taken to be exactly its
+    shortest decimal representation, i.e. the digits that repr() displays.
+    """
+    if isinstance(value, SFExact):
+        return value._coef, value._exp
+    if isinstance(value, int):
+        return _normalize(int(value), 0)
+    if isinstance(value, str):
+        return _parse(value)
+    if hasattr(value, "as_tuple") and value.is_finite():  # decimal.Decimal
+        sign, digits, exp = value.as_tuple()
+        coef = int("".join(map(str, digits)) or "0")
+        return _normalize(-coef if sign else coef, exp)
+    val = float(value)
+    if not math.isfinite(val):
+        raise ValueError("SFExact values must be finite.")
+    return _parse(repr(val))
+
+
+def _msd(coef, exp):
+    """
+    Return the position of the most significant digit of coef * 10**exp.
+    """
+    if not coef:
+        return 0
+    return exp + len(str(abs(coef))) - 1
+
+
+def _align(coef1, exp1, coef2, exp2):
+    """
+    Return the coefficients of two values scaled to their smallest exponent, and
+    that exponent.
+    """
+    if exp1 > exp2:
+        return coef1 * 10 ** (exp1 - exp2), coef2, exp2
+    return coef1, coef2 * 10 ** (exp2 - exp1), exp1
+
+
+class SFExact(SFFloat):
+    """
+    The sfexact :class:`SFExact` class is an :class:`SFFloat` whose value is held
+    exactly, as an integer coefficient times a power of ten, so that its most
+    significant digit, lsd and rounding are computed with integers. Arithmetic with
+    SFFloat and float values returns SFExact values. The :attr:`value` property and
+    comparisons use the nearest float, and the sf math functions return SFFloat.
+
+    :Required Arguments:
+        * **value** [float, int, str or Decimal] The numeric value of the new
+            instance. A string or Decimal is taken exactly; a float is taken to be
+            the decimal that repr() displays, e.g. 0.1 is exactly 1/10.
+
+    :Optional Arguments:
+        * **sigfigs** [int] The number of significant digits, as for :class:`SFFloat`.
+
+    :Optional Keyword Arguments:
+        * **lsd** [int] The place of the least significant digit, as for
+            :class:`SFFloat`."""
+
+    __slots__ = ("_coef", "_exp")
+
+    # minimum significant digits of quotients and non-integer powers
+    division_digits = 34
+
+    def __new__(cls, value, sigfigs=None, lsd=None):
+        if sigfigs and not isinstance(sigfigs, int) and sigfigs != cls.inf:
+            raise ValueError("Invalid value for sigfigs.")
+        if sigfigs == cls.inf:
+            sigfigs = None  # unlimited precision
+        if isinstance(value, cls) and sigfigs is None and lsd is None:
+            return value
+        if lsd is not None and sigfigs is not None:
+            raise ValueError("Can not specify both lsd and sigfigs.")
+        coef, exp = _decimal_parts(value)
+        if lsd is None and sigfigs is None and isinstance(value, SFFloat):
+            lsd = value.lsd
+        if sigfigs is not None:
+            lsd = _msd(coef, exp) - (sigfigs - 1)
+        return cls._from_exact(coef, exp, lsd)
+
+    def __init__(self, *args, **kwargs):  # pylint: disable=super-init-not-called
+        pass  # the instance is set up by __new__
+
+    @classmethod
+    def _from_exact(cls, coef, exp, lsd):
+        """
+        Return a new instance from the normalized exact parts of its value and its
+        lsd (None for unlimited precision). The sigfigs are computed exactly.
+        """
+        val = float(f"{coef}e{exp}")
+        if lsd is None:
+            retval = cls._from_parts(val, None)
+        else:
+            retval = cls._from_parts(val, lsd, _msd(coef, exp) - lsd + 1)
+        retval._coef = coef
+        retval._exp = exp
+        return retval
+
+    @property
+    def decimal_parts(self):
+        """
+        Return the exact value as a tuple (coefficient, exponent) of integers, such
+        that the value is coefficient * 10**exponent.
+        """
+        return self._coef, self._exp
+
+    def copy(self):
+        """
+        Return a new instance of SFExact that is a copy.
+        """
+        return self._from_exact(self._coef, self._exp, self._lsd)
+
+    def __reduce__(self):
+        """
+        Implements pickling (and copy) support, storing the exact value and lsd.
+        """
+        return type(self)._from_exact, (self._coef, self._exp, self._lsd)
+
+    @classmethod
+    def _exact_of(cls, other):
+        """
+        Return the coef, exp, lsd and sigfigs of other, an SFFloat or a number.
+        """
+        if not isinstance(other, SFFloat):
+            if not isinstance(other, (float, int)):
+                other = cls(other)
+            else:
+                coef, exp = _decimal_parts(other)
+                return coef, exp, None, cls.inf
+        if not isinstance(other, SFExact):
+            other = cls(other)
+        return other._coef, other._exp, other._lsd, other._sf
+
+    def _additive(self, other, sign, reflected=False):
+        """
+        Return self + sign * other, or other + sign * self if reflected.
+        """
+        try:
+            coef2, exp2, lsd2, _ = self._exact_of(other)
+        except TypeError:
+            return NotImplemented
+        coef1, coef2, exp = _align(self._coef, self._exp, coef2, exp2)
+        coef = coef2 + sign * coef1 if reflected else coef1 + sign * coef2
+        lsd = self._lsd
+        if lsd is None or (lsd2 is not None and lsd2 > lsd):
+            lsd = lsd2
+        return self._from_exact(*_normalize(coef, exp), lsd)
+
+    def _min_sigfigs(self, sf2, func):
+        """
+        Return the fewer sigfigs of self and another operand of func.
+        """
+        minsigfig = min(self._sf, sf2)
+        if minsigfig <= 0:
+            raise ValueError(
+                f"Precision of {func} with zero sigfig operand is undefined."
+            )
+        return minsigfig
+
+    def _with_sigfigs(self, coef, exp, sigfigs):
+        """
+        Return a result of multiplicative arithmetic with sigfigs significant figures.
+        """
+        coef, exp = _normalize(coef, exp)
+        if sigfigs == self.inf:
+            return self._from_exact(coef, exp, None)
+        return self._from_exact(coef, exp, _msd(coef, exp) - (sigfigs - 1))
+
+    def _divide(self, parts1, parts2, sigfigs):
+        """
+        Return the quotient of two values, (coef, exp) parts, rounded half up if it
+        is not exact, with sigfigs significant figures.
+        """
+        (coef1, exp1), (coef2, exp2) = parts1, parts2
+        if not coef2:
+            raise ZeroDivisionError("float division by zero")
+        digits = self.division_digits
+        if sigfigs != self.inf:
+            digits = max(digits, sigfigs + 3)
+        scale = max(0, digits + len(str(abs(coef2))) - len(str(abs(coef1))) + 1)
+        quotient, remainder = divmod(abs(coef1) * 10**scale, abs(coef2))
+        if 2 * remainder >= abs(coef2):
+            quotient += 1
+        if (coef1 < 0) != (coef2 < 0):
+            quotient = -quotient
+        return self._with_sigfigs(quotient, exp1 - exp2 - scale, sigfigs)
+
+    def _power(self, base, exponent, sigfigs, func):
+        """
+        Return base ** exponent, both (coef, exp) parts, with sigfigs significant
+        figures. Integer exponents are computed exactly.
+        """
+        (coef1, exp1), (coef2, exp2) = base, exponent
+        if exp2 >= 0 and abs(coef2) * 10**exp2 <= 10000:
+            power = coef2 * 10**exp2
+            if power >= 0:
+                return self._with_sigfigs(coef1**power, exp1 * power, sigfigs)
+            if not coef1:
+                raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+            return self._divide((1, 0), (coef1**-power, exp1 * -power), sigfigs)
+        val = func(float(f"{coef1}e{exp1}"), float(f"{coef2}e{exp2}"))
+        if not isinstance(val, float):
+            val = float(val)  # e.g. complex result of a fractional power
+        return self._with_sigfigs(*_decimal_parts(val), sigfigs)
+
+    def _multiplicative(self, other, func, reflected=False):
+        """
+        Return the result of func, a float multiplicative method, on self and other.
+        """
+        try:
+            coef2, exp2, _, sf2 = self._exact_of(other)
+        except TypeError:
+            return NotImplemented
+        sigfigs = self._min_sigfigs(sf2, func)
+        parts1, parts2 = (self._coef, self._exp), (coef2, exp2)
+        if reflected:
+            parts1, parts2 = parts2, parts1
+        if func in (float.__mul__, float.__rmul__):
+            return self._with_sigfigs(
+                parts1[0] * parts2[0], parts1[1] + parts2[1], sigfigs
+            )
+        if func in (float.__truediv__, float.__rtruediv__):
+            return self._divide(parts1, parts2, sigfigs)
+        return self._power(parts1, parts2, sigfigs, float.__pow__)
+
+    def __add__(self, other):
+        return self._additive(other, 1)
+
+    def __radd__(self, other):
+        return self._additive(other, 1, reflected=True)
+
+    def __sub__(self, other):
+        return self._additive(other, -1)
+
+    def __rsub__(self, other):
+        return self._additive(other, -1, reflected=True)
+
+    def __mul__(self, other):
+        return self._multiplicative(other, float.__mul__)
+
+    def __rmul__(self, other):
+        return self._multiplicative(other, float.__rmul__, reflected=True)
+
+    def __truediv__(self, other):
+        return self._multiplicative(other, float.__truediv__)
+
+    def __rtruediv__(self, other):
+        return self._multiplicative(other, float.__rtruediv__, reflected=True)
+
+    def __pow__(self, other):
+        return self._multiplicative(other, float.__pow__)
+
+    def __rpow__(self, other):
+        return self._multiplicative(other, float.__rpow__, reflected=True)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return self._from_exact(-self._coef, self._exp, self._lsd)
+
+    def __abs__(self):
+        return self._from_exact(abs(self._coef), self._exp, self._lsd)
+
+    def _round_digits(self, sigfigs):
+        """
+        Return the exact value rounded half up to sigfigs significant figures, as
+        the (negative, digits, msd) tuple of :func:`sfformat.round_digits`.
+        """
+        coef = self._coef
+        if not coef:
+            return False, "0" * sigfigs, 0
+        digits = str(abs(coef))
+        msd = self._exp + len(digits) - 1
+        return round_digit_string(coef < 0, digits, msd, sigfigs)
+
+    def _notation(self):
+        """
+        Return "std" for values between 0.001 and 1000 (and for zero), otherwise
+        "sci", as :func:`sfformat.notation_of` does for floats.
+        """
+        msd = _msd(self._coef, self._exp)
+        if not self._coef or -3 < msd < 3 or (msd == -3 and abs(self._coef) != 1):
+            return "std"
+        return "sci"
+
+    def _format(self, sigfigs):
+        """
+        Return the exact value rounded to sigfigs significant figures, as a string.
+        """
+        formatter = format_std if self._notation() == "std" else format_sci
+        return formatter(*self._round_digits(sigfigs))
+
+    def __repr__(self):
+        text = format_std(
+            self._coef < 0, str(abs(self._coef)), _msd(self._coef, self._exp)
+        )
+        if self._sf is self.inf:
+            return f"{type(self).__name__}({text!r})"
+        return f"{type(self).__name__}({text!r},{self._sf})"
+
+    def _float_text(self):
+        """
+        Return all the digits of the exact value, formatted as str() formats floats.
+        """
+        coef = self._coef
+        digits, msd = str(abs(coef)), _msd(coef, self._exp)
+        if -4 <= msd < 16:
+            text = format_std(coef < 0, digits, msd)
+            return text if "." in text else text + ".0"
+        mantissa = digits[0] + "." + digits[1:] if len(digits) > 1 else digits
+        return f"{'-' if coef < 0 else ''}{mantissa}e{msd:+03d}"
+
+    def __str__(self):
+        if self._sf is self.inf:
+            return self._float_text()
+        if self._sf <= 0:
+            return "0"
+        return self._format(self._sf)
+
+    def _rounded(self):
+        """
+        Return the value rounded to its significant figures, as a float.
+        """
+        if self._sf is self.inf:
+            return self._val
+        if self._sf <= 0:
+            return 0.0
+        negative, digits, msd = self._round_digits(self._sf)
+        return float(f"{'-' if negative else ''}{digits}e{msd - len(digits) + 1}")
+
+    def display_key(self):
+        """
+        Return a hashable key describing how this value displays: two values have
+        equal keys exactly when their str() representations are equal, as for
+        :meth:`SFFloat.display_key`.
+        """
+        if self._sf is self.inf:
+            text = self._float_text()
+            if "e" not in text:
+                return std_text_key(text)
+            return ("float", self._val) if text == repr(self._val) else ("text", text)
+        if self._sf <= 0:
+            return ("std", False, 0, 0)
+        return digits_display_key(*self._round_digits(self._sf), self._notation())
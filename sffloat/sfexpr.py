@@ -0,0 +1,262 @@
+"""
+The sfexpr module implements deferred evaluation of :class:`SFFloat` arithmetic.
+Wrapping an operand with :func:`lazy`, or using a named placeholder created with
+:func:`var`, makes arithmetic build a lightweight :class:`SFExpr` expression tree
+instead of computing each intermediate result:
+
+    r = var("r")
+    area = pi * r ** 2
+    area.evaluate(r=SFFloat(3.4, 2))
+
+Evaluation runs in one pass over the tree, computing common subexpressions only
+once, and applies the ordinary :class:`SFFloat` arithmetic, so the result equals
+the eager computation. The evaluation order is worked out once per expression,
+which may then be evaluated for many different variable bindings.
+"""
+
+import math
+import operator
+from .sffloat import SFFloat
+
+_BINARY = {
+    "add": operator.add,
+    "sub": operator.sub,
+    "mul": operator.mul,
+    "truediv": operator.truediv,
+    "pow": operator.pow,
+}
+_UNARY = {
+    "neg": operator.neg,
+    "pos": operator.pos,
+    "abs": operator.abs,
+}
+
+
+class SFExpr:
+    """
+    The sfexpr :class:`SFExpr` class is a node of a deferred expression. Nodes are
+    immutable and are created by :func:`lazy`, :func:`var`, :func:`apply` and by
+    arithmetic on other nodes.
+
+    :Required Arguments:
+        * **op** [str] The node operation: "const", "var", "call", one of the
+            binary operations "add", "sub", "mul", "truediv" and "pow" or one of
+            the unary operations "neg", "pos" and "abs".
+        * **args** [tuple] The operands of the node. A "const" node holds its
+            value, a "var" node its name and a "call" node its function followed
+            by the argument nodes."""
+
+    __slots__ = ("op", "args", "_program")
+
+    def __init__(self, op, args):
+        self.op = op
+        self.args = args
+        self._program = None
+
+    def __repr__(self):
+        # iterative, like _linearize, so that deep expressions do not recurse
+        texts = {}  # id(node) -> repr
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in texts:
+                continue
+            if node.op in ("const", "var"):
+                name = "lazy" if node.op == "const" else "var"
+                texts[id(node)] = f"{name}({node.args[0]!r})"
+                continue
+            operands = node.args[1:] if node.op == "call" else node.args
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((arg, False) for arg in reversed(operands))
+                continue
+            head = node.args[0].__name__ if node.op == "call" else node.op
+            args = ", ".join(texts[id(arg)] for arg in operands)
+            texts[id(node)] = f"{head}({args})"
+        return texts[id(self)]
+
+    @property
+    def variables(self):
+        """
+        Return the sorted names of the variables in the expression.
+        """
+        return sorted({args[0] for op, args, _ in self.program if op == "var"})
+
+    @property
+    def program(self):
+        """
+        Return the expression as a list of steps in evaluation order, with common
+        subexpressions merged. Each step is a tuple (op, args, slots) where slots
+        holds the step indices of the operand nodes.
+        """
+        if self._program is None:
+            self._program = _linearize(self)
+        return self._program
+
+    def evaluate(self, **bindings):
+        """
+        Return the value of the expression, with variables bound to the values
+        given as keyword arguments. Values may be SFFloat, float or SFArray.
+        """
+        return _run(self.program, bindings)
+
+    __call__ = evaluate
+
+    def _binary(self, op, other, reflected=False):
+        """
+        Return a new binary node for self and other.
+        """
+        if reflected:
+            return SFExpr(op, (_node(other), _node(self)))
+        return SFExpr(op, (_node(self), _node(other)))
+
+    def __add__(self, other):
+        return self._binary("add", other)
+
+    def __radd__(self, other):
+        return self._binary("add", other, True)
+
+    def __sub__(self, other):
+        return self._binary("sub", other)
+
+    def __rsub__(self, other):
+        return self._binary("sub", other, True)
+
+    def __mul__(self, other):
+        return self._binary("mul", other)
+
+    def __rmul__(self, other):
+        return self._binary("mul", other, True)
+
+    def __truediv__(self, other):
+        return self._binary("truediv", other)
+
+    def __rtruediv__(self, other):
+        return self._binary("truediv", other, True)
+
+    def __pow__(self, other):
+        return self._binary("pow", other)
+
+    def __rpow__(self, other):
+        return self._binary("pow", other, True)
+
+    def __neg__(self):
+        return SFExpr("neg", (self,))
+
+    def __pos__(self):
+        return SFExpr("pos", (self,))
+
+    def __abs__(self):
+        return SFExpr("abs", (self,))
+
+
+def _node(value):
+    """
+    Return value as an SFExpr node.
+    """
+    if isinstance(value, SFExpr):
+        return value
+    return SFExpr("const", (value,))
+
+
+def _const_key(value):
+    """
+    Return a key identifying a constant value, for merging equal constants.
+    Subclasses of SFFloat may hold more than a value and an lsd (e.g. a unit), so
+    only plain SFFloat, float and int constants are merged.
+    """
+    if type(value) is SFFloat:  # pylint: disable=unidiomatic-typecheck
+        val = value.value
+        return (type(value), val, math.copysign(1.0, val), value.lsd)
+    if isinstance(value, (float, int)):
+        return (type(value), value, math.copysign(1.0, value))
+    return (id(value),)
+
+
+def _linearize(root):
+    """
+    Return the evaluation steps of the expression rooted at root. Subexpressions
+    with the same structure are merged into a single step.
+    """
+    program = []
+    slots = {}  # structural key -> step index
+    node_slots = {}  # id(node) -> step index
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in node_slots:
+            continue
+        if node.op == "const":
+            key = ("const", _const_key(node.args[0]))
+            operands = ()
+        elif node.op == "var":
+            key = ("var", node.args[0])
+            operands = ()
+        else:
+            operands = node.args[1:] if node.op == "call" else node.args
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((arg, False) for arg in reversed(operands))
+                continue
+            arg_slots = tuple(node_slots[id(arg)] for arg in operands)
+            head = node.args[0] if node.op == "call" else None
+            key = (node.op, head, arg_slots)
+        if key not in slots:
+            slots[key] = len(program)
+            if node.op in ("const", "var"):
+                args = node.args
+            else:
+                args = (head,) if node.op == "call" else ()
+            program.append((node.op, args, key[-1] if operands else ()))
+        node_slots[id(node)] = slots[key]
+    return program
+
+
+def _run(program, bindings, functions=None):
+    """
+    Return the result of the steps of program, with variables bound to the values
+    in bindings. The functions of "call" steps are replaced by their entries in
+    functions, if given.
+    """
+    results = []
+    for op, args, slots in program:
+        if op == "const":
+            result = args[0]
+        elif op == "var":
+            try:
+                result = bindings[args[0]]
+            except KeyError:
+                raise NameError(f"Unbound variable {args[0]!r}.") from None
+        elif op == "call":
+            func = functions.get(args[0], args[0]) if functions else args[0]
+            result = func(*(results[slot] for slot in slots))
+        elif op in _UNARY:
+            result = _UNARY[op](results[slots[0]])
+        else:
+            result = _BINARY[op](results[slots[0]], results[slots[1]])
+        results.append(result)
+    return results[-1]
+
+
+def lazy(value):
+    """
+    Return value (an SFFloat, float or SFArray) as a constant expression node, so
+    that arithmetic with it is deferred.
+    """
+    return _node(value)
+
+
+def var(name):
+    """
+    Return a named variable expression node, to be bound when the expression is
+    evaluated.
+    """
+    return SFExpr("var", (name,))
+
+
+def apply(func, *args):
+    """
+    Return an expression node that calls func (e.g. :func:`sffloat.sfsin`) with
+    args when evaluated.
+    """
+    return SFExpr("call", (func,) + tuple(_node(arg) for arg in args))
@@ -5,13 +5,199 @@ mathematics functions.
 """
 
 import math
-import warnings
-import sigfig
+import operator
+import os
+from .sfformat import format_sigfigs, rounded_value, display_key, float_display_key
+
+# The core of SFFloat (storage, arithmetic and comparisons) comes from the optional
+# C extension if it is built, unless SFFLOAT_PURE_PYTHON is set in the environment.
+if os.environ.get("SFFLOAT_PURE_PYTHON"):
+    from ._pycore import SFCore
+else:
+    try:
+        from ._sfcore import SFCore  # pylint: disable=no-name-in-module
+    except ImportError:
+        from ._pycore import SFCore
+
+BACKEND = "python" if SFCore.__module__.endswith("_pycore") else "c"
+
+# SFFloat subclasses that propagate their precision through the math functions in
+# their own way (e.g. :class:`sffloat.sfuncertain.SFUncertain`) register a function
+# hook(func, *args) here, keyed by class, which the sf math functions call instead.
+_MATH_HOOKS = {}
+
+# math.cbrt and math.exp2 are new in Python 3.11
+_cbrt = getattr(math, "cbrt", lambda x: math.copysign(abs(x) ** (1.0 / 3.0), x))
+_exp2 = getattr(math, "exp2", lambda x: 2.0**x)
+
+# partial derivatives of the math functions, by argument, as functions of
+# (m, *args) where m is the math module for scalars or numpy for arrays
+_PARTIALS = {
+    math.sin: (lambda m, x: m.cos(x),),
+    math.cos: (lambda m, x: -m.sin(x),),
+    math.tan: (lambda m, x: 1.0 / m.cos(x) ** 2,),
+    math.asin: (lambda m, x: 1.0 / m.sqrt(1.0 - x * x),),
+    math.acos: (lambda m, x: -1.0 / m.sqrt(1.0 - x * x),),
+    math.atan: (lambda m, x: 1.0 / (1.0 + x * x),),
+    math.atan2: (
+        lambda m, y, x: x / (x * x + y * y),
+        lambda m, y, x: -y / (x * x + y * y),
+    ),
+    math.sinh: (lambda m, x: m.cosh(x),),
+    math.cosh: (lambda m, x: m.sinh(x),),
+    # sech(x) ** 2, written with exp(-2|x|) so that it does not overflow
+    math.tanh: (
+        lambda m, x: 4.0 * m.exp(-2.0 * abs(x)) / (1.0 + m.exp(-2.0 * abs(x))) ** 2,
+    ),
+    math.asinh: (lambda m, x: 1.0 / m.sqrt(x * x + 1.0),),
+    math.acosh: (lambda m, x: 1.0 / m.sqrt(x * x - 1.0),),
+    math.atanh: (lambda m, x: 1.0 / (1.0 - x * x),),
+    math.log: (lambda m, x: 1.0 / x,),
+    math.log10: (lambda m, x: 1.0 / (x * math.log(10.0)),),
+    math.log2: (lambda m, x: 1.0 / (x * math.log(2.0)),),
+    math.log1p: (lambda m, x: 1.0 / (1.0 + x),),
+    math.exp: (lambda m, x: m.exp(x),),
+    _exp2: (lambda m, x: 2.0**x * math.log(2.0),),
+    math.expm1: (lambda m, x: m.exp(x),),
+    math.pow: (
+        lambda m, x, y: y * x ** (y - 1.0),
+        lambda m, x, y: x**y * m.log(abs(x) + (x == 0)),
+    ),
+    math.sqrt: (lambda m, x: 0.5 / m.sqrt(x),),
+    _cbrt: (lambda m, x: abs(x) ** (-2.0 / 3.0) / 3.0,),
+    math.hypot: (
+        lambda m, x, y: x / m.hypot(x, y),
+        lambda m, x, y: y / m.hypot(x, y),
+    ),
+    math.degrees: (lambda m, x: 180.0 / math.pi,),
+    math.radians: (lambda m, x: math.pi / 180.0,),
+}
+
+
+def _mantissa(val, arg, lsd, sigfigs):  # pylint: disable=unused-argument
+    """
+    Rule of a logarithm, whose integer part only gives the power of ten: the
+    result has as many decimal places as its argument has sigfigs.
+    """
+    result = (math.floor(math.log10(abs(val))) if val else 0) + sigfigs + 1
+    return result if result >= 1 else max(min(1, sigfigs), result)
+
+
+def _decimals(val, arg, lsd, sigfigs):  # pylint: disable=unused-argument
+    """
+    Rule of an exponential: the result has as many sigfigs as its argument has
+    decimal places.
+    """
+    return -lsd if -lsd >= 1 else max(min(1, sigfigs), -lsd)
+
+
+def _conditioned(partial):
+    """
+    Return the rule of a function of one argument with derivative partial: the
+    result loses a digit for each power of ten of the condition number
+    |x * f'(x) / f(x)|, keeping at most the sigfigs of its argument and at least
+    one.
+    """
+
+    def rule(val, arg, lsd, sigfigs):  # pylint: disable=unused-argument
+        if arg == 0.0:
+            return sigfigs
+        try:
+            cond = abs(arg * partial(math, arg) / val)
+        except (ArithmeticError, ValueError):
+            return min(1, sigfigs)
+        if cond < 10.0:
+            return sigfigs
+        if not math.isfinite(cond):
+            return min(1, sigfigs)
+        return max(min(1, sigfigs), sigfigs - math.floor(math.log10(cond)))
+
+    return rule
 
-warnings.simplefilter("ignore")
 
+def _kept(partial, val, args, index, sigfigs):
+    """
+    Return the sigfigs that the condition number of a function of args, with
+    partial derivative partial by args[index], leaves of the sigfigs of that
+    argument, or -inf at a pole.
+    """
+    arg = args[index]
+    if sigfigs == math.inf or arg == 0.0:
+        return sigfigs
+    try:
+        cond = abs(arg * partial(math, *args) / val)
+    except (ArithmeticError, ValueError):
+        return -math.inf
+    if cond < 10.0:
+        return sigfigs
+    if not math.isfinite(cond):
+        return -math.inf
+    return sigfigs - math.floor(math.log10(cond))
+
+
+def _conditioned2(partial1, partial2):
+    """
+    Return the rule of a function of two arguments with partial derivatives
+    partial1 and partial2, which applies the condition number rule of
+    :func:`_conditioned` to each argument.
+    """
 
-class SFFloat:
+    def rule(val, arg1, arg2, sigfigs1, sigfigs2):
+        limit = sigfigs1 if sigfigs1 < sigfigs2 else sigfigs2
+        result = min(
+            _kept(partial1, val, (arg1, arg2), 0, sigfigs1),
+            _kept(partial2, val, (arg1, arg2), 1, sigfigs2),
+        )
+        if result >= limit:
+            return limit
+        return result if result >= 1 else max(min(1, limit), result)
+
+    return rule
+
+
+# Significant figures rules of the math functions, as functions of the result
+# val and the value and sigfigs of each argument that return the sigfigs of the
+# result: rule(val, arg, lsd, sigfigs) for functions of one argument, with finite
+# sigfigs, and rule(val, arg1, arg2, sigfigs1, sigfigs2) for functions of two
+# arguments. Functions without a rule keep the fewest sigfigs of their arguments.
+# The batched sfmath functions apply the same rules.
+_RULES = {
+    func: _conditioned(partials[0])
+    for func, partials in _PARTIALS.items()
+    if len(partials) == 1
+}
+_RULES.update(
+    {
+        math.log: _mantissa,
+        math.log10: _mantissa,
+        math.log2: _mantissa,
+        math.exp: _decimals,
+        _exp2: _decimals,
+    }
+)
+_RULES2 = {
+    func: _conditioned2(*partials)
+    for func, partials in _PARTIALS.items()
+    if len(partials) == 2
+}
+
+
+def _function_sigfigs(func, val, vals, lsds, sigfigs):
+    """
+    Return the sigfigs of val, the result of func(*vals), for arguments with lsds
+    (None for unlimited precision) and sigfigs, by the rule of func.
+    """
+    limit = min(sigfigs)
+    if len(vals) == 1:
+        rule = _RULES.get(func)
+        if rule is None or limit == math.inf:
+            return limit
+        return rule(val, vals[0], lsds[0], limit)
+    rule = _RULES2.get(func)
+    return limit if rule is None else rule(val, *vals, *sigfigs)
+
+
+class SFFloat(SFCore):
     """
     The sffloat :class:`SFFloat` class implements a replacement of the builtin float that
     can define floating point type values with an additional significant figures attribute.
@@ -36,38 +222,23 @@ class SFFloat:
             indicating digits to the left of the ones place. Note that the **sigfigs**
             argument and the **lsd** argument may not be used at the same time."""
 
-    inf = float("inf")
-
-    def __new__(cls, val, sigfigs=None, **_):
-        if isinstance(val, cls) and sigfigs is None:
-            return val
-        return super().__new__(cls)
-
-    def __init__(self, value, sigfigs=None, **kwargs):
-        if sigfigs and not isinstance(sigfigs, int) and not sigfigs is float("inf"):
-            raise ValueError("Invalid value for sigfigs.")
-        if sigfigs is None and self is value:
-            return  # just passthru
-        self._lsd = kwargs.get("lsd", None)
-        if self._lsd is not None and sigfigs is not None:
-            raise ValueError("Can not specify both lsd and sigfigs.")
-        # passing value only - infinite sigfigs
-        if self._lsd is None and sigfigs is None:
-            self._sf = self.inf
-        # passing lsd value, set _sf to None
-        elif self._lsd is not None:
-            self._sf = None
-        # sigfigs must be set - figure out lsd
-        else:
-            self._sf = None
-            self._lsd = self._msd_from_val(value) - (sigfigs - 1)
-        self._val = float(value)
+    __slots__ = ()
+
+    # key function ordering SFFloat values like the < operator, at float speed:
+    # sorted(values, key=SFFloat.sort_key)
+    sort_key = operator.attrgetter("_val")
 
     def copy(self):
         """
         Return a new instance of SFFloat that is a copy.
         """
-        return type(self)(self._val, lsd=self._lsd)
+        return self._from_parts(self._val, self._lsd, self._sf)
+
+    def __reduce__(self):
+        """
+        Implements pickling (and copy) support, storing only the value and lsd.
+        """
+        return type(self)._from_parts, (self._val, self._lsd)
 
     def equivalent_to_float(self, other):
         """
@@ -78,62 +249,68 @@ class SFFloat:
         Ex. SFFloat(3.1415926, 3).equivalent_to(3.142) --> True
         """
         sfother = type(self)(other, self.sigfigs)
-        return str(self) == str(sfother)
+        return self.display_key() == sfother.display_key()
 
-    @property
-    def sigfigs(self):
-        """
-        Return the number of significant figures for this value
-        """
-        if self._sf is self.inf:
-            return self._sf
-        return self._msd_from_val(self._val) - self._lsd + 1
-
-    @property
-    def value(self):
-        """
-        Return the full-precision internal value
+    def display_key(self):
         """
-        return self._val
+        Return a hashable key describing how this value displays. Two values
+        have equal keys exactly when their str() representations are equal, so
+        the key may be used to group or dedupe values by their displayed text,
+        without formatting them.
 
-    @property
-    def lsd(self):
+        Ex. SFFloat(3.1415926, 3).display_key() == SFFloat(3.142, 3).display_key()
         """
-        Return the position of the least significant digit.
-        0 means 1's place, 1 means 10's place, -1 means 0.1's place, etc.
-        """
-        return self._lsd
+        if self._sf is self.inf:
+            return float_display_key(self._val)
+        sigfigs = self.sigfigs
+        if sigfigs <= 0:
+            return ("std", False, 0, 0)
+        return display_key(self._val, sigfigs)
 
     # Wrappers for mathematics functions
 
     @classmethod
     def funcwrapper(cls, func, arg):
         """
-        Generic wrapper for functions that support SFFloat arguments
+        Generic wrapper for functions that support SFFloat arguments. The sigfigs
+        of the result follow the rule of func (see _RULES): e.g. a logarithm keeps
+        the sigfigs of its argument as decimal places.
         """
-        try:
-            return cls(func(arg), arg.sigfigs)
-        except AttributeError:
+        kind = type(arg)
+        if kind is float or kind is int:
+            return func(arg)
+        hook = _MATH_HOOKS.get(kind)
+        if hook is not None:
+            return hook(func, arg)
+        if not isinstance(arg, SFFloat):
             return func(arg)
+        value = arg.value
+        val = func(value)
+        sigfigs = arg.sigfigs
+        if sigfigs != cls.inf:
+            rule = _RULES.get(func)
+            if rule is not None:
+                sigfigs = rule(val, value, arg.lsd, sigfigs)
+        return cls(val, sigfigs)
 
     @classmethod
     def funcwrapper2(cls, func, arg1, arg2):
         """
-        Generic wrapper for functions that support sffloat arguments
+        Generic wrapper for functions that support sffloat arguments. The sigfigs
+        of the result follow the rule of func, as for :meth:`funcwrapper`.
         """
-        if not isinstance(arg1, cls) and not isinstance(arg2, cls):
+        hook = _MATH_HOOKS.get(type(arg1)) or _MATH_HOOKS.get(type(arg2))
+        if hook is not None:
+            return hook(func, arg1, arg2)
+        if not isinstance(arg1, SFFloat) and not isinstance(arg2, SFFloat):
             return func(arg1, arg2)
-        return cls(func(arg1, arg2), min(cls(arg1).sigfigs, cls(arg2).sigfigs))
-
-    @staticmethod
-    def _msd_from_val(val):
-        """
-        Return the position of the most significant digit.
-        0 means 1's place, 1 means 10's place, -1 means 0.1's place, etc.
-        """
-        if not val:
-            return 0
-        return math.floor(math.log10(abs(val)))
+        val1, _, sigfigs1 = cls._parts_of(arg1)
+        val2, _, sigfigs2 = cls._parts_of(arg2)
+        val = func(val1, val2)
+        rule = _RULES2.get(func)
+        if rule is None:
+            return cls(val, min(sigfigs1, sigfigs2))
+        return cls(val, rule(val, val1, val2, sigfigs1, sigfigs2))
 
     def _msd(self):
         """
@@ -142,33 +319,6 @@ class SFFloat:
         """
         return math.floor(math.log10(abs(self._val)))
 
-    @classmethod
-    def _multiplicative_func(cls, func, arg1, arg2):
-        """
-        Perform method func on its object arg1, and other arg2.
-        """
-        sfother = cls(arg2)
-        minsigfig = min(arg1.sigfigs, sfother.sigfigs)
-        if minsigfig <= 0:
-            raise ValueError(
-                f"Precision of {func} with zero sigfig operand is undefined."
-            )
-        return cls(func(arg1.value, sfother.value), minsigfig)
-
-    @classmethod
-    def _additive_func(cls, func, arg1, arg2):
-        """
-        Perform method func on its object arg1, and other arg2.
-        """
-        sfother = cls(arg2)
-        if arg1.sigfigs is cls.inf:
-            lsd = sfother.lsd
-        elif sfother.sigfigs is cls.inf:
-            lsd = arg1.lsd
-        else:
-            lsd = max(arg1.lsd, sfother.lsd)
-        return cls(func(arg1.value, sfother.value), lsd=lsd)
-
     def __repr__(self):
         if self._sf is self.inf:
             return f"{type(self).__name__}({self._val})"
@@ -180,94 +330,23 @@ class SFFloat:
         sigfigs = self.sigfigs
         if sigfigs <= 0:
             return "0"
-        nottype = "sci"
-        if 0.001 < abs(self._val) < 1000 or self._val == 0.0:
-            nottype = "std"
-        return sigfig.round(self._val, self.sigfigs, notation=nottype)
+        return format_sigfigs(self._val, sigfigs)
 
     def __format__(self, format_spec):
         if format_spec == "":
             return str(self)
-        return float(str(self)).__format__(format_spec)
-
-    def __float__(self):
-        return self._val
-
-    def __add__(self, other):
-        """
-        Implements addition.
-        """
-        return self._additive_func(float.__add__, self, other)
-
-    def __radd__(self, other):
-        """
-        Implements reflected addition.
-        """
-        return self + other
-
-    def __sub__(self, other):
-        """
-        Implements subtraction.
-        """
-        return self._additive_func(float.__sub__, self, other)
-
-    def __rsub__(self, other):
-        """
-        Implements reflected subtraction.
-        """
-        return self._additive_func(float.__rsub__, self, other)
-
-    def __mul__(self, other):
-        """
-        Implements multiplication.
-        """
-        return self._multiplicative_func(float.__mul__, self, other)
-
-    def __rmul__(self, other):
-        """
-        Implements reflected multiplication.
-        """
-        return self._multiplicative_func(float.__rmul__, self, other)
-
-    def __truediv__(self, other):
-        """
-        Implements true division.
-        """
-        return self._multiplicative_func(float.__truediv__, self, other)
-
-    def __rtruediv__(self, other):
-        """
-        Implements reflected true division.
-        """
-        return self._multiplicative_func(float.__rtruediv__, self, other)
-
-    def __pow__(self, other):
-        """
-        Implements behavior for exponents using the ** operator.
-        """
-        return self._multiplicative_func(float.__pow__, self, other)
+        return self._rounded().__format__(format_spec)
 
-    def __rpow__(self, other):
+    def _rounded(self):
         """
-        Implements behavior for reflected exponents using the ** operator.
+        Return the value rounded to its significant figures, as a float.
         """
-        return self._multiplicative_func(float.__rpow__, self, other)
-
-    def __eq__(self, other):
-        """
-        Implements equality operator: ==
-        Checks for matching value and sigfigs.
-        """
-        other = SFFloat(other)
-        return self._val == other.value and self.sigfigs == other.sigfigs
-
-    def __ne__(self, other):
-        """
-        Implements not equal operator: !=
-        Checks for mismatching value or sigfig.
-        """
-        other = SFFloat(other)
-        return self._val != other.value or self.sigfigs != other.sigfigs
+        if self._sf is self.inf:
+            return self._val
+        sigfigs = self.sigfigs
+        if sigfigs <= 0:
+            return 0.0
+        return rounded_value(self._val, sigfigs)
 
     def __cmp__(self, other):
         """
@@ -282,56 +361,6 @@ class SFFloat:
             return -1
         return 0
 
-    def __lt__(self, other):
-        """
-        Implements less than operator: <
-        This compares the raw values and considers sig figs
-        """
-        return self._val < type(self)(other)._val and self != other
-
-    def __gt__(self, other):
-        """
-        Implements greater than operator: >
-        This compares the raw values and considers sig figs
-        """
-        return self._val > type(self)(other)._val and self != other
-
-    def __le__(self, other):
-        """
-        Implements less than operator: <
-        This compares the raw values and considers sig figs
-        """
-        return self._val < type(self)(other)._val or self == other
-
-    def __ge__(self, other):
-        """
-        Implements greater than operator: >
-        This compares the raw values and considers sig figs
-        """
-        return self._val > type(self)(other)._val or self == other
-
-    def __pos__(self):
-        """
-        Implements the unary + operator. This does nothing.
-        """
-        return self
-
-    def __neg__(self):
-        """
-        Implements the unary - operator. Makes value negative.
-        """
-        retval = self.copy()
-        retval._val = -retval._val
-        return retval
-
-    def __abs__(self):
-        """
-        Implements the absolute value function.
-        """
-        retval = self.copy()
-        retval._val = abs(retval._val)
-        return retval
-
 
 def sfsin(x):
     """
@@ -429,3 +458,87 @@ def sfradians(x):
     Implements a sig-fig aware replacement for the standard radians function.
     """
     return SFFloat.funcwrapper(math.radians, x)
+
+
+def sfsinh(x):
+    """
+    Implements a sig-fig aware replacement for the standard sinh function.
+    """
+    return SFFloat.funcwrapper(math.sinh, x)
+
+
+def sfcosh(x):
+    """
+    Implements a sig-fig aware replacement for the standard cosh function.
+    """
+    return SFFloat.funcwrapper(math.cosh, x)
+
+
+def sftanh(x):
+    """
+    Implements a sig-fig aware replacement for the standard tanh function.
+    """
+    return SFFloat.funcwrapper(math.tanh, x)
+
+
+def sfasinh(x):
+    """
+    Implements a sig-fig aware replacement for the standard asinh function.
+    """
+    return SFFloat.funcwrapper(math.asinh, x)
+
+
+def sfacosh(x):
+    """
+    Implements a sig-fig aware replacement for the standard acosh function.
+    """
+    return SFFloat.funcwrapper(math.acosh, x)
+
+
+def sfatanh(x):
+    """
+    Implements a sig-fig aware replacement for the standard atanh function.
+    """
+    return SFFloat.funcwrapper(math.atanh, x)
+
+
+def sflog2(x):
+    """
+    Implements a sig-fig aware replacement for the standard log2 function.
+    """
+    return SFFloat.funcwrapper(math.log2, x)
+
+
+def sflog1p(x):
+    """
+    Implements a sig-fig aware replacement for the standard log1p function.
+    """
+    return SFFloat.funcwrapper(math.log1p, x)
+
+
+def sfexp2(x):
+    """
+    Implements a sig-fig aware replacement for the standard exp2 function.
+    """
+    return SFFloat.funcwrapper(_exp2, x)
+
+
+def sfexpm1(x):
+    """
+    Implements a sig-fig aware replacement for the standard expm1 function.
+    """
+    return SFFloat.funcwrapper(math.expm1, x)
+
+
+def sfcbrt(x):
+    """
+    Implements a sig-fig aware replacement for the standard cbrt function.
+    """
+    return SFFloat.funcwrapper(_cbrt, x)
+
+
+def sfhypot(x, y):
+    """
+    Implements a sig-fig aware replacement for the standard hypot function.
+    """
+    return SFFloat.funcwrapper2(math.hypot, x, y)
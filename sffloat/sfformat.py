@@ -0,0 +1,153 @@
+"""
+The sfformat module implements the rounding and string formatting used to display
+:class:`SFFloat` values. It reproduces the "std" and "sci" output of `sigfig.round`
+while working directly on the shortest decimal representation of the float.
+"""
+
+import math
+
+
+def round_digits(val, sigfigs):
+    """
+    Round val to sigfigs significant figures.
+
+    Returns a tuple (negative, digits, msd) where digits is a string of exactly
+    sigfigs decimal digits and msd is the power of ten of the first digit. Rounding
+    is half-up on the shortest decimal representation of val, as in `sigfig.round`.
+    """
+    if not val:
+        return False, "0" * sigfigs, 0
+    text = repr(val)
+    negative = text[0] == "-"
+    if negative:
+        text = text[1:]
+    mantissa, _, exponent = text.partition("e")
+    whole, _, fraction = mantissa.partition(".")
+    digits = (whole + fraction).lstrip("0")
+    msd = _first_digit_power(whole, fraction, exponent)
+    return round_digit_string(negative, digits, msd, sigfigs)
+
+
+def round_digit_string(negative, digits, msd, sigfigs):
+    """
+    Round a string of decimal digits, the first of which has the power of ten msd,
+    half-up to sigfigs significant figures. Returns the tuple of :func:`round_digits`.
+    """
+    if len(digits) <= sigfigs:
+        return negative, digits + "0" * (sigfigs - len(digits)), msd
+    kept = digits[:sigfigs]
+    if digits[sigfigs] >= "5":
+        kept = str(int(kept) + 1)
+        if len(kept) > sigfigs:
+            kept = kept[:sigfigs]
+            msd += 1
+    return negative, kept, msd
+
+
+def _first_digit_power(whole, fraction, exponent):
+    """
+    Return the power of ten of the first nonzero digit of a float repr.
+    """
+    power = int(exponent) if exponent else 0
+    stripped = whole.lstrip("0")
+    if stripped:
+        return power + len(stripped) - 1
+    return power - 1 - (len(fraction) - len(fraction.lstrip("0")))
+
+
+def format_std(negative, digits, msd):
+    """
+    Return rounded digits formatted in standard notation.
+    """
+    lsd = msd - len(digits) + 1
+    if lsd >= 0:
+        text = digits + "0" * lsd
+    elif msd < 0:
+        text = "0." + "0" * (-msd - 1) + digits
+    else:
+        text = digits[: msd + 1] + "." + digits[msd + 1 :]
+    return "-" + text if negative else text
+
+
+def format_sci(negative, digits, msd):
+    """
+    Return rounded digits formatted in scientific notation.
+    """
+    text = digits[0] + "." + digits[1:] if len(digits) > 1 else digits
+    text += "E" + str(msd)
+    return "-" + text if negative else text
+
+
+def notation_of(val):
+    """
+    Return the notation used to display val: "std" for values between 0.001 and
+    1000 (and for zero), otherwise "sci".
+    """
+    if 0.001 < abs(val) < 1000 or val == 0.0:
+        return "std"
+    return "sci"
+
+
+def format_sigfigs(val, sigfigs, notation=None):
+    """
+    Return val rounded to sigfigs significant figures as a string in "std" or
+    "sci" notation. If notation is omitted it is chosen with :func:`notation_of`.
+    """
+    if notation is None:
+        notation = notation_of(val)
+    if notation == "std":
+        return format_std(*round_digits(val, sigfigs))
+    if notation == "sci":
+        return format_sci(*round_digits(val, sigfigs))
+    raise ValueError(f"Invalid notation {notation!r}.")
+
+
+def rounded_value(val, sigfigs):
+    """
+    Return val rounded to sigfigs significant figures, as a float.
+    """
+    negative, digits, msd = round_digits(val, sigfigs)
+    return float(f"{'-' if negative else ''}{digits}e{msd - len(digits) + 1}")
+
+
+def display_key(val, sigfigs):
+    """
+    Return a hashable key for the text of val rounded to sigfigs significant
+    figures: two results display the same exactly when their keys are equal.
+    Standard notation text is keyed by its digits as an integer and its number of
+    decimal places, so that the string itself is never built.
+    """
+    return digits_display_key(*round_digits(val, sigfigs), notation_of(val))
+
+
+def digits_display_key(negative, digits, msd, notation):
+    """
+    Return the :func:`display_key` of rounded digits displayed in notation.
+    """
+    if notation == "sci":
+        return ("sci", negative, digits, msd)
+    lsd = msd - len(digits) + 1
+    if lsd >= 0:
+        return ("std", negative, int(digits) * 10**lsd, 0)
+    return ("std", negative, int(digits), -lsd)
+
+
+def float_display_key(val):
+    """
+    Return the :func:`display_key` equivalent for a float displayed with str().
+    """
+    text = repr(val)
+    if not math.isfinite(val):
+        return ("float", text)  # the text, as nan is not equal to itself
+    if "e" in text:
+        return ("float", val)
+    return std_text_key(text)
+
+
+def std_text_key(text):
+    """
+    Return the :func:`display_key` equivalent for text in standard notation.
+    """
+    mantissa = text.lstrip("-")
+    whole, _, fraction = mantissa.partition(".")
+    return ("std", text[0] == "-", int(whole + fraction), len(fraction))
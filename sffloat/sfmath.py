@@ -0,0 +1,308 @@
+"""
+The sfmath module defines batched versions of the sig-fig aware math functions in
+:mod:`sffloat.sffloat`. Each function accepts a list, array or other iterable of
+:class:`SFFloat` or float values and applies exactly the same significant figures
+rules as the corresponding scalar function (e.g. :func:`sffloat.sfsin`).
+
+:class:`SFArray` and NumPy array arguments are computed with NumPy and return an
+:class:`SFArray` or NumPy array, respectively. Other iterables are computed with a
+pure Python loop and return a list.
+
+Batch types that propagate their precision in their own way (e.g.
+:class:`sffloat.sfuncertain.SFUncertainArray`) register a function
+hook(func, *args, ufunc=ufunc) in :data:`_BATCH_HOOKS`, keyed by class, which is
+called with the math function and the equivalent NumPy ufunc.
+"""
+
+# pylint: disable=protected-access
+
+import math
+from .sffloat import SFFloat, _PARTIALS, _RULES, _mantissa, _decimals, _cbrt, _exp2
+from .sfarray import SFArray, np, _msd
+
+_BATCH_HOOKS = {}
+
+
+def _function_sigfigs(func, vals, operands):
+    """
+    Return the sigfigs of vals, the results of func for operands, a list of value
+    and lsd arrays, by the rule of func, as :meth:`SFFloat.funcwrapper` and
+    :meth:`SFFloat.funcwrapper2` give for each element.
+    """
+    sigfigs = [SFArray._sigfigs_of(val, lsd) for val, lsd in operands]
+    limit = sigfigs[0] if len(sigfigs) == 1 else np.minimum(*sigfigs)
+    rule = _RULES.get(func) if len(operands) == 1 else None
+    with np.errstate(all="ignore"):
+        if rule is _mantissa:
+            result = _msd(vals) + limit + 1
+        elif rule is _decimals:
+            result = -operands[0][1].astype(np.float64)
+        elif func in _PARTIALS:
+            args = [val for val, _ in operands]
+            result = np.full(vals.shape, np.inf)
+            for partial, arg, arg_sigfigs in zip(_PARTIALS[func], args, sigfigs):
+                cond = np.abs(arg * partial(np, *args) / vals)
+                digits = np.where(
+                    np.isfinite(cond), arg_sigfigs - np.floor(np.log10(cond)), -np.inf
+                )
+                skip = np.isinf(arg_sigfigs) | (arg == 0.0) | (cond == 0.0)
+                result = np.minimum(result, np.where(skip, np.inf, digits))
+            result = np.minimum(limit, result)
+        else:
+            return limit
+        result = np.maximum(np.minimum(1, limit), result)
+    return np.where(np.isinf(limit), np.inf, result)
+
+
+def _is_array(arg):
+    """
+    Return True if arg should be computed with NumPy.
+    """
+    return np is not None and isinstance(arg, (SFArray, np.ndarray))
+
+
+def _ufunc(ufunc, *args):
+    """
+    Call a NumPy ufunc, raising the errors that the math module would raise.
+    """
+    try:
+        with np.errstate(divide="raise", invalid="raise", over="raise"):
+            return ufunc(*args)
+    except FloatingPointError as err:
+        if "overflow" in str(err):
+            raise OverflowError("math range error") from err
+        raise ValueError("math domain error") from err
+
+
+def _map1(func, ufunc_name, args):
+    """
+    Apply func to every element of args.
+    """
+    hook = _BATCH_HOOKS.get(type(args))
+    if hook is not None:
+        return hook(func, args, ufunc=getattr(np, ufunc_name))
+    if not _is_array(args):
+        wrapper = SFFloat.funcwrapper
+        return [wrapper(func, arg) for arg in args]
+    ufunc = getattr(np, ufunc_name)
+    if not isinstance(args, SFArray):
+        return _ufunc(ufunc, args)
+    vals = _ufunc(ufunc, args.value)
+    sigfigs = _function_sigfigs(func, vals, [(args.value, args.lsd)])
+    return SFArray._from_arrays(vals, SFArray._lsd_from_sigfigs(vals, sigfigs))
+
+
+def _map2(func, ufunc_name, args1, args2):
+    """
+    Apply func to the elements of args1 and args2 pairwise. Either argument may be
+    a single SFFloat or float, which is used with every element of the other.
+    """
+    hook = _BATCH_HOOKS.get(type(args1)) or _BATCH_HOOKS.get(type(args2))
+    if hook is not None:
+        return hook(func, args1, args2, ufunc=getattr(np, ufunc_name))
+    if not _is_array(args1) and not _is_array(args2):
+        scalar1 = isinstance(args1, (SFFloat, float, int))
+        scalar2 = isinstance(args2, (SFFloat, float, int))
+        if scalar1 and scalar2:
+            raise TypeError("At least one argument must be iterable.")
+        wrapper = SFFloat.funcwrapper2
+        if scalar1:
+            return [wrapper(func, args1, arg2) for arg2 in args2]
+        if scalar2:
+            return [wrapper(func, arg1, args2) for arg1 in args1]
+        return [wrapper(func, arg1, arg2) for arg1, arg2 in zip(args1, args2)]
+    ufunc = getattr(np, ufunc_name)
+    if not isinstance(args1, (SFArray, SFFloat)) and not isinstance(
+        args2, (SFArray, SFFloat)
+    ):
+        return _ufunc(ufunc, args1, args2)
+    val1, lsd1 = SFArray._operand(args1)
+    val2, lsd2 = SFArray._operand(args2)
+    vals = _ufunc(ufunc, val1, val2)
+    sigfigs = _function_sigfigs(func, vals, [(val1, lsd1), (val2, lsd2)])
+    sigfigs = np.broadcast_to(sigfigs, vals.shape)
+    return SFArray._from_arrays(vals, SFArray._lsd_from_sigfigs(vals, sigfigs))
+
+
+def sin(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard sin function.
+    """
+    return _map1(math.sin, "sin", x)
+
+
+def cos(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard cos function.
+    """
+    return _map1(math.cos, "cos", x)
+
+
+def tan(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard tan function.
+    """
+    return _map1(math.tan, "tan", x)
+
+
+def log(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard log function.
+    """
+    return _map1(math.log, "log", x)
+
+
+def log10(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard log10 function.
+    """
+    return _map1(math.log10, "log10", x)
+
+
+def asin(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard asin function.
+    """
+    return _map1(math.asin, "arcsin", x)
+
+
+def acos(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard acos function.
+    """
+    return _map1(math.acos, "arccos", x)
+
+
+def atan(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard atan function.
+    """
+    return _map1(math.atan, "arctan", x)
+
+
+def atan2(x, y):
+    """
+    Implements a batched sig-fig aware replacement for the standard atan2 function.
+    """
+    return _map2(math.atan2, "arctan2", x, y)
+
+
+def exp(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard exp function.
+    """
+    return _map1(math.exp, "exp", x)
+
+
+def pow(x, y):  # pylint: disable=redefined-builtin
+    """
+    Implements a batched sig-fig aware replacement for the standard pow function.
+    """
+    return _map2(math.pow, "power", x, y)
+
+
+def sqrt(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard sqrt function.
+    """
+    return _map1(math.sqrt, "sqrt", x)
+
+
+def degrees(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard degrees
+    function.
+    """
+    return _map1(math.degrees, "degrees", x)
+
+
+def radians(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard radians
+    function.
+    """
+    return _map1(math.radians, "radians", x)
+
+
+def sinh(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard sinh function.
+    """
+    return _map1(math.sinh, "sinh", x)
+
+
+def cosh(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard cosh function.
+    """
+    return _map1(math.cosh, "cosh", x)
+
+
+def tanh(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard tanh function.
+    """
+    return _map1(math.tanh, "tanh", x)
+
+
+def asinh(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard asinh function.
+    """
+    return _map1(math.asinh, "arcsinh", x)
+
+
+def acosh(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard acosh function.
+    """
+    return _map1(math.acosh, "arccosh", x)
+
+
+def atanh(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard atanh function.
+    """
+    return _map1(math.atanh, "arctanh", x)
+
+
+def log2(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard log2 function.
+    """
+    return _map1(math.log2, "log2", x)
+
+
+def log1p(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard log1p function.
+    """
+    return _map1(math.log1p, "log1p", x)
+
+
+def exp2(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard exp2 function.
+    """
+    return _map1(_exp2, "exp2", x)
+
+
+def expm1(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard expm1 function.
+    """
+    return _map1(math.expm1, "expm1", x)
+
+
+def cbrt(x):
+    """
+    Implements a batched sig-fig aware replacement for the standard cbrt function.
+    """
+    return _map1(_cbrt, "cbrt", x)
+
+
+def hypot(x, y):
+    """
+    Implements a batched sig-fig aware replacement for the standard hypot function.
+    """
+    return _map2(math.hypot, "hypot", x, y)
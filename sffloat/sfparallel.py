@@ -0,0 +1,120 @@
+"""
+The sfparallel module spreads the evaluation of a batch function over large arrays
+of values across a pool of worker processes (or threads), with :func:`map`.
+
+The inputs are split into chunks. Each chunk is sent to a worker in the compact
+:mod:`sffloat.sfstore` binary format (a float64 value column and an int16 lsd
+column) rather than as pickled :class:`SFFloat` objects, and the results come back
+the same way, to be joined in order into one :class:`SFArray`.
+
+Every chunk is copied to a worker and back, so :func:`map` only pays off when
+evaluating a chunk takes much longer than copying it, and the gain depends on the
+number of CPUs; ``python scripts/benchmark.py parallel`` measures it.
+"""
+
+# pylint: disable=protected-access
+
+import collections
+import os
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .sfarray import SFArray, np
+from . import sfstore
+
+
+def _as_sfarray(values):
+    """
+    Return values as an SFArray, rejecting the types that sfstore does not support.
+    """
+    return sfstore._as_sfarray(values, "sfparallel.map")
+
+
+def _evaluate(func, chunks):
+    """
+    Return func of the chunks, as an SFArray.
+    """
+    return _as_sfarray(func(*chunks))
+
+
+def _evaluate_buffers(func, buffers):
+    """
+    Return func of the chunks in sfstore buffers, as an sfstore buffer. This runs
+    in the worker processes.
+    """
+    return sfstore.dumps(_evaluate(func, [sfstore.loads(buffer) for buffer in buffers]))
+
+
+def _chunks(arrays, chunksize):
+    """
+    Generate the lists of chunks of the arrays, chunksize elements at a time.
+    """
+    for start in range(0, len(arrays[0]), chunksize):
+        yield [array[start : start + chunksize] for array in arrays]
+
+
+def _join(results):
+    """
+    Return the SFArray results joined into one SFArray.
+    """
+    if not results:
+        return SFArray([])
+    return SFArray._from_arrays(
+        np.concatenate([result._val for result in results]),
+        np.concatenate([result._lsd for result in results]),
+    )
+
+
+def map(  # pylint: disable=redefined-builtin
+    func, *inputs, workers=None, chunksize=None, threads=False
+):
+    """
+    Return func(*inputs) as an SFArray, evaluated in chunks by a pool of workers.
+
+    func is called with one chunk (an SFArray) of each of the inputs, and must return
+    a result of the same length, such as an SFArray. Batch functions such as those of
+    :mod:`sffloat.sfmath`, kernels made by :func:`sffloat.compile` and functions of
+    SFArray arithmetic are suitable. For worker processes, func must be picklable,
+    e.g. a module level function or a compiled kernel.
+
+    :Optional Keyword Arguments:
+        * **workers** [int] The number of worker processes, by default the number
+            of CPUs. With one worker the chunks are evaluated in this process.
+        * **chunksize** [int] The number of elements sent to a worker at a time, by
+            default enough for four chunks per worker.
+        * **threads** [bool] Use a pool of threads instead of processes. The chunks
+            are then passed to func without being copied, but only the parts of func
+            that release the GIL, such as NumPy operations, run in parallel.
+    """
+    if np is None:
+        raise ImportError("sfparallel requires numpy: pip install numpy")
+    if not inputs:
+        raise TypeError("map() requires at least one input.")
+    arrays = [_as_sfarray(values) for values in inputs]
+    count = len(arrays[0])
+    if any(len(array) != count for array in arrays):
+        raise ValueError("The inputs must have the same length.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if chunksize is None:
+        chunksize = max(1, -(-count // (4 * workers)))
+    elif chunksize < 1:
+        raise ValueError("chunksize must be at least 1.")
+    chunks = _chunks(arrays, chunksize)
+    if workers == 1:
+        return _join([_evaluate(func, chunk) for chunk in chunks])
+    if threads:
+        with ThreadPoolExecutor(workers) as executor:
+            return _join(list(executor.map(partial(_evaluate, func), chunks)))
+    results = []
+    pending = collections.deque()
+    with ProcessPoolExecutor(workers) as executor:
+        # at most two chunks per worker are in flight, to bound memory use
+        for chunk in chunks:
+            buffers = [sfstore.dumps(array) for array in chunk]
+            pending.append(executor.submit(_evaluate_buffers, func, buffers))
+            if len(pending) >= 2 * workers:
+                results.append(sfstore.loads(pending.popleft().result()))
+        results.extend(sfstore.loads(future.result()) for future in pending)
+    return _join(results)
@@ -0,0 +1,137 @@
+"""
+The sfparse module reads :class:`SFFloat` values from text, inferring the number of
+significant figures from each numeric literal:
+
+* Leading zeros are not significant: "0.00123" has 3 significant figures.
+* Trailing zeros after a decimal point are significant: "0.001230" has 4.
+* Trailing zeros without a decimal point are not: "1200" has 2, "1200." has 4.
+* Exponent notation scales the digits: "1.20e3" has 3.
+
+The iter_* functions are generators that read a file object (or any iterable of
+lines) one line at a time, so that large files are never loaded whole.
+"""
+
+# pylint: disable=protected-access
+
+import csv
+from .sffloat import SFFloat
+from .sfarray import SFArray, np
+
+
+def _parse_parts(text):
+    """
+    Return the value and lsd of a numeric literal. The sigfigs are left to be
+    computed from the float value, which may have rounded up to a power of ten.
+    """
+    literal = text.strip().lower()
+    mantissa, _, exponent = literal.partition("e")
+    if mantissa[:1] in ("+", "-"):
+        mantissa = mantissa[1:]
+    whole, point, fraction = mantissa.partition(".")
+    digits = whole + fraction
+    if not (digits.isdigit() and digits.isascii()) or (
+        exponent and not exponent.lstrip("+-").isdigit()
+    ):
+        raise ValueError(f"Invalid numeric literal {text!r}.")
+    exponent = int(exponent) if exponent else 0
+    if point:
+        lsd = exponent - len(fraction)
+    else:
+        lsd = exponent + len(whole) - len(whole.rstrip("0") or "0")
+    return float(literal), lsd
+
+
+def parse(text):
+    """
+    Return an SFFloat for the numeric literal text, with significant figures
+    inferred from the literal.
+
+    Ex. parse("0.001230") --> SFFloat(0.00123,4)
+    """
+    return SFFloat._from_parts(*_parse_parts(text))
+
+
+def _split_lines(source, delimiter, skip):
+    """
+    Yield the fields of each line of source, after skipping skip lines.
+    """
+    lines = iter(source)
+    for _ in range(skip):
+        next(lines, None)
+    if delimiter is None:
+        for line in lines:
+            fields = line.split()
+            if fields:
+                yield fields
+    else:
+        for fields in csv.reader(lines, delimiter=delimiter):
+            if fields:
+                yield fields
+
+
+def iter_values(source, skip=0):
+    """
+    Generate an SFFloat for every whitespace separated literal in source, a file
+    object or iterable of lines. The first skip lines are ignored.
+    """
+    for fields in _split_lines(source, None, skip):
+        for field in fields:
+            yield SFFloat._from_parts(*_parse_parts(field))
+
+
+def iter_rows(source, delimiter=",", columns=None, skip=0):
+    """
+    Generate a list of SFFloat for every row of delimited text in source, a file
+    object or iterable of lines. A delimiter of None splits rows on whitespace.
+    Only the column indices in columns are parsed, if given. The first skip lines
+    (e.g. headers) are ignored.
+    """
+    for fields in _split_lines(source, delimiter, skip):
+        if columns is not None:
+            fields = [fields[column] for column in columns]
+        yield [SFFloat._from_parts(*_parse_parts(field)) for field in fields]
+
+
+def iter_batches(source, batch_size=65536, delimiter=",", columns=None, skip=0):
+    """
+    Generate the rows of delimited text in source as batches of at most
+    batch_size rows. Each batch is a list of :class:`SFArray`, one per column.
+    The arguments are those of :func:`iter_rows`. Memory use is bounded by the
+    batch size, whatever the size of the source.
+    """
+    if np is None:
+        raise ImportError("iter_batches requires numpy: pip install numpy")
+    if columns is not None and not columns:
+        raise ValueError("columns must not be empty.")
+    vals = lsds = None
+    for fields in _split_lines(source, delimiter, skip):
+        if columns is not None:
+            fields = [fields[column] for column in columns]
+        if vals is None:
+            vals = [[] for _ in fields]
+            lsds = [[] for _ in fields]
+        elif len(fields) != len(vals):
+            raise ValueError(f"Expected {len(vals)} fields, got {len(fields)}.")
+        for field, val, lsd in zip(fields, vals, lsds):
+            parts = _parse_parts(field)
+            val.append(parts[0])
+            lsd.append(parts[1])
+        if len(vals[0]) == batch_size:
+            yield _batch(vals, lsds)
+    if vals and vals[0]:
+        yield _batch(vals, lsds)
+
+
+def _batch(vals, lsds):
+    """
+    Return a list of SFArray built from, and then empty, the batch buffers.
+    """
+    batch = [
+        SFArray._from_arrays(
+            np.array(val, dtype=np.float64), np.array(lsd, dtype=SFArray.LSD_DTYPE)
+        )
+        for val, lsd in zip(vals, lsds)
+    ]
+    for buffer in vals + lsds:
+        buffer.clear()
+    return batch
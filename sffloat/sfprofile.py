@@ -0,0 +1,305 @@
+"""
+The sfprofile module counts and times the calls to the hot paths of
+:class:`SFFloat`: construction, the arithmetic and comparison operators, the
+:meth:`SFFloat.funcwrapper` and :meth:`SFFloat.funcwrapper2` math function wrappers
+and formatting. Collection is scoped with a context manager:
+
+    from sffloat import sfprofile
+    with sfprofile.collect() as profile:
+        ...
+    print(profile.report())
+
+or turned on and off for the whole process with :func:`enable` and :func:`disable`.
+While collecting, the methods of SFFloat (and of its subclasses that override
+them) are replaced by counting versions; otherwise the original methods are in
+place, so disabled collection costs nothing. Each method is counted under the
+class that defines it, and a call is counted once in its category: an override
+that calls the method of its base class, or a construction that builds through
+:meth:`SFFloat._from_parts`, is one call. Construction counts the instances made
+by their constructor (``__new__`` for the subclasses that define it) and the
+results built with ``_from_parts``; results that the C core builds inside an
+operator count as ``SFFloat._from_parts`` calls without a time of their own.
+Times are inclusive, e.g. the time of an operator includes the construction of
+its result. Counts may be approximate when several threads use SFFloat at once.
+"""
+
+import contextlib
+import functools
+import inspect
+import threading
+import time
+from .sffloat import SFFloat
+
+# the instrumented methods, by category
+METHODS = {
+    "construction": ("__init__", "__new__", "_from_parts"),
+    "arithmetic": (
+        "__add__",
+        "__radd__",
+        "__sub__",
+        "__rsub__",
+        "__mul__",
+        "__rmul__",
+        "__truediv__",
+        "__rtruediv__",
+        "__pow__",
+        "__rpow__",
+        "__neg__",
+        "__pos__",
+        "__abs__",
+    ),
+    "comparison": (
+        "__eq__",
+        "__ne__",
+        "__lt__",
+        "__gt__",
+        "__le__",
+        "__ge__",
+        "__hash__",
+    ),
+    "math": ("funcwrapper", "funcwrapper2"),
+    "format": ("__str__", "__format__", "__repr__"),
+}
+
+_LOCK = threading.Lock()
+# the replaced methods, and the Profile being collected
+_installed = []  # (class, name, original class attribute or None, replacement)
+_active = None  # pylint: disable=invalid-name
+
+
+class Profile:
+    """
+    The sfprofile :class:`Profile` class holds the call counts and times collected
+    for each instrumented method, keyed by names such as "SFFloat.__add__"."""
+
+    def __init__(self):
+        self.counters = {}  # name: [calls, nanoseconds]
+        self.categories = {}  # name: category
+
+    def _counter(self, name, category):
+        """
+        Return the [calls, nanoseconds] counter of a method.
+        """
+        self.categories[name] = category
+        return self.counters.setdefault(name, [0, 0])
+
+    def reset(self):
+        """
+        Set all counts and times to zero.
+        """
+        for counter in self.counters.values():
+            counter[0] = counter[1] = 0
+
+    def summary(self):
+        """
+        Return the methods that were called, slowest total time first, as a dict
+        {name: {"category", "calls", "seconds", "mean_us"}} that may be exported as
+        JSON.
+        """
+        called = [(name, c) for name, c in self.counters.items() if c[0]]
+        called.sort(key=lambda item: -item[1][1])
+        return {
+            name: {
+                "category": self.categories[name],
+                "calls": calls,
+                "seconds": nanoseconds / 1e9,
+                "mean_us": nanoseconds / calls / 1e3,
+            }
+            for name, (calls, nanoseconds) in called
+        }
+
+    def totals(self):
+        """
+        Return the calls and seconds of each category, as a dict
+        {category: {"calls", "seconds"}}.
+        """
+        totals = {category: {"calls": 0, "seconds": 0.0} for category in METHODS}
+        for entry in self.summary().values():
+            totals[entry["category"]]["calls"] += entry["calls"]
+            totals[entry["category"]]["seconds"] += entry["seconds"]
+        return totals
+
+    def report(self):
+        """
+        Return the summary as a table of text.
+        """
+        lines = [
+            f"{'method':32s} {'category':12s} {'calls':>10s} {'total ms':>10s} "
+            f"{'mean us':>9s}"
+        ]
+        for name, entry in self.summary().items():
+            lines.append(
+                f"{name:32s} {entry['category']:12s} {entry['calls']:10d} "
+                f"{entry['seconds'] * 1e3:10.3f} {entry['mean_us']:9.3f}"
+            )
+        return "\n".join(lines)
+
+
+_state = threading.local()  # pylint: disable=invalid-name
+
+
+def _calls():
+    """
+    Return the categories being counted in this thread, and its number of counted
+    constructions, as [set of categories, constructions].
+    """
+    calls = getattr(_state, "calls", None)
+    if calls is None:
+        calls = _state.calls = [set(), 0]
+    return calls
+
+
+def _counting(func, counter, category, built=None):
+    """
+    Return a version of func that adds its calls and time to counter, unless it is
+    called within another counted call of its category. If given, built is the
+    counter of the results that func makes without a counted construction.
+    """
+    clock = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        calls = _calls()
+        active = calls[0]
+        if category in active:
+            return func(*args, **kwargs)
+        active.add(category)
+        constructions = calls[1]
+        start = clock()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            counter[1] += clock() - start
+            counter[0] += 1
+            active.discard(category)
+        if category == "construction":
+            calls[1] += 1
+        elif (
+            built is not None
+            and calls[1] == constructions
+            and isinstance(result, SFFloat)
+            and not any(result is arg for arg in args)
+        ):
+            built[0] += 1  # built by the C core
+            calls[1] += 1
+        return result
+
+    return wrapper
+
+
+def _classes():
+    """
+    Return SFFloat and all its subclasses.
+    """
+    classes, index = [SFFloat], 0
+    while index < len(classes):
+        classes.extend(classes[index].__subclasses__())
+        index += 1
+    return classes
+
+
+def _install(profile):
+    """
+    Replace the instrumented methods with versions that count into profile.
+    """
+    # pylint: disable=protected-access
+    built = profile._counter("SFFloat._from_parts", "construction")
+    for cls in _classes():
+        for category, names in METHODS.items():
+            for name in names:
+                original = cls.__dict__.get(name)
+                if name == "__new__" and original is None:
+                    continue  # constructed through __init__
+                if name == "__init__" and "__new__" in cls.__dict__:
+                    continue  # constructed through __new__
+                if original is None and cls is not SFFloat:
+                    continue  # inherited from SFFloat, which is instrumented
+                counter = profile._counter(f"{cls.__name__}.{name}", category)
+                results = built if category in ("arithmetic", "math") else None
+                method = inspect.getattr_static(cls, name)
+                if isinstance(method, staticmethod):
+                    replacement = staticmethod(
+                        _counting(method.__func__, counter, category)
+                    )
+                elif name == "_from_parts":
+                    replacement = classmethod(
+                        _counting(_bound(method), counter, category)
+                    )
+                else:
+                    replacement = _counting(
+                        getattr(cls, name), counter, category, results
+                    )
+                setattr(cls, name, replacement)
+                _installed.append((cls, name, original, replacement))
+
+
+def _bound(method):
+    """
+    Return a function that calls the classmethod method of its first argument,
+    which may be a classmethod object or the descriptor of a C type.
+    """
+
+    def bound(cls, *args, **kwargs):
+        return method.__get__(None, cls)(*args, **kwargs)
+
+    return bound
+
+
+def _uninstall():
+    """
+    Put the original methods back. A method that was replaced again since it was
+    instrumented (e.g. by :mod:`sffloat.sfcache`) is left alone.
+    """
+    while _installed:
+        cls, name, original, replacement = _installed.pop()
+        if cls.__dict__.get(name) is not replacement:
+            continue
+        if original is None:
+            delattr(cls, name)
+        else:
+            setattr(cls, name, original)
+
+
+def enable(profile=None):
+    """
+    Start collecting into profile, or a new :class:`Profile`, and return it.
+    """
+    global _active  # pylint: disable=global-statement
+    with _LOCK:
+        if _active is not None:
+            raise RuntimeError("sfprofile is already collecting.")
+        _active = profile if profile is not None else Profile()
+        _install(_active)
+        return _active
+
+
+def disable():
+    """
+    Stop collecting and return the profile that was collected, or None.
+    """
+    global _active  # pylint: disable=global-statement
+    with _LOCK:
+        profile, _active = _active, None
+        _uninstall()
+        return profile
+
+
+def enabled():
+    """
+    Return True if collection is turned on.
+    """
+    return _active is not None
+
+
+@contextlib.contextmanager
+def collect(profile=None):
+    """
+    Return a context manager that collects into profile, or a new
+    :class:`Profile`, while it is active, and gives the profile to its with
+    statement.
+    """
+    profile = enable(profile)
+    try:
+        yield profile
+    finally:
+        disable()
@@ -0,0 +1,195 @@
+"""
+The sfreduce module defines sig-fig aware reductions of many values: :func:`sfsum`,
+:func:`sfprod`, :func:`sfmean` and :func:`sfstdev`. Each one reads its values in a
+single pass, with constant extra memory, so it may be given a list, a generator,
+an :class:`SFArray` or an iterable of :class:`SFArray` batches (e.g. a column of
+:func:`sffloat.sfparse.iter_batches`). Elements may be :class:`SFFloat` or float.
+Subclasses that carry more than a precision, such as quantities with units, are
+rejected with TypeError: combine them with their own arithmetic instead.
+
+The results follow the rules of :class:`SFFloat` arithmetic, without computing the
+intermediate values: a sum has the largest lsd of its terms (as if added one by one)
+and a product has the fewest sigfigs of its factors. Sums are computed with
+:func:`math.fsum`, so they are correctly rounded. As with the other sf functions,
+the result is a float when none of the values is an :class:`SFFloat`.
+"""
+
+# pylint: disable=protected-access
+
+import math
+import sys
+from .sffloat import SFFloat
+
+# SFFloat and SFArray subclasses that the reductions can not combine without
+# losing information (e.g. :class:`sffloat.sfunits.SFQuantity`, whose values have
+# units) register themselves here, and the reductions raise TypeError for them.
+_UNSUPPORTED = set()
+
+# number of values of an SFArray converted to floats at a time
+_CHUNK = 4096
+
+
+class _Precision:
+    """
+    Record the precision of the values of a reduction while they are read: the
+    largest lsd, and the fewest sigfigs if track_sigfigs is set.
+    """
+
+    __slots__ = ("name", "lsd", "sigfigs", "typed", "count", "track_sigfigs")
+
+    def __init__(self, name, track_sigfigs=False):
+        self.name = name
+        self.lsd = None
+        self.sigfigs = SFFloat.inf
+        self.typed = False  # True once an SFFloat or SFArray has been read
+        self.count = 0
+        self.track_sigfigs = track_sigfigs
+
+    def floats(self, values):
+        """
+        Generate the float values of values, recording their precision.
+        """
+        if not isinstance(values, (list, tuple)) and _is_sfarray(values):
+            values = (values,)
+        # the precision is kept in local variables while the values are read
+        lsd, sigfigs, count = self.lsd, self.sigfigs, 0
+        track_sigfigs = self.track_sigfigs
+        for item in values:
+            if isinstance(item, SFFloat):
+                if type(item) is not SFFloat:  # pylint: disable=unidiomatic-typecheck
+                    self._check(item)
+                self.typed = True
+                count += 1
+                item_lsd = item._lsd
+                if item_lsd is not None and (lsd is None or item_lsd > lsd):
+                    lsd = item_lsd
+                if track_sigfigs and item.sigfigs < sigfigs:
+                    sigfigs = item.sigfigs
+                yield item._val
+            elif isinstance(item, (float, int)):
+                count += 1
+                yield item
+            elif _is_sfarray(item):
+                self.lsd, self.sigfigs = lsd, sigfigs
+                self._add_array(item)
+                lsd, sigfigs = self.lsd, self.sigfigs
+                vals = item._val
+                for start in range(0, len(vals), _CHUNK):
+                    yield from vals[start : start + _CHUNK].tolist()
+            else:
+                count += 1
+                yield float(SFFloat(item))
+        self.lsd, self.sigfigs = lsd, sigfigs
+        self.count += count
+
+    def _check(self, value):
+        """
+        Raise TypeError if value is of a type that the reduction does not support.
+        """
+        for kind in type(value).__mro__:
+            if kind in _UNSUPPORTED:
+                raise TypeError(
+                    f"{self.name} does not support {type(value).__name__} values; "
+                    "combine them with their own arithmetic."
+                )
+
+    def _add_array(self, array):
+        """
+        Record the precision of the values of an SFArray.
+        """
+        self._check(array)
+        self.typed = True
+        self.count += len(array)
+        if len(array) == 0:
+            return
+        lsd = int(array._lsd.max())
+        if lsd != array.LSD_INF and (self.lsd is None or lsd > self.lsd):
+            self.lsd = lsd
+        if self.track_sigfigs:
+            sigfigs = array._sigfigs_of(array._val, array._lsd).min()
+            if sigfigs < self.sigfigs:
+                self.sigfigs = int(sigfigs)
+
+    def result(self, val, lsd):
+        """
+        Return the result of the reduction, with the lsd position lsd.
+        """
+        if not self.typed:
+            return val
+        return SFFloat._from_parts(val, lsd)
+
+
+def _is_sfarray(value):
+    """
+    Return True if value is an SFArray. NumPy is not imported: if the sfarray module
+    has not been imported, value can not be an SFArray.
+    """
+    module = sys.modules.get(f"{__package__}.sfarray")
+    return module is not None and isinstance(value, module.SFArray)
+
+
+def sfsum(values):
+    """
+    Implements a sig-fig aware replacement for the standard sum function. The result
+    has the largest lsd of the values, as if they were added one by one, and its
+    value is computed with math.fsum.
+    """
+    precision = _Precision("sfsum")
+    total = math.fsum(precision.floats(values))
+    return precision.result(total, precision.lsd)
+
+
+def sffsum(values):
+    """
+    Implements a sig-fig aware replacement for the standard math.fsum function.
+    This is the same as :func:`sfsum`.
+    """
+    return sfsum(values)
+
+
+def sfprod(values):
+    """
+    Implements a sig-fig aware replacement for the standard math.prod function. The
+    result has the fewest sigfigs of the values, as if they were multiplied one by
+    one.
+    """
+    precision = _Precision("sfprod", track_sigfigs=True)
+    total = math.prod(precision.floats(values), start=1.0)
+    sigfigs = precision.sigfigs
+    if sigfigs <= 0:
+        raise ValueError(
+            f"Precision of {float.__mul__} with zero sigfig operand is undefined."
+        )
+    if sigfigs == SFFloat.inf:
+        return precision.result(total, None)
+    return precision.result(total, SFFloat._msd_from_val(total) - (sigfigs - 1))
+
+
+def sfmean(values):
+    """
+    Implements a sig-fig aware replacement for the standard statistics.mean
+    function. The result has the largest lsd of the values.
+    """
+    precision = _Precision("sfmean")
+    total = math.fsum(precision.floats(values))
+    if not precision.count:
+        raise ValueError("sfmean requires at least one value.")
+    return precision.result(total / precision.count, precision.lsd)
+
+
+def sfstdev(values):
+    """
+    Implements a sig-fig aware replacement for the standard statistics.stdev
+    function, the sample standard deviation. The result has the largest lsd of the
+    values. It is computed in one pass with Welford's algorithm.
+    """
+    precision = _Precision("sfstdev")
+    count, mean, squares = 0, 0.0, 0.0
+    for val in precision.floats(values):
+        count += 1
+        delta = val - mean
+        mean += delta / count
+        squares += delta * (val - mean)
+    if count < 2:
+        raise ValueError("sfstdev requires at least two values.")
+    return precision.result(math.sqrt(squares / (count - 1)), precision.lsd)
@@ -0,0 +1,156 @@
+"""
+The sfstore module saves collections of :class:`SFFloat` values in a compact binary
+format and loads them back as :class:`SFArray` views, without copying.
+
+The format is a 32 byte header followed by two little-endian columns:
+
+* header: the magic bytes b"SFFLOAT", a format version byte, the byte size of the
+  lsd column entries (1 or 2), seven reserved bytes and the value count as an
+  unsigned 64 bit integer, then eight reserved bytes.
+* values: count float64 values.
+* lsd: count int8 or int16 lsd positions. The smallest integer of the type marks a
+  value with unlimited significant figures.
+"""
+
+# pylint: disable=protected-access
+
+import struct
+from .sfarray import SFArray, np
+
+MAGIC = b"SFFLOAT"
+VERSION = 1
+_HEADER = struct.Struct("<7sBB7xQ8x")
+_LSD_DTYPES = {1: "<i1", 2: "<i2"}
+
+# Subclasses of SFFloat and SFArray that hold more than a value and an lsd (e.g.
+# :class:`sffloat.sfunits.SFQuantity`, whose values have units) register
+# themselves here, and are rejected with TypeError instead of losing that state.
+_UNSUPPORTED = set()
+
+
+def _as_sfarray(values, name):
+    """
+    Return values, an SFArray or iterable of SFFloat and float, as an SFArray.
+    Raise TypeError, naming the function name, for values of a type that an
+    SFArray would keep only the value and lsd of.
+    """
+    if isinstance(values, SFArray):
+        kinds = {type(values)}
+    else:
+        values = list(values)
+        kinds = set(map(type, values))
+    for kind in kinds:
+        for base in kind.__mro__:
+            if base in _UNSUPPORTED:
+                raise TypeError(
+                    f"{name} does not support {kind.__name__} values, as it only "
+                    "keeps their value and lsd."
+                )
+    return values if isinstance(values, SFArray) else SFArray(values)
+
+
+def _columns(values, lsd_dtype):
+    """
+    Return the header, value and lsd columns for values.
+    """
+    if np is None:
+        raise ImportError("sfstore requires numpy: pip install numpy")
+    values = _as_sfarray(values, "sfstore")
+    lsd_dtype = np.dtype(lsd_dtype).newbyteorder("<")
+    if lsd_dtype.itemsize not in _LSD_DTYPES or lsd_dtype.kind != "i":
+        raise ValueError("lsd_dtype must be int8 or int16.")
+    lsds = values.lsd
+    unlimited = lsds == SFArray.LSD_INF
+    info = np.iinfo(lsd_dtype)
+    finite = lsds[~unlimited]
+    if finite.size and (finite.min() <= info.min or finite.max() > info.max):
+        raise OverflowError(f"lsd value out of range for {lsd_dtype.name}.")
+    lsds = lsds.astype(lsd_dtype)
+    lsds[unlimited] = info.min
+    header = _HEADER.pack(MAGIC, VERSION, lsd_dtype.itemsize, len(values))
+    return header, values.value.astype("<f8", copy=False), lsds
+
+
+def dumps(values, lsd_dtype="int16"):
+    """
+    Return values, an SFArray or iterable of SFFloat and float, in the sfstore
+    binary format. Use an lsd_dtype of "int8" for a smaller lsd column.
+    """
+    header, vals, lsds = _columns(values, lsd_dtype)
+    return header + vals.tobytes() + lsds.tobytes()
+
+
+def save(file, values, lsd_dtype="int16"):
+    """
+    Write values, an SFArray or iterable of SFFloat and float, to file (a path or
+    binary file object) in the sfstore binary format.
+    """
+    header, vals, lsds = _columns(values, lsd_dtype)
+    if hasattr(file, "write"):
+        file.write(header)
+        file.write(vals.tobytes())
+        file.write(lsds.tobytes())
+    else:
+        with open(file, "wb") as stream:
+            stream.write(header)
+            vals.tofile(stream)
+            lsds.tofile(stream)
+
+
+def _read_header(header):
+    """
+    Return the lsd dtype and value count from a header.
+    """
+    if len(header) < _HEADER.size:
+        raise ValueError("Not an sfstore file: header is truncated.")
+    magic, version, lsd_size, count = _HEADER.unpack(header[: _HEADER.size])
+    if magic != MAGIC:
+        raise ValueError("Not an sfstore file.")
+    if version != VERSION or lsd_size not in _LSD_DTYPES:
+        raise ValueError(f"Unsupported sfstore format version {version}.")
+    return np.dtype(_LSD_DTYPES[lsd_size]), count
+
+
+def _view(vals, lsds):
+    """
+    Return an SFArray from stored columns. An int16 lsd column is used as is,
+    while an int8 column is widened, with its unlimited precision marker.
+    """
+    if lsds.dtype.itemsize != np.dtype(SFArray.LSD_DTYPE).itemsize:
+        unlimited = lsds == np.iinfo(lsds.dtype).min
+        lsds = lsds.astype(SFArray.LSD_DTYPE)
+        lsds[unlimited] = SFArray.LSD_INF
+    return SFArray._from_arrays(vals, lsds)
+
+
+def loads(buffer):
+    """
+    Return an SFArray view of the sfstore data in buffer (bytes, bytearray,
+    memoryview or other buffer). The values are not copied.
+    """
+    if np is None:
+        raise ImportError("sfstore requires numpy: pip install numpy")
+    lsd_dtype, count = _read_header(bytes(memoryview(buffer)[: _HEADER.size]))
+    vals = np.frombuffer(buffer, "<f8", count, _HEADER.size)
+    lsds = np.frombuffer(buffer, lsd_dtype, count, _HEADER.size + 8 * count)
+    return _view(vals, lsds)
+
+
+def load(path, mmap=True):
+    """
+    Return an SFArray with the contents of the sfstore file at path. By default
+    the file is memory mapped, so values are only read from disk when used and
+    individual SFFloat values are created only when indexed.
+    """
+    if np is None:
+        raise ImportError("sfstore requires numpy: pip install numpy")
+    if not mmap:
+        with open(path, "rb") as stream:
+            return loads(stream.read())
+    with open(path, "rb") as stream:
+        lsd_dtype, count = _read_header(stream.read(_HEADER.size))
+    if not count:
+        return _view(np.empty(0, "<f8"), np.empty(0, lsd_dtype))
+    vals = np.memmap(path, "<f8", "r", _HEADER.size, (count,))
+    lsds = np.memmap(path, lsd_dtype, "r", _HEADER.size + 8 * count, (count,))
+    return _view(vals, lsds)
@@ -0,0 +1,215 @@
+"""
+The sfstream module defines asyncio stages for processing live feeds of numeric
+literals, such as instrument readings read from a socket, without blocking the
+event loop.
+
+Each stage is an async generator that reads the output of the one before it:
+
+* :func:`parse` collects the literals of a feed into micro-batches and parses each
+  batch into an :class:`SFArray`.
+* :func:`transform` applies a batch function, such as an :mod:`sffloat.sfmath`
+  function or a kernel made by :func:`sffloat.compile`, to each batch.
+* :func:`reduce` reduces each batch to one value, e.g. with :func:`sffloat.sfmean`.
+* :func:`format` formats each batch as lines of text.
+
+Parsing, batch functions and formatting run in an executor, so the event loop only
+moves batches between stages. The stages apply backpressure: :func:`parse` stops
+reading its feed while two batches are waiting, and the other stages only request
+input as their output is consumed. :func:`memory_feed` is an in-memory stand-in for
+a feed, for tests and benchmarks::
+
+    async for text in sfstream.format(sfstream.transform(sfstream.parse(feed), sfmath.sin)):
+        writer.write(text.encode())
+"""
+
+# pylint: disable=protected-access
+
+import asyncio
+import collections
+from .sfarray import SFArray, np, _require_numpy
+from .sfparse import _parse_parts
+from .sfreduce import sfmean
+from .sftable import format_many
+
+
+class _Batcher:
+    """
+    Collects the literals read from a feed into batches of at most size literals,
+    holding at most two batches.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.texts = []
+        self.done = False
+        self.ready = asyncio.Event()
+        self.space = asyncio.Event()
+        self.space.set()
+
+    async def fill(self, feed):
+        """
+        Read the literals of the lines of feed, waiting while two batches are held.
+        """
+        try:
+            async for line in feed:
+                if isinstance(line, bytes):
+                    line = line.decode()
+                self.texts.extend(line.split())
+                if len(self.texts) >= self.size:
+                    self.ready.set()
+                    while len(self.texts) >= 2 * self.size:
+                        self.space.clear()
+                        await self.space.wait()
+        finally:
+            self.done = True
+            self.ready.set()
+
+    async def take(self, latency):
+        """
+        Return the next batch, waiting at most about latency seconds for a partial
+        batch to fill, or None at the end of the feed.
+        """
+        while len(self.texts) < self.size and not self.done:
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), latency)
+            except asyncio.TimeoutError:
+                if self.texts:
+                    break
+        if not self.texts:
+            return None
+        batch, self.texts = self.texts[: self.size], self.texts[self.size :]
+        self.space.set()
+        return batch
+
+
+def _parse_batch(texts):
+    """
+    Return the numeric literals texts as an SFArray.
+    """
+    vals = np.empty(len(texts), dtype=np.float64)
+    lsds = np.empty(len(texts), dtype=SFArray.LSD_DTYPE)
+    for index, text in enumerate(texts):
+        vals[index], lsds[index] = _parse_parts(text)
+    return SFArray._from_arrays(vals, lsds)
+
+
+def _format_batch(batch):
+    """
+    Return the values of batch, an SFArray or single value, one per line.
+    """
+    if isinstance(batch, SFArray):
+        return "".join(f"{text}\n" for text in format_many(batch))
+    return f"{batch}\n"
+
+
+async def _in_executor(func, batches, executor, pending):
+    """
+    Generate func of each of batches, computed in executor with at most pending
+    batches in flight, in order.
+    """
+    loop = asyncio.get_running_loop()
+    futures = collections.deque()
+    try:
+        async for batch in batches:
+            futures.append(loop.run_in_executor(executor, func, batch))
+            if len(futures) >= pending:
+                yield await futures.popleft()
+        while futures:
+            yield await futures.popleft()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+async def parse(feed, batch_size=4096, latency=0.01, executor=None):
+    """
+    Generate an :class:`SFArray` for each micro-batch of the whitespace separated
+    numeric literals in feed, an async iterable of str or bytes lines such as an
+    asyncio StreamReader. Significant figures are inferred from each literal, as
+    :func:`sffloat.sfparse.parse` does.
+
+    :Optional Arguments:
+        * **batch_size** [int] The largest number of literals in a batch.
+        * **latency** [float] The time in seconds after which a partial batch is
+            parsed if the feed is slow.
+        * **executor** [Executor] The executor that parses the batches, by default
+            that of the event loop.
+    """
+    _require_numpy()
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+    batcher = _Batcher(batch_size)
+    reader = asyncio.ensure_future(batcher.fill(feed))
+
+    async def texts():
+        while True:
+            batch = await batcher.take(latency)
+            if batch is None:
+                break
+            yield batch
+        await reader  # raise any error of the feed
+
+    try:
+        async for batch in _in_executor(_parse_batch, texts(), executor, 1):
+            yield batch
+    finally:
+        reader.cancel()
+
+
+async def transform(batches, func, executor=None, pending=2):
+    """
+    Generate func(batch) for each batch of batches, an async iterable of
+    :class:`SFArray` such as the output of :func:`parse`. func is a batch function
+    such as :func:`sffloat.sfmath.sin`, a kernel made by :func:`sffloat.compile` or
+    a function of SFArray arithmetic, and is called in executor, by default that of
+    the event loop. Up to pending batches are computed at a time; the results are
+    generated in order.
+    """
+    if pending < 1:
+        raise ValueError("pending must be at least 1.")
+    async for result in _in_executor(func, batches, executor, pending):
+        yield result
+
+
+async def reduce(batches, func=sfmean, executor=None):
+    """
+    Generate func(batch) for each batch of batches, e.g. the mean of each batch,
+    computed in executor, by default that of the event loop. func is a reduction
+    such as :func:`sffloat.sfsum`, :func:`sffloat.sfmean` or
+    :func:`sffloat.sfstdev`.
+    """
+    async for result in _in_executor(func, batches, executor, 1):
+        yield result
+
+
+async def format(batches, executor=None):  # pylint: disable=redefined-builtin
+    """
+    Generate the text of each batch of batches, with one value per line, as str
+    would format it. Batches are :class:`SFArray`, as generated by :func:`parse`
+    and :func:`transform`, or single values, as generated by :func:`reduce`. The
+    text is formatted in executor, by default that of the event loop.
+    """
+    async for text in _in_executor(_format_batch, batches, executor, 1):
+        yield text
+
+
+async def memory_feed(lines, rate=None, burst=256):
+    """
+    Generate lines, an iterable of str, as an in-memory stand-in for a live feed.
+    If rate is given, lines are generated at rate lines per second; otherwise they
+    are generated as fast as possible, yielding to the event loop every burst
+    lines.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for index, line in enumerate(lines):
+        if rate is not None:
+            delay = start + index / rate - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif index % burst == 0:
+                await asyncio.sleep(0)
+        elif index % burst == 0:
+            await asyncio.sleep(0)
+        yield line
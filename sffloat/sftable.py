@@ -0,0 +1,194 @@
+"""
+The sftable module formats many values at once, for reports and tables:
+:func:`format_many` formats a column of values and :func:`write_columns` writes
+columns as CSV, TSV or other delimited text.
+
+The text of every value is identical to its str(). Values with significant figures
+are grouped by the position of their least significant digit, and each group is
+formatted by a single printf style operation, which rounds correctly from the
+binary value. This agrees with the half-up rounding of the shortest decimal
+representation that str() uses except when a value lies on a rounding tie, or
+rounds up to a new leading digit; those rare values, and values that can not be
+grouped (zero, infinite or NaN values, or values with more than 15 significant
+figures), are formatted one at a time with str().
+"""
+
+# pylint: disable=protected-access
+# exact type checks: subclasses of SFFloat and SFArray have their own str()
+# pylint: disable=unidiomatic-typecheck
+
+import csv
+import re
+from .sffloat import SFFloat
+from .sfarray import SFArray, np, _msd
+from .sfformat import format_sigfigs
+
+ALIGNMENTS = (None, "left", "right", "decimal")
+
+_EXPONENT = re.compile(r"E\+?(-?)0*(?=\d)")
+_SEPARATOR = "\x1f"
+
+
+def _format_value(value, notation):
+    """
+    Return the text of one value: its str(), or for an SFFloat with limited sigfigs
+    and a notation, the value in that notation.
+    """
+    if notation is None or type(value) is not SFFloat or value._lsd is None:
+        return str(value)
+    sigfigs = value.sigfigs
+    return "0" if sigfigs <= 0 else format_sigfigs(value._val, sigfigs, notation)
+
+
+def _format_group(template, vals):
+    """
+    Return the list of texts of the floats vals, formatted with the printf style
+    template, with one operation. Exponents are written as str() writes them.
+    """
+    text = (template + _SEPARATOR) * len(vals) % tuple(vals)
+    if "E" in template:
+        text = _EXPONENT.sub(r"E\1", text)
+    return text.split(_SEPARATOR)[:-1]
+
+
+def _grouped(texts, indices, keys, vals, template):
+    """
+    Set texts[i] for the indices i, formatting the values with the same key
+    together with template % key.
+    """
+    for key in np.unique(keys).tolist():
+        group = keys == key
+        texts[indices[group]] = _format_group(template % key, vals[group].tolist())
+
+
+def _unsafe(vals, lsds, msd):
+    """
+    Return a mask of the values that can not be formatted in groups: those on or
+    near a rounding tie, near a power of ten, or that round up to one, and zero,
+    infinite and NaN values and values with more than 15 significant figures.
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        magnitude = np.abs(vals)
+        scaled = magnitude * 10.0 ** -lsds.astype(np.float64)
+        unsafe = ~np.isfinite(scaled) | (scaled >= 1e15) | (vals == 0.0)
+        unsafe |= np.abs(scaled - np.floor(scaled) - 0.5) <= scaled * 1e-12 + 1e-9
+        power = np.log10(magnitude)
+        unsafe |= np.abs(power - np.round(power)) <= 1e-12
+        carry = 10.0 ** (msd + 1) - 0.5 * 10.0 ** lsds.astype(np.float64)
+        unsafe |= magnitude >= carry * (1 - 1e-12)
+    return unsafe
+
+
+def _format_arrays(vals, lsds, notation, texts):
+    """
+    Set texts, an object array, to the text of each value with value vals and lsd
+    lsds, as str() of the SFFloat. Returns the indices of the values that must be
+    formatted one at a time.
+    """
+    unlimited = lsds == SFArray.LSD_INF
+    index = np.flatnonzero(unlimited)
+    if index.size:
+        texts[index] = _format_group("%r", vals[index].tolist())
+    msd = _msd(vals)
+    slow = _unsafe(vals, lsds, msd)
+    limited = ~unlimited
+    zero = limited & (msd - lsds + 1 <= 0) & ~slow
+    texts[zero] = "0"
+    fast = limited & ~slow & ~zero
+    if notation is None:
+        std = (np.abs(vals) > 0.001) & (np.abs(vals) < 1000)
+    else:
+        std = np.full(len(vals), notation == "std")
+    index = np.flatnonzero(fast & std & (lsds <= 0))
+    _grouped(texts, index, -lsds[index], vals[index], "%%.%df")
+    index = np.flatnonzero(fast & ~std)
+    _grouped(texts, index, (msd - lsds)[index].astype(np.int64), vals[index], "%%.%dE")
+    return np.flatnonzero(limited & (slow | (std & (lsds > 0))) & ~zero)
+
+
+def _aligned(texts, align):
+    """
+    Return texts padded to a common width as given by align.
+    """
+    if align is None or not texts:
+        return texts
+    width = max(map(len, texts))
+    if align == "left":
+        return [text.ljust(width) for text in texts]
+    if align == "right":
+        return [text.rjust(width) for text in texts]
+    wholes = [len(re.split("[.E]", text, maxsplit=1)[0]) for text in texts]
+    whole = max(wholes)
+    texts = [" " * (whole - size) + text for text, size in zip(texts, wholes)]
+    width = max(map(len, texts))
+    return [text.ljust(width) for text in texts]
+
+
+def format_many(values, notation=None, align=None):
+    """
+    Return a list of the text of each of values, an iterable such as a list of
+    :class:`SFFloat` or an :class:`SFArray`. Each text is identical to the str() of
+    the value, and the values are formatted in batches.
+
+    :Optional Arguments:
+        * **notation** [str] "std" or "sci" to format every :class:`SFFloat` with
+            limited significant figures in standard or scientific notation, instead
+            of choosing by its size. Other values are formatted with str().
+        * **align** [str] Pad the texts to a common width: "left", "right" or
+            "decimal", which lines up the decimal points.
+    """
+    if notation not in (None, "std", "sci"):
+        raise ValueError(f"Invalid notation {notation!r}.")
+    if align not in ALIGNMENTS:
+        raise ValueError(f"Invalid align {align!r}.")
+    if np is None:
+        return _aligned([_format_value(value, notation) for value in values], align)
+    items, others = None, []
+    if type(values) is SFArray:
+        vals, lsds = values._val, values._lsd.astype(np.int64)
+    else:
+        items = list(values)
+        vals, lsds = [], []
+        for value in items:
+            kind = type(value)
+            if kind is SFFloat:
+                vals.append(value._val)
+                lsds.append(SFArray.LSD_INF if value._lsd is None else value._lsd)
+            elif kind is float:
+                vals.append(value)
+                lsds.append(SFArray.LSD_INF)
+            else:
+                vals.append(0.0)
+                lsds.append(SFArray.LSD_INF)
+                others.append(len(vals) - 1)
+        vals = np.array(vals, dtype=np.float64)
+        lsds = np.array(lsds, dtype=np.int64)
+    texts = np.empty(len(vals), dtype=object)
+    slow = _format_arrays(vals, lsds, notation, texts)
+    for index in slow.tolist():
+        item = values._item(index) if items is None else items[index]
+        texts[index] = _format_value(item, notation)
+    for index in others:
+        texts[index] = _format_value(items[index], notation)
+    return _aligned(texts.tolist(), align)
+
+
+def write_columns(file, columns, header=None, delimiter=",", notation=None):
+    """
+    Write columns, a list of iterables of values such as lists of :class:`SFFloat`
+    or :class:`SFArray`, to file as delimited text with one row per line. Each
+    column is formatted with :func:`format_many`. A delimiter of "\\t" writes TSV.
+
+    :Optional Arguments:
+        * **header** [list of str] The names of the columns, written as the first
+            row.
+        * **delimiter** [str] The field delimiter.
+        * **notation** [str] As for :func:`format_many`.
+    """
+    texts = [format_many(column, notation) for column in columns]
+    if len({len(column) for column in texts}) > 1:
+        raise ValueError("The columns must have the same length.")
+    writer = csv.writer(file, delimiter=delimiter, lineterminator="\n")
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows(zip(*texts))
@@ -0,0 +1,228 @@
+"""
+The sftrace module defines :class:`SFTraced`, an opt-in variant of :class:`SFFloat`
+whose arithmetic records which operand limited the precision of each result: the
+operand with the largest lsd for addition and subtraction, or the operand with the
+fewest sigfigs for multiplication, division and powers. :meth:`SFTraced.explain`
+prints the chain of operations back to the input that limited the result.
+
+The lineage of a value is a chain of :class:`Lineage` nodes from the value to the
+input that limited it. Multiplication, division and powers pass on the lineage of
+their limiting operand unchanged, since the result has the same sigfigs. Addition
+and subtraction add a node only when the result has a different number of sigfigs
+than its limiting operand, e.g. after cancellation. Nodes are interned, so equal
+nodes are shared by all the values that use them, and freed when no value refers to
+them.
+"""
+
+# pylint: disable=protected-access
+
+import weakref
+from .sffloat import SFFloat
+
+_NODES = weakref.WeakValueDictionary()
+
+
+class Lineage:
+    """
+    The sftrace :class:`Lineage` class is a node of the lineage of a traced value:
+    the input named label, when parent is None, or the result of operation label on
+    the value of parent, with the given sigfigs and lsd."""
+
+    __slots__ = ("label", "sigfigs", "lsd", "parent", "__weakref__")
+
+    def __init__(self, label, sigfigs, lsd, parent):
+        self.label = label
+        self.sigfigs = sigfigs
+        self.lsd = lsd
+        self.parent = parent
+
+    def __repr__(self):
+        return f"Lineage({self.label!r}, {self.sigfigs!r}, {self.lsd!r})"
+
+    def chain(self):
+        """
+        Return the list of nodes from this node to the input.
+        """
+        nodes, node = [], self
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        return nodes
+
+
+def _intern(label, sigfigs, lsd, parent=None):
+    """
+    Return the shared Lineage node with these fields.
+    """
+    key = (label, sigfigs, lsd, parent)
+    node = _NODES.get(key)
+    if node is None:
+        node = _NODES.setdefault(key, Lineage(label, sigfigs, lsd, parent))
+    return node
+
+
+def _lineage_of(value):
+    """
+    Return the lineage node of value, an SFFloat with limited precision.
+    """
+    node = getattr(value, "_lineage", None)
+    if node is None:
+        node = _intern(str(value), value.sigfigs, value.lsd)
+    return node
+
+
+class SFTraced(SFFloat):
+    """
+    The sftrace :class:`SFTraced` class is an :class:`SFFloat` that records the
+    lineage of its precision through arithmetic with SFFloat and float values. The
+    sf math functions return plain SFFloat values, and arithmetic with other SFFloat
+    subclasses, such as :class:`sffloat.sfunits.SFQuantity`, is left to them.
+
+    :Required Arguments:
+        * **val** [float or str] The numeric value of the new instance.
+
+    :Optional Arguments:
+        * **sigfigs** [int] The number of significant digits, as for :class:`SFFloat`.
+
+    :Optional Keyword Arguments:
+        * **lsd** [int] The place of the least significant digit, as for
+            :class:`SFFloat`.
+        * **label** [str] The name of the input in explanations; by default its
+            value."""
+
+    __slots__ = ("_lineage",)
+
+    def __init__(self, value, sigfigs=None, label=None, **kwargs):
+        super().__init__(value, sigfigs, **kwargs)
+        if self is value:
+            return
+        self._lineage = None
+        if self._lsd is not None:
+            self._lineage = _intern(
+                str(self) if label is None else label, self.sigfigs, self._lsd
+            )
+
+    @property
+    def lineage(self):
+        """
+        Return the list of Lineage nodes from this value to the input that limited
+        its precision, or an empty list for unlimited precision.
+        """
+        node = getattr(self, "_lineage", None)
+        return [] if node is None else node.chain()
+
+    def explain(self):
+        """
+        Return a description of the operations and the input that limited the
+        precision of this value.
+        """
+        if self._lsd is None:
+            return f"{self} has unlimited sigfigs"
+        lines = [f"{self} has {self.sigfigs} sigfigs, lsd {self._lsd}"]
+        for node in self.lineage:
+            if node.parent is None:
+                lines.append(
+                    f"  from input {node.label} with {node.sigfigs} sigfigs, "
+                    f"lsd {node.lsd}"
+                )
+            else:
+                lines.append(
+                    f"  {node.label} at lsd {node.lsd} left {node.sigfigs} sigfigs"
+                )
+        return "\n".join(lines)
+
+    def _traced(self, operator, other, symbol, additive):
+        """
+        Return operator(other), an SFFloat operator method bound to self, with the
+        lineage of the operation symbol, which is additive (lsd rule) or
+        multiplicative (sigfigs rule). Other SFFloat subclasses, which carry more
+        than a precision (e.g. the unit of an SFQuantity), handle the operation.
+        """
+        kind = type(other)
+        if kind is not SFFloat and isinstance(other, SFFloat):
+            if not isinstance(other, SFTraced):
+                return NotImplemented
+        result = operator(other)
+        if result is NotImplemented or result._lsd is None:
+            return result
+        if not isinstance(result, SFTraced):  # reflected operators of the C core
+            result = type(self)._from_parts(*self._parts_of(result))
+        if additive:
+            limited = self._lsd == result._lsd
+        else:
+            limited = self.sigfigs == result.sigfigs
+        if limited:
+            limiting = self
+        else:
+            limiting = other if isinstance(other, SFFloat) else SFFloat(other)
+        node = _lineage_of(limiting)
+        if additive and result.sigfigs != limiting.sigfigs:
+            node = _intern(symbol, result.sigfigs, result._lsd, node)
+        result._lineage = node
+        return result
+
+    def __add__(self, other):
+        return self._traced(super().__add__, other, "+", True)
+
+    def __radd__(self, other):
+        return self._traced(super().__radd__, other, "+", True)
+
+    def __sub__(self, other):
+        return self._traced(super().__sub__, other, "-", True)
+
+    def __rsub__(self, other):
+        return self._traced(super().__rsub__, other, "-", True)
+
+    def __mul__(self, other):
+        return self._traced(super().__mul__, other, "*", False)
+
+    def __rmul__(self, other):
+        return self._traced(super().__rmul__, other, "*", False)
+
+    def __truediv__(self, other):
+        return self._traced(super().__truediv__, other, "/", False)
+
+    def __rtruediv__(self, other):
+        return self._traced(super().__rtruediv__, other, "/", False)
+
+    def __pow__(self, other):
+        return self._traced(super().__pow__, other, "**", False)
+
+    def __rpow__(self, other):
+        return self._traced(super().__rpow__, other, "**", False)
+
+    def _with_lineage(self, result):
+        """
+        Return result, a copy of self with a new value, with the lineage of self.
+        """
+        result._lineage = getattr(self, "_lineage", None)
+        return result
+
+    def __neg__(self):
+        return self._with_lineage(super().__neg__())
+
+    def __abs__(self):
+        return self._with_lineage(super().__abs__())
+
+    def copy(self):
+        return self._with_lineage(super().copy())
+
+    @classmethod
+    def _from_lineage(cls, val, lsd, fields):
+        """
+        Return a new instance from its value, lsd and the (label, sigfigs, lsd) of
+        its lineage nodes, from the input on, as stored by :meth:`__reduce__`.
+        """
+        retval = cls._from_parts(val, lsd)
+        node = None
+        for label, sigfigs, node_lsd in fields:
+            node = _intern(label, sigfigs, node_lsd, node)
+        retval._lineage = node
+        return retval
+
+    def __reduce__(self):
+        """
+        Implements pickling (and copy) support, storing the value, lsd and lineage.
+        """
+        fields = tuple((node.label, node.sigfigs, node.lsd) for node in self.lineage)
+        return type(self)._from_lineage, (self._val, self._lsd, fields[::-1])
@@ -0,0 +1,434 @@
+"""
+The sfuncertain module defines :class:`SFUncertain`, an opt-in variant of
+:class:`SFFloat` that carries an absolute (standard) uncertainty, and
+:class:`SFUncertainArray`, its NumPy backed batch form.
+
+Uncertainties are propagated analytically to first order, treating the operands as
+independent: the uncertainty of f(x, y) is the root sum of squares of
+df/dx * ux and df/dy * uy. This holds for the arithmetic operators and for the sf
+math functions (:func:`sffloat.sfsin` etc.) and the batched :mod:`sffloat.sfmath`
+functions, whose derivatives are listed in :data:`PARTIALS`. Other functions are
+handled with the secant (f(x + ux) - f(x - ux)) / 2.
+
+The significant figures of a value follow from its uncertainty: the lsd is the
+place of the last of the :attr:`SFUncertain.uncertainty_digits` significant digits
+of the rounded uncertainty, so a value prints to the precision that its uncertainty
+allows. An :class:`SFFloat` operand is taken to be uncertain by half a unit in its
+last place, and a float to be exact. The reductions of :mod:`sffloat.sfreduce`
+(:func:`sffloat.sfsum` etc.), :mod:`sffloat.sfstore` and
+:func:`sffloat.sfparallel.map` raise TypeError for uncertain values, whose
+uncertainties they would drop.
+"""
+
+# pylint: disable=protected-access
+
+import contextlib
+import math
+import operator
+from .sffloat import SFFloat, _MATH_HOOKS, _PARTIALS
+from .sfarray import SFArray, np, _require_numpy
+from .sfunits import SFQuantity
+from . import sfmath, sfreduce, sfstore, sfunits
+
+# partial derivatives of the operators and math functions, by argument, as
+# functions of (m, *args) where m is the math module for scalars or numpy for
+# arrays
+PARTIALS = {
+    operator.add: (lambda m, x, y: 1.0, lambda m, x, y: 1.0),
+    operator.sub: (lambda m, x, y: 1.0, lambda m, x, y: -1.0),
+    operator.mul: (lambda m, x, y: y, lambda m, x, y: x),
+    operator.truediv: (lambda m, x, y: 1.0 / y, lambda m, x, y: -x / (y * y)),
+    **_PARTIALS,
+}
+
+
+def _error_lsd(err, digits):
+    """
+    Return the lsd of a value with uncertainty err shown to digits significant
+    digits, or None for an exact value.
+    """
+    if err == 0.0:
+        return None
+    if not math.isfinite(err):
+        raise ValueError("Uncertainty of the result is not finite.")
+    lsd = math.floor(math.log10(err)) - (digits - 1)
+    if round(err / 10.0**lsd) >= 10**digits:
+        lsd += 1  # the uncertainty rounds up to the next power of ten
+    return lsd
+
+
+def _error_of(value):
+    """
+    Return the value and uncertainty of an SFFloat or a number.
+    """
+    if isinstance(value, SFUncertain):
+        return value._val, value._err
+    if isinstance(value, SFQuantity):
+        raise TypeError("SFUncertain does not combine with SFQuantity values.")
+    if isinstance(value, SFFloat):
+        lsd = value.lsd
+        return value.value, 0.0 if lsd is None else 0.5 * 10.0**lsd
+    if isinstance(value, (float, int)):
+        return float(value), 0.0
+    raise TypeError(f"Unsupported operand type {type(value).__name__!r}.")
+
+
+def _propagate(m, func, vals, errs, evaluate):
+    """
+    Return the uncertainty of func(*vals), for operands with uncertainties errs.
+    m is math for scalars or numpy for arrays, and evaluate computes func with m.
+    """
+    partials = PARTIALS.get(func)
+    terms = []
+    with np.errstate(all="ignore") if m is np else contextlib.nullcontext():
+        for index, err in enumerate(errs):
+            if m is math and not err:
+                continue
+            if partials is not None:
+                term = partials[index](m, *vals) * err
+            else:  # secant over the uncertainty
+                high, low = list(vals), list(vals)
+                high[index], low[index] = vals[index] + err, vals[index] - err
+                term = (evaluate(*high) - evaluate(*low)) / 2.0
+            terms.append(term if m is math else np.where(err == 0.0, 0.0, term))
+    if m is math:
+        return math.hypot(*terms)
+    return np.abs(terms[0]) if len(terms) == 1 else np.hypot(*terms)
+
+
+class SFUncertain(SFFloat):
+    """
+    The sfuncertain :class:`SFUncertain` class is an :class:`SFFloat` with an
+    absolute uncertainty, which arithmetic and the sf math functions propagate.
+    Its lsd, and so its sigfigs and display, follow from the uncertainty; the
+    format spec "pm" shows both, e.g. ``format(x, "pm")`` gives "1.23 ± 0.04".
+
+    :Required Arguments:
+        * **value** [float, int, str or SFFloat] The numeric value of the new
+            instance.
+
+    :Optional Arguments:
+        * **uncertainty** [float] The absolute uncertainty of the value. By default
+            half a unit in the last place of an SFFloat value, else zero."""
+
+    __slots__ = ("_err",)
+
+    # significant digits of the uncertainty, which set the lsd of the value
+    uncertainty_digits = 1
+
+    def __new__(cls, value, uncertainty=None):
+        if uncertainty is None:
+            if isinstance(value, cls):
+                return value
+            uncertainty = _error_of(value)[1] if isinstance(value, SFFloat) else 0.0
+        err = float(uncertainty)
+        if not (math.isfinite(err) and err >= 0.0):
+            raise ValueError("Invalid value for uncertainty.")
+        return cls._from_error(float(value), err)
+
+    def __init__(self, *args, **kwargs):  # pylint: disable=super-init-not-called
+        pass  # the instance is set up by __new__
+
+    @classmethod
+    def _from_error(cls, val, err):
+        """
+        Return a new instance from its value and uncertainty.
+        """
+        retval = cls._from_parts(val, _error_lsd(err, cls.uncertainty_digits))
+        retval._err = err
+        return retval
+
+    @property
+    def uncertainty(self):
+        """
+        Return the absolute uncertainty.
+        """
+        return self._err
+
+    @classmethod
+    def _propagated(cls, func, vals, errs):
+        """
+        Return func(*vals) with the uncertainty propagated from errs.
+        """
+        val = func(*vals)
+        return cls._from_error(float(val), _propagate(math, func, vals, errs, func))
+
+    def _combine(self, func, other, reflected=False):
+        """
+        Return func(self, other), or func(other, self) if reflected.
+        """
+        try:
+            val2, err2 = _error_of(other)
+        except TypeError:
+            return NotImplemented
+        vals, errs = (self._val, val2), (self._err, err2)
+        if reflected:
+            vals, errs = vals[::-1], errs[::-1]
+        return self._propagated(func, vals, errs)
+
+    def __add__(self, other):
+        return self._combine(operator.add, other)
+
+    def __radd__(self, other):
+        return self._combine(operator.add, other, reflected=True)
+
+    def __sub__(self, other):
+        return self._combine(operator.sub, other)
+
+    def __rsub__(self, other):
+        return self._combine(operator.sub, other, reflected=True)
+
+    def __mul__(self, other):
+        return self._combine(operator.mul, other)
+
+    def __rmul__(self, other):
+        return self._combine(operator.mul, other, reflected=True)
+
+    def __truediv__(self, other):
+        return self._combine(operator.truediv, other)
+
+    def __rtruediv__(self, other):
+        return self._combine(operator.truediv, other, reflected=True)
+
+    def __pow__(self, other):
+        return self._combine(math.pow, other)
+
+    def __rpow__(self, other):
+        return self._combine(math.pow, other, reflected=True)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return self._from_error(-self._val, self._err)
+
+    def __abs__(self):
+        return self._from_error(abs(self._val), self._err)
+
+    def copy(self):
+        """
+        Return a new instance of SFUncertain that is a copy.
+        """
+        return self._from_error(self._val, self._err)
+
+    def __reduce__(self):
+        """
+        Implements pickling (and copy) support, storing the value and uncertainty.
+        """
+        return type(self)._from_error, (self._val, self._err)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._val}, {self._err})"
+
+    def _error_text(self):
+        """
+        Return the uncertainty rounded to the lsd of the value, as a string.
+        """
+        lsd = self._lsd
+        if lsd is None:
+            return "0"
+        if lsd < 0:
+            return f"{self._err:.{-lsd}f}"
+        return f"{round(self._err, -lsd):.0f}"
+
+    def __format__(self, format_spec):
+        if format_spec == "pm":
+            return f"{self} ± {self._error_text()}"
+        return super().__format__(format_spec)
+
+
+def _math_hook(func, *args):
+    """
+    Apply the sf math function func to args, one of which is an SFUncertain.
+    """
+    cls = next(type(arg) for arg in args if isinstance(arg, SFUncertain))
+    vals, errs = zip(*map(_error_of, args))
+    return cls._propagated(func, vals, errs)
+
+
+_MATH_HOOKS[SFUncertain] = _math_hook
+sfreduce._UNSUPPORTED.add(SFUncertain)
+sfstore._UNSUPPORTED.add(SFUncertain)
+sfunits._UNSUPPORTED.add(SFUncertain)
+
+
+def _errors_of(value):
+    """
+    Return the value and uncertainty arrays (or scalars) of an SFUncertainArray,
+    SFArray, SFFloat, number or sequence.
+    """
+    if isinstance(value, SFUncertainArray):
+        return value._val, value._err
+    if isinstance(value, SFArray):
+        lsds = value._lsd
+        return value._val, np.where(lsds == SFArray.LSD_INF, 0.0, 0.5 * 10.0**lsds)
+    if isinstance(value, (SFFloat, float, int, np.number)):
+        return _error_of(float(value) if isinstance(value, np.number) else value)
+    value = SFUncertainArray(value)
+    return value._val, value._err
+
+
+class SFUncertainArray(SFArray):
+    """
+    The sfuncertain :class:`SFUncertainArray` class is an :class:`SFArray` whose
+    values carry absolute uncertainties, held in a third NumPy array. Arithmetic and
+    the :mod:`sffloat.sfmath` functions propagate the uncertainties with
+    whole-array operations, and each element of the result matches the
+    corresponding :class:`SFUncertain` computation. Indexing returns
+    :class:`SFUncertain` objects.
+
+    :Required Arguments:
+        * **values** [iterable] The numeric values of the new instance. Elements
+            may be float, int, :class:`SFFloat` or :class:`SFUncertain`. An
+            :class:`SFArray` or NumPy array may also be used.
+
+    :Optional Arguments:
+        * **uncertainty** [float or iterable of float] The absolute uncertainties of
+            the values. By default the uncertainties of SFUncertain elements, half a
+            unit in the last place of other SFFloat elements, and zero for floats."""
+
+    # pylint: disable-next=super-init-not-called
+    def __init__(self, values, uncertainty=None):
+        _require_numpy()
+        if isinstance(values, SFArray):
+            vals, errs = _errors_of(values)
+        elif isinstance(values, np.ndarray) and values.dtype != object:
+            vals = values.astype(np.float64, copy=False)
+            errs = np.zeros(vals.shape)
+        else:
+            parts = [_error_of(item) for item in values]
+            vals = np.array([val for val, _ in parts], dtype=np.float64)
+            errs = np.array([err for _, err in parts], dtype=np.float64)
+        if vals.ndim != 1:
+            raise ValueError("SFArray values must be one dimensional.")
+        if uncertainty is not None:
+            errs = np.broadcast_to(
+                np.asarray(uncertainty, dtype=np.float64), vals.shape
+            )
+        if not np.all(np.isfinite(errs) & (errs >= 0.0)):
+            raise ValueError("Invalid value for uncertainty.")
+        self._val = vals
+        self._err = np.array(errs, dtype=np.float64)
+        self._lsd = self._error_lsds(self._err)
+
+    @classmethod
+    def _error_lsds(cls, errs):
+        """
+        Return the lsd array of values with the uncertainties errs, as
+        :func:`_error_lsd` computes it for each.
+        """
+        if not np.all(np.isfinite(errs)):
+            raise ValueError("Uncertainty of the result is not finite.")
+        digits = SFUncertain.uncertainty_digits
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lsds = np.floor(np.log10(errs)) - (digits - 1)
+            lsds = np.where(np.round(errs / 10.0**lsds) >= 10**digits, lsds + 1, lsds)
+        lsds = np.where(errs == 0.0, cls.LSD_INF, lsds)
+        return np.asarray(lsds, dtype=cls.LSD_DTYPE)
+
+    @classmethod
+    def _from_errors(cls, vals, errs):
+        """
+        Return a new instance built directly from value and uncertainty arrays.
+        """
+        retval = cls.__new__(cls)
+        retval._val = vals
+        retval._err = errs
+        retval._lsd = cls._error_lsds(errs)
+        return retval
+
+    @property
+    def uncertainty(self):
+        """
+        Return the absolute uncertainties.
+        """
+        return self._err
+
+    def copy(self):
+        """
+        Return a new instance of SFUncertainArray that is a copy.
+        """
+        return self._from_errors(self._val.copy(), self._err.copy())
+
+    def _item(self, index):
+        """
+        Return the element at index as an SFUncertain.
+        """
+        return SFUncertain._from_error(float(self._val[index]), float(self._err[index]))
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self._item(index)
+        return self._from_errors(self._val[index], self._err[index])
+
+    @classmethod
+    def _propagated(cls, func, ufunc, vals, errs):
+        """
+        Return ufunc(*vals), the NumPy form of func, with the uncertainties
+        propagated from errs.
+        """
+        result = np.asarray(sfmath._ufunc(ufunc, *vals), dtype=np.float64)
+        err = _propagate(np, func, vals, errs, ufunc)
+        return cls._from_errors(result, np.array(np.broadcast_to(err, result.shape)))
+
+    def _combine(self, func, ufunc, other, reflected=False):
+        """
+        Return func(self, other), or func(other, self) if reflected.
+        """
+        val2, err2 = _errors_of(other)
+        vals, errs = (self._val, val2), (self._err, err2)
+        if reflected:
+            vals, errs = vals[::-1], errs[::-1]
+        if func is operator.truediv and np.any(np.asarray(vals[1]) == 0.0):
+            raise ZeroDivisionError("float division by zero")
+        return self._propagated(func, ufunc, vals, errs)
+
+    def __add__(self, other):
+        return self._combine(operator.add, np.add, other)
+
+    def __radd__(self, other):
+        return self._combine(operator.add, np.add, other, reflected=True)
+
+    def __sub__(self, other):
+        return self._combine(operator.sub, np.subtract, other)
+
+    def __rsub__(self, other):
+        return self._combine(operator.sub, np.subtract, other, reflected=True)
+
+    def __mul__(self, other):
+        return self._combine(operator.mul, np.multiply, other)
+
+    def __rmul__(self, other):
+        return self._combine(operator.mul, np.multiply, other, reflected=True)
+
+    def __truediv__(self, other):
+        return self._combine(operator.truediv, np.true_divide, other)
+
+    def __rtruediv__(self, other):
+        return self._combine(operator.truediv, np.true_divide, other, reflected=True)
+
+    def __pow__(self, other):
+        return self._combine(math.pow, np.power, other)
+
+    def __rpow__(self, other):
+        return self._combine(math.pow, np.power, other, reflected=True)
+
+    def __neg__(self):
+        return self._from_errors(-self._val, self._err)
+
+    def __abs__(self):
+        return self._from_errors(np.abs(self._val), self._err)
+
+
+def _batch_hook(func, *args, ufunc):
+    """
+    Apply the sfmath function func, whose NumPy form is ufunc, to args, one of
+    which is an SFUncertainArray.
+    """
+    vals, errs = zip(*map(_errors_of, args))
+    return SFUncertainArray._propagated(func, ufunc, vals, errs)
+
+
+sfmath._BATCH_HOOKS[SFUncertainArray] = _batch_hook
+sfreduce._UNSUPPORTED.add(SFUncertainArray)
+sfstore._UNSUPPORTED.add(SFUncertainArray)
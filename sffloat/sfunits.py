@@ -0,0 +1,837 @@
+"""
+The sfunits module defines :class:`SFQuantity`, an :class:`SFFloat` with a
+physical unit, and :class:`SFQuantityArray`, its NumPy backed batch form for column
+data.
+
+Units are :class:`Unit` objects, made from text such as "kg*m/s^2" with
+:meth:`Unit.parse`. A unit is a product of powers of the symbols in
+:data:`SYMBOLS`, which may have an SI prefix (e.g. "km", "us", "kPa"). Units are
+interned, so equal text and the results of equal unit arithmetic give the same
+object, which is shared by all the quantities that use it. Each unit holds its
+dimension, a tuple of the exponents of the SI base units (m, kg, s, A, K, mol, cd),
+and its scale, the factor that converts it to SI base units. Dimension checks
+compare these small tuples, and the conversion factor between two units is
+computed once and cached.
+
+Arithmetic keeps the significant figures rules of SFFloat. Addition, subtraction
+and comparisons convert the right operand to the unit of the left one, keeping its
+sigfigs, and raise :class:`DimensionError` for different dimensions. Multiplication,
+division and powers combine the units. Only units that convert by a factor are
+supported, so e.g. degrees Celsius are not. The reductions of
+:mod:`sffloat.sfreduce` (:func:`sffloat.sfsum` etc.), :mod:`sffloat.sfstore` and
+:func:`sffloat.sfparallel.map` raise TypeError for quantities, which would lose
+their units.
+"""
+
+# pylint: disable=protected-access
+
+import math
+import re
+from .sffloat import SFFloat, _MATH_HOOKS
+from .sfarray import SFArray, np, _require_numpy
+from . import sfmath, sfreduce, sfstore
+
+# the SI base units, in the order of the exponents of a dimension
+BASE_UNITS = ("m", "kg", "s", "A", "K", "mol", "cd")
+
+
+def _dimension(**exponents):
+    """
+    Return the dimension tuple with the given exponents of the SI base units.
+    """
+    return tuple(exponents.get(name, 0) for name in BASE_UNITS)
+
+
+# symbol: (dimension, scale to SI base units, takes SI prefixes)
+SYMBOLS = {
+    "m": (_dimension(m=1), 1.0, True),
+    "g": (_dimension(kg=1), 1e-3, True),
+    "s": (_dimension(s=1), 1.0, True),
+    "A": (_dimension(A=1), 1.0, True),
+    "K": (_dimension(K=1), 1.0, True),
+    "mol": (_dimension(mol=1), 1.0, True),
+    "cd": (_dimension(cd=1), 1.0, True),
+    "Hz": (_dimension(s=-1), 1.0, True),
+    "N": (_dimension(kg=1, m=1, s=-2), 1.0, True),
+    "Pa": (_dimension(kg=1, m=-1, s=-2), 1.0, True),
+    "J": (_dimension(kg=1, m=2, s=-2), 1.0, True),
+    "W": (_dimension(kg=1, m=2, s=-3), 1.0, True),
+    "C": (_dimension(A=1, s=1), 1.0, True),
+    "V": (_dimension(kg=1, m=2, s=-3, A=-1), 1.0, True),
+    "ohm": (_dimension(kg=1, m=2, s=-3, A=-2), 1.0, True),
+    "L": (_dimension(m=3), 1e-3, True),
+    "eV": (_dimension(kg=1, m=2, s=-2), 1.602176634e-19, True),
+    "bar": (_dimension(kg=1, m=-1, s=-2), 1e5, True),
+    "rad": (_dimension(), 1.0, False),
+    "deg": (_dimension(), math.pi / 180.0, False),
+    "min": (_dimension(s=1), 60.0, False),
+    "h": (_dimension(s=1), 3600.0, False),
+    "day": (_dimension(s=1), 86400.0, False),
+    "in": (_dimension(m=1), 0.0254, False),
+    "ft": (_dimension(m=1), 0.3048, False),
+    "lb": (_dimension(kg=1), 0.45359237, False),
+    "atm": (_dimension(kg=1, m=-1, s=-2), 101325.0, False),
+}
+
+PREFIXES = {
+    "Y": 1e24,
+    "Z": 1e21,
+    "E": 1e18,
+    "P": 1e15,
+    "T": 1e12,
+    "G": 1e9,
+    "M": 1e6,
+    "k": 1e3,
+    "h": 1e2,
+    "da": 1e1,
+    "d": 1e-1,
+    "c": 1e-2,
+    "m": 1e-3,
+    "u": 1e-6,
+    "µ": 1e-6,
+    "n": 1e-9,
+    "p": 1e-12,
+    "f": 1e-15,
+    "a": 1e-18,
+    "z": 1e-21,
+    "y": 1e-24,
+}
+
+_FACTOR = re.compile(r"\s*([*/]?)\s*([^\s*/^]+)(?:\s*\^\s*([+-]?\d+))?\s*")
+
+# interned units by factors, parsed units by text, and cached unit arithmetic and
+# conversion factors
+_UNITS = {}
+_PARSED = {}
+_PRODUCTS = {}
+_FACTORS = {}
+
+
+class DimensionError(ValueError):
+    """
+    The sfunits :class:`DimensionError` exception is raised for arithmetic,
+    comparisons or conversions between values of different dimensions."""
+
+
+def _symbol(symbol):
+    """
+    Return the dimension and scale of a unit symbol, which may have an SI prefix.
+    """
+    if symbol in SYMBOLS:
+        dimension, scale, _ = SYMBOLS[symbol]
+        return dimension, scale
+    for size in (2, 1):
+        prefix, rest = symbol[:size], symbol[size:]
+        if prefix in PREFIXES and rest in SYMBOLS and SYMBOLS[rest][2]:
+            dimension, scale, _ = SYMBOLS[rest]
+            return dimension, PREFIXES[prefix] * scale
+    raise ValueError(f"Unknown unit {symbol!r}.")
+
+
+def _name(factors):
+    """
+    Return the text of a unit with factors ((symbol, exponent), ...).
+    """
+    above = [f"{s}^{e}" if e != 1 else s for s, e in factors if e > 0]
+    below = [f"{s}^{-e}" if e != -1 else s for s, e in factors if e < 0]
+    if not below:
+        return "*".join(above)
+    return "*".join(above or ["1"]) + "".join("/" + text for text in below)
+
+
+class Unit:
+    """
+    The sfunits :class:`Unit` class is an interned physical unit: a product of powers
+    of unit symbols, with its dimension and the scale that converts it to SI base
+    units. Create units with :meth:`Unit.parse`; units may be multiplied, divided
+    and raised to powers."""
+
+    __slots__ = ("name", "factors", "dimension", "scale")
+
+    def __init__(self, factors):
+        self.factors = factors
+        self.name = _name(factors)
+        dimension, scale = [0] * len(BASE_UNITS), 1.0
+        for symbol, exponent in factors:
+            symbol_dimension, symbol_scale = _symbol(symbol)
+            for index, count in enumerate(symbol_dimension):
+                dimension[index] += count * exponent
+            scale *= symbol_scale**exponent
+        self.dimension = tuple(dimension)
+        self.scale = scale
+
+    @classmethod
+    def _intern(cls, factors):
+        """
+        Return the shared unit with factors, merging repeated symbols.
+        """
+        merged = {}
+        for symbol, exponent in factors:
+            merged[symbol] = merged.get(symbol, 0) + exponent
+        factors = tuple((s, e) for s, e in merged.items() if e)
+        unit = _UNITS.get(factors)
+        if unit is None:
+            unit = _UNITS.setdefault(factors, cls(factors))
+        return unit
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Return the unit for text such as "m", "km/h", "kg*m/s^2", "N m" or "1/s".
+        Each "/" divides by the factor after it, and "**" may be used for "^". A
+        Unit is returned unchanged.
+        """
+        if isinstance(text, Unit):
+            return text
+        unit = _PARSED.get(text)
+        if unit is not None:
+            return unit
+        factors, position, source = [], 0, text.replace("**", "^")
+        while position < len(source) and not source[position:].isspace():
+            match = _FACTOR.match(source, position)
+            if match is None or (position == 0 and match.group(1)):
+                raise ValueError(f"Invalid unit {text!r}.")
+            operator, symbol, exponent = match.groups()
+            exponent = int(exponent or 1) * (-1 if operator == "/" else 1)
+            if symbol != "1":
+                _symbol(symbol)
+                factors.append((symbol, exponent))
+            position = match.end()
+        unit = _PARSED.setdefault(text, cls._intern(factors))
+        return unit
+
+    @property
+    def dimensionless(self):
+        """
+        Return True if the unit has no dimension, e.g. "" or "rad".
+        """
+        return not any(self.dimension)
+
+    def factor_to(self, other):
+        """
+        Return the factor that converts values in this unit to unit other.
+        """
+        other = Unit.parse(other)
+        key = (self, other)
+        factor = _FACTORS.get(key)
+        if factor is None:
+            if other.dimension != self.dimension:
+                raise DimensionError(f"Can not convert {self} to {other}.")
+            factor = _FACTORS.setdefault(key, self.scale / other.scale)
+        return factor
+
+    def _combine(self, other, sign):
+        """
+        Return the product of this unit and other, raised to sign.
+        """
+        key = (self, other, sign)
+        unit = _PRODUCTS.get(key)
+        if unit is None:
+            factors = self.factors + tuple((s, sign * e) for s, e in other.factors)
+            unit = _PRODUCTS.setdefault(key, self._intern(factors))
+        return unit
+
+    def __mul__(self, other):
+        return self._combine(Unit.parse(other), 1)
+
+    def __truediv__(self, other):
+        return self._combine(Unit.parse(other), -1)
+
+    def __pow__(self, power):
+        power = float(power)
+        factors = tuple((s, e * power) for s, e in self.factors)
+        if any(e != round(e) for _, e in factors):
+            raise ValueError(f"Can not raise {self} to the power {power}.")
+        return self._intern((s, int(round(e))) for s, e in factors)
+
+    def _power(self, power):
+        """
+        Return this unit raised to power, and the factor that values in this unit
+        are multiplied by first. Units whose exponents do not divide, e.g. km*m to
+        the power 0.5, are raised in SI base units.
+        """
+        try:
+            return self**power, 1.0
+        except ValueError:
+            base = self._intern(zip(BASE_UNITS, self.dimension))
+            return base**power, self.scale
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f"Unit.parse({self.name!r})"
+
+    def __reduce__(self):
+        return Unit.parse, (self.name,)
+
+
+DIMENSIONLESS = Unit.parse("")
+
+
+# SFFloat subclasses that hold more than a precision (e.g.
+# :class:`sffloat.sfuncertain.SFUncertain`) register themselves here, and quantities
+# do not combine with them, rather than drop that state.
+_UNSUPPORTED = set()
+
+
+def _unsupported(value):
+    """
+    Return True if value is of a type registered in _UNSUPPORTED.
+    """
+    kind = type(value)
+    return kind is not SFFloat and any(base in _UNSUPPORTED for base in kind.__mro__)
+
+
+def _scaled(cls, value, factor):
+    """
+    Return SFFloat value multiplied by factor, as an instance of cls, keeping its
+    sigfigs.
+    """
+    val = value._val * factor
+    if value._lsd is None:
+        return cls._from_parts(val, None)
+    sigfigs = value.sigfigs
+    return cls._from_parts(val, cls._msd_from_val(val) - (sigfigs - 1), sigfigs)
+
+
+def _magnitude(value):
+    """
+    Return an SFQuantity as an SFFloat in its unit.
+    """
+    return SFFloat._from_parts(value._val, value._lsd)
+
+
+def _plain(value):
+    """
+    Return a dimensionless SFQuantity, SFFloat or number as an SFFloat or number
+    with scale 1.
+    """
+    if not isinstance(value, SFQuantity):
+        return value
+    if not value._unit.dimensionless:
+        raise DimensionError(f"Expected a dimensionless value, not {value._unit}.")
+    if value._unit.scale == 1.0:
+        return _magnitude(value)
+    return _scaled(SFFloat, value, value._unit.scale)
+
+
+class SFQuantity(SFFloat):
+    """
+    The sfunits :class:`SFQuantity` class is an :class:`SFFloat` with a physical
+    unit. Arithmetic with other quantities converts and combines units, and keeps
+    the significant figures rules of SFFloat; floats and SFFloat values are
+    dimensionless.
+
+    :Required Arguments:
+        * **value** [float or SFFloat] The numeric value of the new instance,
+            in unit.
+
+    :Optional Arguments:
+        * **sigfigs** [int] The number of significant digits, as for :class:`SFFloat`.
+        * **unit** [str or Unit] The unit of the value, e.g. "m/s". By default the
+            value is dimensionless.
+
+    :Optional Keyword Arguments:
+        * **lsd** [int] The place of the least significant digit, as for
+            :class:`SFFloat`."""
+
+    __slots__ = ("_unit",)
+
+    def __new__(cls, value, sigfigs=None, unit=None, lsd=None):
+        if isinstance(value, SFQuantity) and sigfigs is None and lsd is None:
+            if unit is not None:
+                return value.to(unit)
+            if isinstance(value, cls):
+                return value
+        if isinstance(value, SFQuantity):
+            value = _magnitude(value)
+        value = SFFloat(value, sigfigs, lsd=lsd)
+        return cls._from_quantity(value._val, value._lsd, Unit.parse(unit or ""))
+
+    def __init__(self, *args, **kwargs):  # pylint: disable=super-init-not-called
+        pass  # the instance is set up by __new__
+
+    @classmethod
+    def _from_quantity(cls, val, lsd, unit):
+        """
+        Return a new instance from its value and lsd in unit.
+        """
+        retval = cls._from_parts(val, lsd)
+        retval._unit = unit
+        return retval
+
+    @property
+    def unit(self):
+        """
+        Return the :class:`Unit` of the value.
+        """
+        return self._unit
+
+    @property
+    def magnitude(self):
+        """
+        Return the value in its unit as an :class:`SFFloat`.
+        """
+        return _magnitude(self)
+
+    def to(self, unit):
+        """
+        Return the value converted to unit, keeping its sigfigs.
+        """
+        unit = Unit.parse(unit)
+        if unit is self._unit:
+            return self
+        result = _scaled(type(self), self, self._unit.factor_to(unit))
+        result._unit = unit
+        return result
+
+    def _result(self, result, unit):
+        """
+        Return result of SFFloat arithmetic as an instance with unit.
+        """
+        if result is NotImplemented:
+            return result
+        if not isinstance(result, SFQuantity):  # reflected operators of the C core
+            result = type(self)._from_parts(*self._parts_of(result))
+        result._unit = unit
+        return result
+
+    def _converted(self, other):
+        """
+        Return other, a quantity or dimensionless value, converted to the unit of
+        self, or NotImplemented for other types.
+        """
+        if isinstance(other, SFQuantity):
+            if other._unit is self._unit:
+                return other
+            return _scaled(SFFloat, other, other._unit.factor_to(self._unit))
+        if not isinstance(other, (SFFloat, float, int)) or _unsupported(other):
+            return NotImplemented
+        unit = self._unit
+        if not unit.dimensionless:
+            raise DimensionError(f"Can not combine {unit} with a dimensionless value.")
+        if unit.scale == 1.0:
+            return other
+        if isinstance(other, SFFloat):
+            return _scaled(SFFloat, other, 1.0 / unit.scale)
+        return other / unit.scale
+
+    def __add__(self, other):
+        other = self._converted(other)
+        if other is NotImplemented:
+            return other
+        return self._result(super().__add__(other), self._unit)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        other = self._converted(other)
+        if other is NotImplemented:
+            return other
+        return self._result(super().__sub__(other), self._unit)
+
+    def __rsub__(self, other):
+        other = self._converted(other)
+        if other is NotImplemented:
+            return other
+        return self._result(super().__rsub__(other), self._unit)
+
+    def _unit_with(self, other, sign):
+        """
+        Return the unit of self times other raised to sign, or None if other is not
+        a number.
+        """
+        if isinstance(other, SFQuantity):
+            return self._unit._combine(other._unit, sign)
+        if isinstance(other, (SFFloat, float, int)) and not _unsupported(other):
+            return self._unit
+        return None
+
+    def __mul__(self, other):
+        unit = self._unit_with(other, 1)
+        if unit is None:
+            return NotImplemented
+        return self._result(super().__mul__(other), unit)
+
+    def __rmul__(self, other):
+        unit = self._unit_with(other, 1)
+        if unit is None:
+            return NotImplemented
+        return self._result(super().__rmul__(other), unit)
+
+    def __truediv__(self, other):
+        unit = self._unit_with(other, -1)
+        if unit is None:
+            return NotImplemented
+        return self._result(super().__truediv__(other), unit)
+
+    def __rtruediv__(self, other):
+        if self._unit_with(other, -1) is None:
+            return NotImplemented
+        unit = DIMENSIONLESS._combine(self._unit, -1)
+        return self._result(super().__rtruediv__(other), unit)
+
+    def __pow__(self, other):
+        if self._unit_with(other, 1) is None:
+            return NotImplemented
+        other = _plain(other)
+        unit, factor = self._unit._power(float(other))
+        base = self if factor == 1.0 else _scaled(SFFloat, self, factor)
+        return self._result(SFFloat.__pow__(base, other), unit)
+
+    def __rpow__(self, other):
+        if self._unit_with(other, 1) is None:
+            return NotImplemented
+        return self._result(other ** _plain(self), DIMENSIONLESS)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return self._from_quantity(-self._val, self._lsd, self._unit)
+
+    def __abs__(self):
+        return self._from_quantity(abs(self._val), self._lsd, self._unit)
+
+    def __eq__(self, other):
+        try:
+            other = self._converted(other)
+        except DimensionError:
+            return False
+        if other is NotImplemented:
+            return other
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __lt__(self, other):
+        other = self._converted(other)
+        return other if other is NotImplemented else super().__lt__(other)
+
+    def __le__(self, other):
+        other = self._converted(other)
+        return other if other is NotImplemented else super().__le__(other)
+
+    def __gt__(self, other):
+        other = self._converted(other)
+        return other if other is NotImplemented else super().__gt__(other)
+
+    def __ge__(self, other):
+        other = self._converted(other)
+        return other if other is NotImplemented else super().__ge__(other)
+
+    def __hash__(self):
+        unit = self._unit
+        value = self if unit.scale == 1.0 else _scaled(SFFloat, self, unit.scale)
+        if unit.dimensionless:
+            return SFFloat.__hash__(value)
+        return hash((SFFloat.__hash__(value), unit.dimension))
+
+    def copy(self):
+        """
+        Return a new instance of SFQuantity that is a copy.
+        """
+        return self._from_quantity(self._val, self._lsd, self._unit)
+
+    def __reduce__(self):
+        """
+        Implements pickling (and copy) support, storing the value, lsd and unit.
+        """
+        return type(self)._from_quantity, (self._val, self._lsd, self._unit)
+
+    def display_key(self):
+        """
+        Return a hashable key describing how this value displays, including its
+        unit, as for :meth:`SFFloat.display_key`.
+        """
+        return (super().display_key(), self._unit.name)
+
+    def _with_unit_text(self, text):
+        """
+        Return text followed by the unit.
+        """
+        return f"{text} {self._unit.name}" if self._unit.name else text
+
+    def __str__(self):
+        return self._with_unit_text(super().__str__())
+
+    def __format__(self, format_spec):
+        return self._with_unit_text(super().__format__(format_spec))
+
+    def __repr__(self):
+        if self._lsd is None:
+            return f"{type(self).__name__}({self._val}, unit={self._unit.name!r})"
+        return f"{type(self).__name__}({self._val},{self.sigfigs},{self._unit.name!r})"
+
+
+def _math_hook(func, *args):
+    """
+    Apply the sf math function func to args, one of which is an SFQuantity. sqrt
+    and pow combine units; the other functions take dimensionless values.
+    """
+    if func is math.sqrt:
+        (value,) = args
+        unit, factor = value._unit._power(0.5)
+        result = SFFloat.funcwrapper(func, _scaled(SFFloat, value, factor))
+        return SFQuantity._from_quantity(result._val, result._lsd, unit)
+    if func is math.pow and isinstance(args[0], SFQuantity):
+        value, power = args[0], _plain(args[1])
+        unit, factor = value._unit._power(float(power))
+        result = SFFloat.funcwrapper2(func, _scaled(SFFloat, value, factor), power)
+        return SFQuantity._from_quantity(result._val, result._lsd, unit)
+    if func is math.atan2 and isinstance(args[0], SFQuantity):
+        return SFFloat.funcwrapper2(
+            func, _magnitude(args[0]), args[0]._converted(args[1])
+        )
+    if func is math.atan2 and isinstance(args[1], SFQuantity):
+        return SFFloat.funcwrapper2(
+            func, args[1]._converted(args[0]), _magnitude(args[1])
+        )
+    args = [_plain(arg) for arg in args]
+    if len(args) == 1:
+        return SFFloat.funcwrapper(func, *args)
+    return SFFloat.funcwrapper2(func, *args)
+
+
+_MATH_HOOKS[SFQuantity] = _math_hook
+sfreduce._UNSUPPORTED.add(SFQuantity)
+sfstore._UNSUPPORTED.add(SFQuantity)
+
+
+class SFQuantityArray(SFArray):
+    """
+    The sfunits :class:`SFQuantityArray` class is an :class:`SFArray` of values in
+    one unit, e.g. a column of measurements. Arithmetic converts and combines units
+    as :class:`SFQuantity` does, with whole-array operations. Indexing returns
+    :class:`SFQuantity` objects.
+
+    :Required Arguments:
+        * **values** [iterable] The numeric values of the new instance. Elements
+            may be float, int, :class:`SFFloat` or :class:`SFQuantity`, which is
+            converted to unit. An :class:`SFArray` or NumPy array may also be used.
+
+    :Optional Arguments:
+        * **sigfigs** [int or iterable of int] The number of significant digits of
+            the values, as for :class:`SFArray`.
+        * **unit** [str or Unit] The unit of the values. By default the unit of the
+            first SFQuantity element, else dimensionless.
+
+    :Optional Keyword Arguments:
+        * **lsd** [int or iterable of int] The place of the least significant digit
+            of the values, as for :class:`SFArray`."""
+
+    def __init__(self, values, sigfigs=None, unit=None, lsd=None):
+        _require_numpy()
+        if isinstance(values, SFQuantityArray):
+            values = values if unit is None else values.to(unit)
+            unit = values._unit
+        elif not isinstance(values, (SFArray, np.ndarray)):
+            values = list(values)
+            if unit is None:
+                unit = next(
+                    (v._unit for v in values if isinstance(v, SFQuantity)), None
+                )
+            if unit is not None:
+                values = [
+                    v.to(unit) if isinstance(v, SFQuantity) else v for v in values
+                ]
+        super().__init__(values, sigfigs, lsd=lsd)
+        self._unit = Unit.parse(unit or "")
+
+    @classmethod
+    def _with_unit(cls, result, unit):
+        """
+        Return result, an instance made by SFArray arithmetic, with unit.
+        """
+        result._unit = unit
+        return result
+
+    @property
+    def unit(self):
+        """
+        Return the :class:`Unit` of the values.
+        """
+        return self._unit
+
+    def to(self, unit):
+        """
+        Return the values converted to unit, keeping their sigfigs.
+        """
+        unit = Unit.parse(unit)
+        if unit is self._unit:
+            return self
+        return self._with_unit(self._scaled(self._unit.factor_to(unit)), unit)
+
+    def _scaled(self, factor):
+        """
+        Return the values multiplied by factor, keeping their sigfigs.
+        """
+        vals = self._val * factor
+        return self._from_arrays(vals, self._lsd_from_sigfigs(vals, self.sigfigs))
+
+    def copy(self):
+        """
+        Return a new instance of SFQuantityArray that is a copy.
+        """
+        return self._with_unit(super().copy(), self._unit)
+
+    def _item(self, index):
+        """
+        Return the element at index as an SFQuantity.
+        """
+        lsd = int(self._lsd[index])
+        lsd = None if lsd == self.LSD_INF else lsd
+        return SFQuantity._from_quantity(float(self._val[index]), lsd, self._unit)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self._item(index)
+        return self._with_unit(super().__getitem__(index), self._unit)
+
+    def __str__(self):
+        text = "[" + ", ".join(SFFloat.__str__(item) for item in self) + "]"
+        return f"{text} {self._unit.name}" if self._unit.name else text
+
+    def _converted(self, other):
+        """
+        Return other, quantities or dimensionless values, converted to the unit of
+        self.
+        """
+        if isinstance(other, (SFQuantityArray, SFQuantity)):
+            return other.to(self._unit)
+        if not self._unit.dimensionless:
+            raise DimensionError(
+                f"Can not combine {self._unit} with dimensionless values."
+            )
+        if self._unit.scale == 1.0:
+            return other
+        if isinstance(other, (SFFloat, float, int)):
+            return SFQuantity(other).to(self._unit)
+        return SFQuantityArray(other).to(self._unit)
+
+    def _unit_with(self, other, sign, reflected=False):
+        """
+        Return the unit of self times other raised to sign, or of other times self
+        raised to sign if reflected.
+        """
+        if isinstance(other, (SFQuantityArray, SFQuantity)):
+            other_unit = other._unit
+        else:
+            other_unit = DIMENSIONLESS
+        if reflected:
+            return other_unit._combine(self._unit, sign)
+        return self._unit._combine(other_unit, sign)
+
+    def _additive(self, func, other, reflected=False):
+        """
+        Return func(self, other), or func(other, self) if reflected, after
+        converting other to the unit of self.
+        """
+        other = self._converted(other)
+        args = (other, self) if reflected else (self, other)
+        return self._with_unit(self._additive_func(func, *args), self._unit)
+
+    def __add__(self, other):
+        return self._additive(np.add, other)
+
+    def __radd__(self, other):
+        return self._additive(np.add, other, reflected=True)
+
+    def __sub__(self, other):
+        return self._additive(np.subtract, other)
+
+    def __rsub__(self, other):
+        return self._additive(np.subtract, other, reflected=True)
+
+    def __mul__(self, other):
+        unit = self._unit_with(other, 1)
+        return self._with_unit(super().__mul__(other), unit)
+
+    def __rmul__(self, other):
+        unit = self._unit_with(other, 1, reflected=True)
+        return self._with_unit(super().__rmul__(other), unit)
+
+    def __truediv__(self, other):
+        unit = self._unit_with(other, -1)
+        return self._with_unit(super().__truediv__(other), unit)
+
+    def __rtruediv__(self, other):
+        unit = self._unit_with(other, -1, reflected=True)
+        return self._with_unit(super().__rtruediv__(other), unit)
+
+    def __pow__(self, other):
+        other = _plain(other)
+        if isinstance(other, (SFFloat, float, int)):
+            unit, factor = self._unit._power(float(other))
+            base = self if factor == 1.0 else self._scaled(factor)
+        elif self._unit.dimensionless:
+            unit, base = DIMENSIONLESS, self._plain()
+        else:
+            raise DimensionError(f"Can not raise {self._unit} to an array of powers.")
+        return self._with_unit(self._multiplicative_func(np.power, base, other), unit)
+
+    def __rpow__(self, other):
+        result = self._multiplicative_func(np.power, _plain(other), self._plain())
+        return self._with_unit(result, DIMENSIONLESS)
+
+    def __neg__(self):
+        return self._with_unit(super().__neg__(), self._unit)
+
+    def __abs__(self):
+        return self._with_unit(super().__abs__(), self._unit)
+
+    def _plain(self):
+        """
+        Return dimensionless values as an SFArray with scale 1.
+        """
+        if not self._unit.dimensionless:
+            raise DimensionError(f"Expected dimensionless values, not {self._unit}.")
+        array = self if self._unit.scale == 1.0 else self._scaled(self._unit.scale)
+        return SFArray._from_arrays(array._val, array._lsd)
+
+
+def _strip(value):
+    """
+    Return an SFQuantityArray as an SFArray, or an SFQuantity as an SFFloat, in
+    its unit.
+    """
+    if isinstance(value, SFQuantityArray):
+        return SFArray._from_arrays(value._val, value._lsd)
+    if isinstance(value, SFQuantity):
+        return _magnitude(value)
+    return value
+
+
+def _batch_hook(func, *args, ufunc):
+    """
+    Apply the sfmath function func, whose NumPy form is ufunc, to args, one of
+    which is an SFQuantityArray. sqrt and pow combine units, atan2 takes values of
+    the same dimension and the other functions take dimensionless values.
+    """
+    if func is math.sqrt:
+        (values,) = args
+        unit, factor = values._unit._power(0.5)
+        result = sfmath.sqrt(_strip(values._scaled(factor)))
+        result = SFQuantityArray._from_arrays(result._val, result._lsd)
+        return SFQuantityArray._with_unit(result, unit)
+    if func is math.pow and isinstance(args[0], SFQuantityArray):
+        return args[0] ** args[1]
+    if func is math.atan2:
+        first = next(a for a in args if isinstance(a, SFQuantityArray))
+        args = [_strip(a if a is first else first._converted(a)) for a in args]
+    else:
+        args = [
+            a._plain() if isinstance(a, SFQuantityArray) else _plain(a) for a in args
+        ]
+    if len(args) == 1:
+        return sfmath._map1(func, ufunc.__name__, *args)
+    return sfmath._map2(func, ufunc.__name__, *args)
+
+
+sfmath._BATCH_HOOKS[SFQuantityArray] = _batch_hook
+sfreduce._UNSUPPORTED.add(SFQuantityArray)
+sfstore._UNSUPPORTED.add(SFQuantityArray)
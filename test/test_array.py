@@ -0,0 +1,103 @@
+from math import *
+import unittest
+from sffloat import SFFloat, SFArray
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestArrayMethods(unittest.TestCase):
+    def setUp(self):
+        self.xs = [SFFloat(123456, 3), SFFloat(0.123456, 2), SFFloat(pi, 4),
+                   SFFloat(-2, 4), SFFloat(2E-10, 4), SFFloat(1.234), 5.0]
+        self.ys = [SFFloat(654321, 2), SFFloat(0.00123, 3), 12.3456789,
+                   SFFloat(2, 3), SFFloat(pi, 2), SFFloat(2.5), SFFloat(7.1, 2)]
+
+    def assertMatches(self, array, expected):
+        self.assertEqual(len(array), len(expected))
+        for a, e in zip(array, expected):
+            e = SFFloat(e)
+            self.assertEqual(a.value, e.value)
+            self.assertEqual(a.sigfigs, e.sigfigs)
+            self.assertEqual(str(a), str(e))
+
+    def test_create(self):
+        a = SFArray([1.234, 5.678], 2)
+        self.assertEqual(str(a), '[1.2, 5.7]')
+        self.assertEqual(list(a.sigfigs), [2, 2])
+        b = SFArray([1.234, 56.78], lsd=-1)
+        self.assertEqual(str(b), '[1.2, 56.8]')
+        c = SFArray([1.5, 2.5])
+        self.assertEqual(list(c.sigfigs), [inf, inf])
+        self.assertEqual(repr(SFArray(self.xs[:2])),
+                         'SFArray([SFFloat(123456.0,3), SFFloat(0.123456,2)])')
+        d = SFArray(np.array([1.0, 2.0]), [1, inf])
+        self.assertEqual(d[0], SFFloat(1.0, 1))
+        self.assertEqual(d[1], SFFloat(2.0))
+
+    def test_items(self):
+        a = SFArray(self.xs)
+        self.assertEqual(a.tolist(), self.xs)
+        self.assertEqual(a[2], SFFloat(pi, 4))
+        self.assertEqual(a[1:3].tolist(), self.xs[1:3])
+
+    def test_arithmetic(self):
+        a = SFArray(self.xs)
+        b = SFArray(self.ys)
+        self.assertMatches(a + b, [x + y for x, y in zip(self.xs, self.ys)])
+        self.assertMatches(a - b, [x - y for x, y in zip(self.xs, self.ys)])
+        self.assertMatches(a * b, [x * y for x, y in zip(self.xs, self.ys)])
+        self.assertMatches(a / b, [x / y for x, y in zip(self.xs, self.ys)])
+        # NumPy power may differ from float power in the last bit
+        for p, y in zip(abs(b) ** a[1], self.ys):
+            e = abs(y) ** self.xs[1]
+            self.assertAlmostEqual(p.value, e.value, places=14)
+            self.assertEqual(str(p), str(e))
+
+    def test_power_errors(self):
+        # the same exceptions as the SFFloat powers
+        cases = [
+            (SFArray([4.0, -8.0], 3), SFFloat(0.5, 2), SFFloat(-8.0, 3), TypeError),
+            (SFArray([10.0, 2.0], 3), 400, SFFloat(10.0, 3), OverflowError),
+            (SFArray([1.0, 0.0], 3), -1, SFFloat(0.0, 3), ZeroDivisionError),
+        ]
+        for array, exponent, scalar, error in cases:
+            with self.assertRaises(error):
+                scalar ** exponent
+            with self.assertRaises(error):
+                array ** exponent
+        with self.assertRaises(OverflowError):
+            2.0 ** SFArray([1.0, 2000.0], 4)
+        self.assertMatches(
+            SFArray([-2.0, 0.0], 3) ** 2, [SFFloat(-2.0, 3) ** 2, SFFloat(0.0, 3) ** 2]
+        )
+
+    def test_mixed(self):
+        a = SFArray(self.xs)
+        c = SFFloat(2.5, 2)
+        self.assertMatches(a + 1.5, [x + 1.5 for x in self.xs])
+        self.assertMatches(1.5 - a, [1.5 - x for x in self.xs])
+        self.assertMatches(a * c, [x * c for x in self.xs])
+        self.assertMatches(c / a, [c / x for x in self.xs])
+        self.assertMatches(2 ** a[1:3], [2 ** x for x in self.xs[1:3]])
+        self.assertMatches(np.full(len(a), 3.0) * a, [3.0 * x for x in self.xs])
+        self.assertMatches(-a, [-x for x in self.xs])
+        self.assertMatches(abs(a), [abs(x) for x in self.xs])
+
+    def test_except(self):
+        self.assertRaises(ValueError, lambda: SFArray([1.0], 1, lsd=-1))
+        self.assertRaises(ValueError, lambda: SFArray([1.0], 1.5))
+        self.assertRaises(ValueError, lambda: SFArray([[1.0]]))
+        self.assertRaises(ValueError, lambda: SFArray([1.0], 40000))
+        self.assertRaises(ValueError, lambda: SFArray([1e-300], 32470))
+        self.assertRaises(ValueError, lambda: SFArray([1.0], lsd=-32768))
+        self.assertRaises(ValueError, lambda: SFArray([SFFloat(1.0, lsd=-40000)]))
+        self.assertEqual(SFArray([1e-300], 32468).lsd.tolist(), [-32767])
+        a = SFArray([1.23456, 2.0], 3)
+        b = SFArray([1.23567, 1.0], 3)
+        self.assertEqual(str(a - b), '[0, 1.00]')
+        self.assertRaises(ValueError, lambda: 3 * (a - b))
+        self.assertRaises(ZeroDivisionError, lambda: a / SFArray([1.0, 0.0]))
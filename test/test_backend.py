@@ -0,0 +1,98 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from sffloat import SFFloat
+from sffloat import sffloat as sfmodule
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Print the outcome of many random operations, one JSON line per backend run.
+PARITY_CODE = """
+import json, operator, random
+from sffloat import SFFloat
+
+def outcome(func, *args):
+    try:
+        result = func(*args)
+    except Exception as exc:  # compare the errors too
+        return [type(exc).__name__, str(exc)]
+    if isinstance(result, SFFloat):
+        return [repr(result), str(result), result.lsd, hash(result)]
+    return repr(result)
+
+rng = random.Random(2024)
+operators = [operator.add, operator.sub, operator.mul, operator.truediv, operator.pow,
+             operator.lt, operator.gt, operator.le, operator.ge, operator.eq, operator.ne]
+
+def operand():
+    value = rng.choice([0.0, 0, 1, -2, 3.5, rng.uniform(-1e3, 1e3), rng.uniform(-1, 1) * 1e-5])
+    kind = rng.randrange(4)
+    if kind == 0:
+        return value
+    if kind == 1:
+        return SFFloat(value)
+    if kind == 2:
+        return SFFloat(value, rng.randrange(-1, 6))
+    return SFFloat(value, lsd=rng.randrange(-6, 3))
+
+results = []
+for _ in range(3000):
+    a, b = operand(), operand()
+    if not isinstance(a, SFFloat) and not isinstance(b, SFFloat):
+        a = SFFloat(a, 3)
+    func = rng.choice(operators)
+    results.append(outcome(func, a, b))
+    results.append(outcome(operator.neg, a))
+    results.append(outcome(abs, b))
+for args, kwargs in [(("1.5", 2), {}), ((2, 2.0), {}), ((2, float("inf")), {}),
+                     ((2,), {"sigfigs": 3}), ((2, 3), {"lsd": -1}), ((True, 2), {}),
+                     ((10**400, 2), {}), ((1e300 * 10, 2), {}), ((0, 0), {})]:
+    results.append(outcome(lambda: SFFloat(*args, **kwargs)))
+print(json.dumps(results))
+"""
+
+
+def run_parity(pure_python):
+    env = dict(os.environ)
+    env.pop("SFFLOAT_PURE_PYTHON", None)
+    if pure_python:
+        env["SFFLOAT_PURE_PYTHON"] = "1"
+    result = subprocess.run([sys.executable, "-c", PARITY_CODE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+@unittest.skipIf(sfmodule.BACKEND != "c", "the C extension is not built")
+class TestBackend(unittest.TestCase):
+    def test_select(self):
+        code = "from sffloat import sffloat; print(sffloat.BACKEND)"
+        env = dict(os.environ, SFFLOAT_PURE_PYTHON="1")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "python")
+
+    def test_parity(self):
+        self.assertEqual(run_parity(False), run_parity(True))
+
+    def test_subclass(self):
+        class Sub(SFFloat):
+            __slots__ = ()
+
+        value = Sub(1.25, 3) * 2
+        self.assertIs(type(value), Sub)
+        self.assertEqual(str(value), "2.50")
+        self.assertIs(Sub(value), value)
+
+    def test_attributes(self):
+        value = SFFloat(1.25, lsd=-2)
+        self.assertIsNone(value._sf)
+        self.assertEqual(value.sigfigs, 3)
+        self.assertEqual(value._sf, 3)
+        self.assertEqual(SFFloat._from_parts(2.5, None).sigfigs, SFFloat.inf)
+        self.assertEqual(SFFloat._parts_of(2), (2.0, None, SFFloat.inf))
+        self.assertEqual(SFFloat._msd_from_val(1234), 3)
+        with self.assertRaises(AttributeError):
+            value.other = 1
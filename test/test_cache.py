@@ -0,0 +1,66 @@
+import threading
+import unittest
+from sffloat import SFFloat, sfcache
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        sfcache.resize(sfcache.DEFAULT_MAXSIZE)
+
+    def tearDown(self):
+        sfcache.disable()
+        sfcache.resize(sfcache.DEFAULT_MAXSIZE)
+
+    def test_strings(self):
+        values = [SFFloat(1.2345, 3), SFFloat(-12345.678, 2), SFFloat(0.0, 3),
+                  SFFloat(-0.0, 2), SFFloat(float("nan")), SFFloat(2.5),
+                  SFFloat(0.00012, lsd=-6)]
+        specs = ["", ".3f", "10.2e", "g"]
+        expected = [[str(v)] + [format(v, s) for s in specs] for v in values]
+        sfcache.enable()
+        self.assertTrue(sfcache.enabled())
+        for _ in range(2):
+            self.assertEqual([[str(v)] + [format(v, s) for s in specs] for v in values],
+                             expected)
+        sfcache.disable()
+        self.assertFalse(sfcache.enabled())
+        self.assertEqual([[str(v)] + [format(v, s) for s in specs] for v in values],
+                         expected)
+
+    def test_stats(self):
+        sfcache.enable()
+        a, b = SFFloat(1.2345, 3), SFFloat(1.2345, 2)
+        str(a), str(a), str(b), format(a, ".2f"), f"{a:.2f}"
+        info = sfcache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 3, 3))
+        sfcache.clear()
+        self.assertEqual(sfcache.info().currsize, 0)
+
+    def test_resize(self):
+        sfcache.enable(maxsize=2)
+        values = [SFFloat(1.5 + i, 3) for i in range(3)]
+        for value in values:
+            str(value)
+        self.assertEqual(sfcache.info().currsize, 2)
+        str(values[0])  # evicted, least recently used
+        str(values[2])
+        self.assertEqual((sfcache.info().hits, sfcache.info().misses), (1, 4))
+        self.assertEqual(sfcache.info().maxsize, 2)
+        self.assertRaises(ValueError, sfcache.resize, -1)
+
+    def test_threads(self):
+        sfcache.enable(maxsize=16)
+        values = [SFFloat(1.5 + i / 7, 4) for i in range(64)]
+        expected = [format(v, ".3e") for v in values]
+        results = []
+
+        def render():
+            results.append([format(v, ".3e") for v in values])
+
+        threads = [threading.Thread(target=render) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [expected] * 8)
+        self.assertLessEqual(sfcache.info().currsize, 16)
@@ -1,4 +1,5 @@
 from math import *
+import pickle
 import unittest
 from sffloat import SFFloat
 
@@ -33,6 +34,49 @@ class TestClassMethods(unittest.TestCase):
         self.assertTrue(a.equivalent_to_float(c))
         self.assertTrue(a.equivalent_to_float(d))
         
+    def test_hash(self):
+        # hash agrees with ==
+        a = SFFloat(pi, 4)
+        self.assertEqual(hash(a), hash(SFFloat(pi, lsd=-3)))
+        self.assertEqual(hash(SFFloat(2.5)), hash(2.5))
+        self.assertEqual(hash(SFFloat(0.0, 2)), hash(SFFloat(-0.0, 2)))
+        self.assertEqual(len({a, SFFloat(pi, 4), SFFloat(pi, 3), SFFloat(pi)}), 3)
+        self.assertEqual({SFFloat(2.5): 'x'}[2.5], 'x')
+        self.assertNotIn(SFFloat(2.5, 2), {2.5})
+        # keys that are not numbers compare unequal instead of raising
+        self.assertFalse(a == None)
+        self.assertTrue(a != "a")
+        self.assertNotIn(a, [None, "a", [1]])
+
+        class Colliding:
+            def __hash__(self):
+                return hash(a)
+
+        keys = {Colliding(): 1, None: 2, "a": 3}
+        self.assertNotIn(a, keys)
+        keys[a] = 4
+        self.assertEqual(keys[a], 4)
+
+    def test_display_key(self):
+        # display keys are equal exactly when the strings are equal
+        self.assertEqual(SFFloat(pi, 3).display_key(), SFFloat(3.142, 3).display_key())
+        self.assertEqual(SFFloat(123, 2).display_key(), SFFloat(120, 3).display_key())
+        self.assertEqual(SFFloat(1.5).display_key(), SFFloat(1.5, 2).display_key())
+        self.assertEqual(SFFloat(0.0, 1).display_key(), SFFloat(1.23456, lsd=1).display_key())
+        values = [SFFloat(pi), SFFloat(-0.0), SFFloat(0.0), SFFloat(0.0, 1), SFFloat(1e20),
+                  SFFloat(999.96, 4), SFFloat(1000.01, 4), SFFloat(1000.01, 5),
+                  SFFloat(float('inf')), SFFloat(float('-inf')), SFFloat(float('nan')),
+                  SFFloat(float('nan'))]
+        for e in range(-5, 6):
+            for sigfigs in range(1, 5):
+                for m in (0.99951, 1.0, 1.2, 1.25, 9.5, 9.96):
+                    values.append(SFFloat(m * 10 ** e, sigfigs))
+                    values.append(SFFloat(m * 10 ** e, lsd=e - sigfigs))
+        shown = [(str(v), v.display_key()) for v in values]
+        for text_a, key_a in shown:
+            for text_b, key_b in shown:
+                self.assertEqual(text_a == text_b, key_a == key_b, (text_a, text_b))
+
     def test_sigfigs(self):
         # sigfigs property
         a = SFFloat(pi, 4)
@@ -40,6 +84,18 @@ class TestClassMethods(unittest.TestCase):
         b = SFFloat(pi)
         self.assertEqual(b.sigfigs, float('inf'))
         
+    def test_slots(self):
+        # compact instances with cached sigfigs
+        a = SFFloat(pi, lsd=-3)
+        self.assertFalse(hasattr(a, '__dict__'))
+        self.assertEqual(a.sigfigs, 4)
+        self.assertEqual(a.sigfigs, 4)
+        self.assertEqual((-a).sigfigs, 4)
+        self.assertEqual(abs(-a).sigfigs, 4)
+        b = pickle.loads(pickle.dumps(a, 0))
+        self.assertEqual(b, a)
+        self.assertEqual(b.lsd, -3)
+
     def test_value(self):
         # value property
         a = SFFloat(pi, 4)
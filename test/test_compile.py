@@ -0,0 +1,102 @@
+from math import pi, e
+import random
+import unittest
+import sffloat
+from sffloat import SFFloat, SFArray, sfsin, sfsqrt, sfatan2, sfexp, sfpow, sflog, sfhypot
+from sffloat.sfcompile import SFKernel
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FORMULAS = [
+    ("pi * r ** 2", lambda r, s: pi * r ** 2),
+    ("4 / 3 * pi * r ** 3 + sin(r)", lambda r, s: 4 / 3 * pi * r ** 3 + sfsin(r)),
+    ("(r * s + 1) / (r * s + 1) - sqrt(abs(-r))",
+     lambda r, s: (r * s + 1) / (r * s + 1) - sfsqrt(abs(-r))),
+    ("atan2(r, s) + e ** sfexp(-s) - 2.5", lambda r, s: sfatan2(r, s) + e ** sfexp(-s) - 2.5),
+    ("pow(r, 2) * +s - s / 7", lambda r, s: sfpow(r, 2) * +s - s / 7),
+    ("log(r) * hypot(r, s) + sin(1)", lambda r, s: sflog(r) * sfhypot(r, s) + sfsin(1.0)),
+]
+
+
+class TestCompile(unittest.TestCase):
+    def test_parity(self):
+        rng = random.Random(10)
+        for formula, eager in FORMULAS:
+            kernel = sffloat.compile(formula, vars=["r", "s"])
+            for _ in range(200):
+                r = SFFloat(rng.uniform(0.01, 100), rng.randint(1, 6))
+                s = SFFloat(rng.uniform(0.01, 100), lsd=rng.randint(-4, 1))
+                for args in [(r, s), (r, 2.5), (1.5, s), (r, SFFloat(2.5))]:
+                    try:
+                        expected = eager(*args)
+                    except ValueError:
+                        self.assertRaises(ValueError, kernel, *args)
+                        continue
+                    result = kernel(*args)
+                    self.assertIs(type(result), type(expected))
+                    self.assertEqual(result.value if isinstance(result, SFFloat) else result,
+                                     float(expected))
+                    if not isinstance(result, SFFloat):
+                        continue
+                    self.assertEqual((str(result), result.lsd, result.sigfigs),
+                                     (str(expected), expected.lsd, expected.sigfigs))
+
+    def test_float(self):
+        kernel = sffloat.compile("pi * r ** 2 + sin(r)", vars=["r"])
+        self.assertIs(type(kernel(3.4)), float)
+        self.assertEqual(kernel(3.4), pi * 3.4 ** 2 + sfsin(3.4))
+        self.assertEqual(sffloat.compile("4 / 3 * pi")(), 4 / 3 * pi)
+        self.assertIs(type(sffloat.compile("x * 2")(3)), float)
+
+    def test_call(self):
+        kernel = sffloat.compile("x - y")
+        self.assertIsInstance(kernel, SFKernel)
+        self.assertEqual(kernel.variables, ["x", "y"])
+        x, y = SFFloat(3.45, 3), SFFloat(1.2, 2)
+        self.assertEqual(kernel(x, y), x - y)
+        self.assertEqual(kernel(y=y, x=x), x - y)
+        self.assertEqual(kernel(x, y=y), x - y)
+        self.assertRaises(TypeError, kernel, x)
+        self.assertRaises(TypeError, kernel, x, y, x)
+        self.assertRaises(TypeError, kernel, x, y, z=x)
+
+    def test_errors(self):
+        self.assertRaises(NameError, sffloat.compile, "x + z", vars=["x"])
+        self.assertRaises(NameError, sffloat.compile, "print(x)", vars=["x"])
+        self.assertRaises(ValueError, sffloat.compile, "x.real", vars=["x"])
+        self.assertRaises(ValueError, sffloat.compile, "x < 1", vars=["x"])
+        self.assertRaises(ValueError, sffloat.compile, "x", vars=["x y"])
+        self.assertRaises(TypeError, sffloat.compile, "sin(x, x)", vars=["x"])
+        self.assertRaises(SyntaxError, sffloat.compile, "x +", vars=["x"])
+        kernel = sffloat.compile("x * y", vars=["x", "y"])
+        self.assertRaises(ValueError, kernel, SFFloat(0.01, lsd=0), SFFloat(2.0, 2))
+        self.assertRaises(ZeroDivisionError, sffloat.compile("x / 0"), SFFloat(1.0, 2))
+
+    def test_star_import(self):
+        namespace = {}
+        exec("from sffloat import *", namespace)
+        self.assertNotIn("compile", namespace)
+        self.assertIn("SFArray", namespace)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_array(self):
+        kernel = sffloat.compile("4 / 3 * pi * r ** 3 + sin(r) * s", vars=["r", "s"])
+        radii = [SFFloat(3.4, 2), SFFloat(12.5, 4), SFFloat(0.25, 3)]
+        s = SFFloat(1.5, 3)
+        result = kernel(SFArray(radii), s)
+        self.assertIsInstance(result, SFArray)
+        self.assertEqual([str(v) for v in result], [str(kernel(r, s)) for r in radii])
+        self.assertEqual([str(v) for v in kernel(radii, s)], [str(v) for v in result])
+        values = np.array([3.4, 12.5])
+        self.assertTrue(np.allclose(kernel(values, 1.5), [kernel(v, 1.5) for v in values]))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_array_constant_call(self):
+        values = [SFFloat(2.0, 3), SFFloat(0.5, 2)]
+        for formula in ["x * sin(pi/6)", "atan(3.5) * x", "x + sqrt(abs(sin(3.5)) + 1)"]:
+            kernel = sffloat.compile(formula, vars=["x"])
+            self.assertEqual([str(v) for v in kernel(values)],
+                             [str(kernel(v)) for v in values])
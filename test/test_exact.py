@@ -0,0 +1,82 @@
+import copy
+import pickle
+import random
+import unittest
+from decimal import Decimal
+from sffloat import *
+
+
+class TestExactMethods(unittest.TestCase):
+    def test_msd(self):
+        # log10 rounds these up to the next power of ten
+        for val in [999.9999999999999, 9.999999999999999e-05, 9.999999999999998e+23]:
+            self.assertEqual(SFExact(val, 3).lsd, SFFloat(val, 3).lsd - 1)
+        self.assertEqual(SFExact(999.9999999999999, lsd=-1).sigfigs, 4)
+        self.assertEqual(str(SFExact(999.9999999999999, 3)), '1000')
+
+    def test_create(self):
+        self.assertEqual(SFExact("0.100", 3).decimal_parts, (1, -1))
+        self.assertEqual(SFExact(Decimal("-1.500"), lsd=-3).decimal_parts, (-15, -1))
+        self.assertEqual(SFExact(0.1).decimal_parts, (1, -1))
+        self.assertEqual(SFExact(SFFloat(1.25, lsd=-2)).lsd, -2)
+        value = SFExact(1.25, 3)
+        self.assertIs(SFExact(value), value)
+        with self.assertRaises(ValueError):
+            SFExact("1.2.3")
+        with self.assertRaises(ValueError):
+            SFExact(float("inf"))
+        with self.assertRaises(ValueError):
+            SFExact(1.25, 3, lsd=-2)
+
+    def test_arithmetic(self):
+        a, b = SFExact("0.1", 3), SFExact("0.2", 3)
+        self.assertEqual(repr(a + b), "SFExact('0.3',3)")
+        self.assertEqual(str(SFExact(0.1) + 0.2), '0.3')
+        self.assertEqual(str(0.3 - SFExact(0.1)), '0.2')
+        self.assertEqual(repr(SFExact(2.5, 2) * SFFloat(3.4, 2)), "SFExact('8.5',2)")
+        self.assertEqual(repr(SFFloat(3.4, 2) * SFExact(2.5, 2)), "SFExact('8.5',2)")
+        self.assertEqual(str(SFExact(3, 4) / 7), '0.4286')
+        self.assertEqual(repr(SFExact(2, 3) ** 10), "SFExact('1024',3)")
+        self.assertEqual(repr(SFExact(2, 3) ** -2), "SFExact('0.25',3)")
+        self.assertEqual(repr(2 ** SFExact(3, 2)), "SFExact('8',2)")
+        self.assertEqual(str(SFExact(2, 3) ** 0.5), '1.41')
+        self.assertEqual(repr(-abs(SFExact(-1.5, 2))), "SFExact('-1.5',2)")
+        with self.assertRaises(ValueError):
+            SFExact(1.0, lsd=0) * SFExact(0.01, lsd=0)
+        with self.assertRaises(ZeroDivisionError):
+            SFExact(1.0) / 0
+
+    def test_matches_float_mode(self):
+        rng = random.Random(11)
+        for _ in range(500):
+            a, b = rng.uniform(-100, 100), rng.uniform(-100, 100)
+            sa, sb = rng.randrange(1, 8), rng.randrange(1, 8)
+            for op in ['+', '-', '*', '/']:
+                exact = eval(f"SFExact(a, sa) {op} SFExact(b, sb)")
+                floats = eval(f"SFFloat(a, sa) {op} SFFloat(b, sb)")
+                self.assertEqual(exact.lsd, floats.lsd)
+                self.assertAlmostEqual(exact.value, floats.value,
+                                       delta=(abs(floats.value) + abs(a) + abs(b)) * 1e-13)
+
+    def test_str(self):
+        for val in [1e23, 500.0, 0.001, 1.5e-7, -2.5e16, 0.0, 123.456]:
+            self.assertEqual(str(SFExact(val)), str(val))
+            self.assertEqual(SFExact(val).display_key(), SFFloat(val).display_key())
+        for val, sigfigs in [(-12345.678, 3), (0.0011, 2), (2.345, 3), (0.0005, 1)]:
+            self.assertEqual(str(SFExact(val, sigfigs)), str(SFFloat(val, sigfigs)))
+            self.assertEqual(SFExact(val, sigfigs).display_key(),
+                             SFFloat(val, sigfigs).display_key())
+        self.assertEqual(str(SFExact("1.00000000000000000001")), '1.00000000000000000001')
+        self.assertEqual(f"{SFExact(2.345, 3):.4f}", '2.3500')
+        self.assertEqual(str(SFExact(0.001, lsd=0)), '0')
+
+    def test_compare(self):
+        self.assertEqual(SFExact(1.25, 3), SFFloat(1.25, 3))
+        self.assertEqual(hash(SFExact(2.5)), hash(2.5))
+        self.assertEqual(sorted([SFExact(3), SFExact(1)]), [SFExact(1), SFExact(3)])
+
+    def test_copy(self):
+        value = SFExact("1.25", 3)
+        for other in [pickle.loads(pickle.dumps(value)), copy.copy(value), value.copy()]:
+            self.assertEqual(other.decimal_parts, value.decimal_parts)
+            self.assertEqual(repr(other), repr(value))
@@ -0,0 +1,64 @@
+from math import pi
+import unittest
+from sffloat import SFFloat, SFArray, SFQuantity, SFUncertain, sfsin, sfsqrt
+from sffloat.sfexpr import SFExpr, lazy, var, apply
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestExpr(unittest.TestCase):
+    def test_deferred(self):
+        a, b, c, d = SFFloat(1.2, 2), SFFloat(3.456, 4), SFFloat(7.0, 2), SFFloat(0.5, 1)
+        expr = lazy(a) * b + c / d
+        self.assertIsInstance(expr, SFExpr)
+        self.assertEqual(expr.evaluate(), a * b + c / d)
+        expr = 2 - abs(-lazy(a)) ** 2 + (+lazy(b))
+        self.assertEqual(expr.evaluate(), 2 - abs(-a) ** 2 + b)
+
+    def test_variables(self):
+        r = var("r")
+        area = pi * r ** 2
+        self.assertEqual(area.variables, ['r'])
+        for radius in [SFFloat(3.4, 2), SFFloat(12.5, 4), 2.0]:
+            self.assertEqual(area.evaluate(r=radius), pi * radius ** 2)
+        self.assertEqual(str(area(r=SFFloat(3.4, 2))), '36')
+        self.assertRaises(NameError, lambda: area.evaluate(x=1.0))
+
+    def test_common_subexpressions(self):
+        x, y = var("x"), var("y")
+        expr = (x * y + 1) / (x * y + 1) + apply(sfsin, x * y) + apply(sfsqrt, x)
+        # x, y, x*y, 1, x*y+1, /, sin, +, sqrt, +
+        self.assertEqual(len(expr.program), 10)
+        xv, yv = SFFloat(0.5, 3), SFFloat(1.25, 2)
+        self.assertEqual(expr(x=xv, y=yv),
+                         (xv * yv + 1) / (xv * yv + 1) + sfsin(xv * yv) + sfsqrt(xv))
+        self.assertEqual(len((lazy(0.0) + lazy(-0.0)).program), 3)
+        m, s = SFQuantity(2.0, 3, unit="m"), SFQuantity(2.0, 3, unit="s")
+        self.assertEqual(repr((lazy(m) * lazy(s)).evaluate()), repr(m * s))
+        u, v = SFUncertain(1.0, 0.1), SFUncertain(1.0, 0.12)
+        self.assertEqual(repr((lazy(u) + lazy(v)).evaluate()), repr(u + v))
+
+    def test_deep(self):
+        x = var("x")
+        expr = x
+        for _ in range(5000):
+            expr = expr + SFFloat(0.01, 1)
+        self.assertEqual(str(expr(x=SFFloat(1.0, 3))), '51.00')
+        self.assertTrue(repr(expr).startswith("add(" * 5000 + "var('x'), lazy(SFFloat(0.01,1)))"))
+
+    def test_repr(self):
+        x = var("x")
+        self.assertEqual(repr(-(x * 2 + 1)), "neg(add(mul(var('x'), lazy(2)), lazy(1)))")
+        self.assertEqual(repr(apply(sfsin, x) / lazy(SFFloat(1.5, 2))),
+                         "truediv(sfsin(var('x')), lazy(SFFloat(1.5,2)))")
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_array(self):
+        r = var("r")
+        area = pi * r ** 2
+        radii = [SFFloat(3.4, 2), SFFloat(12.5, 4)]
+        self.assertEqual([str(v) for v in area(r=SFArray(radii))],
+                         [str(pi * v ** 2) for v in radii])
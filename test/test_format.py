@@ -0,0 +1,72 @@
+import random
+import unittest
+import warnings
+from sffloat import SFFloat
+from sffloat.sfformat import format_sigfigs, rounded_value
+
+try:
+    import sigfig
+except ImportError:
+    sigfig = None
+
+
+def corpus():
+    # edge cases plus a reproducible sample of magnitudes and digit patterns
+    values = [0.0, -0.0, 1.0, 9.99, 9.95, 0.00095, 0.001, 999.5, 999.96, 1000.0,
+              1e-5, 123456, 2.675, 0.5, -0.05, 5e-324, 1.7976931348623157e308,
+              1e16, 1e22, 123456789012345678.0, 0.1 + 0.2]
+    rand = random.Random(1234)
+    for _ in range(300):
+        mantissa = rand.choice([rand.random(), round(rand.random(), rand.randint(1, 5)),
+                                rand.randint(1, 999) / 100])
+        values.append(rand.choice([1, -1]) * mantissa * 10 ** rand.randint(-30, 30))
+    return values
+
+
+class TestFormat(unittest.TestCase):
+    def test_std(self):
+        self.assertEqual(format_sigfigs(123.456, 2, "std"), '120')
+        self.assertEqual(format_sigfigs(0.00123456, 3, "std"), '0.00123')
+        self.assertEqual(format_sigfigs(9.996, 3, "std"), '10.0')
+        self.assertEqual(format_sigfigs(2.675, 3, "std"), '2.68')
+        self.assertEqual(format_sigfigs(-1.0, 4, "std"), '-1.000')
+        self.assertEqual(format_sigfigs(0.0, 3, "std"), '0.00')
+        self.assertEqual(format_sigfigs(-0.0, 1, "std"), '0')
+
+    def test_sci(self):
+        self.assertEqual(format_sigfigs(123456, 3, "sci"), '1.23E5')
+        self.assertEqual(format_sigfigs(-6.366e-11, 1, "sci"), '-6E-11')
+        self.assertEqual(format_sigfigs(9.99e5, 2, "sci"), '1.0E6')
+        self.assertEqual(format_sigfigs(1e16, 2, "sci"), '1.0E16')
+
+    def test_auto(self):
+        self.assertEqual(format_sigfigs(999.4, 2), '1000')
+        self.assertEqual(format_sigfigs(1000.0, 2), '1.0E3')
+        self.assertEqual(format_sigfigs(0.001, 2), '1.0E-3')
+        self.assertRaises(ValueError, lambda: format_sigfigs(1.0, 2, "eng"))
+
+    def test_rounded_value(self):
+        for val in corpus():
+            for sigfigs in (1, 3, 8):
+                text = format_sigfigs(val, sigfigs)
+                self.assertEqual(rounded_value(val, sigfigs), float(text))
+
+    def test_sffloat(self):
+        a = SFFloat(1234.5678, 6)
+        self.assertEqual(str(a), '1.23457E3')
+        self.assertEqual(f"{a:.1f}", '1234.6')
+        self.assertEqual(f"{SFFloat(1.25, lsd=2):.1f}", '0.0')
+        self.assertEqual(f"{SFFloat(1.25):.2f}", '1.25')
+
+    @unittest.skipIf(sigfig is None, "sigfig is not installed")
+    def test_sigfig_parity(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for val in corpus():
+                for sigfigs in range(1, 18):
+                    for notation in ("std", "sci"):
+                        self.assertEqual(
+                            format_sigfigs(val, sigfigs, notation),
+                            sigfig.round(val, sigfigs, notation=notation),
+                            (val, sigfigs, notation),
+                        )
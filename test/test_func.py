@@ -16,7 +16,7 @@ class TestFuncMethods(unittest.TestCase):
         self.assertEqual(str(sflog(SFFloat(1.234,2))), '0.21')
 
     def test_sflog10(self):
-        self.assertEqual(str(sflog10(SFFloat(1.234,2))), '0.091')
+        self.assertEqual(str(sflog10(SFFloat(1.234,2))), '0.09')
 
     def test_sftan(self):
         self.assertEqual(str(sftan(SFFloat(1.234,2))), '2.9')
@@ -48,5 +48,46 @@ class TestFuncMethods(unittest.TestCase):
     def test_sfradians(self):
         self.assertEqual(str(sfradians(SFFloat(0.1234,2))), '0.0022')
 
+    def test_sfhyperbolic(self):
+        self.assertEqual(str(sfsinh(SFFloat(1.234,2))), '1.6')
+        self.assertEqual(str(sfcosh(SFFloat(0.1234,2))), '1.0')
+        self.assertEqual(str(sftanh(SFFloat(1.234,2))), '0.84')
+        self.assertEqual(str(sfasinh(SFFloat(1.234,2))), '1.0')
+        self.assertEqual(str(sfacosh(SFFloat(1.234,2))), '0.67')
+        self.assertEqual(str(sfatanh(SFFloat(0.1234,2))), '0.12')
+        self.assertEqual(sftanh(SFFloat(551250.34, 12)).sigfigs, 12)
+        self.assertEqual(sftanh(SFFloat(-400.0, 4)).sigfigs, 4)
+
+    def test_sflog2(self):
+        self.assertEqual(str(sflog2(SFFloat(0.1234,2))), '-3.02')
+        self.assertEqual(str(sflog1p(SFFloat(1.234,2))), '0.80')
+
+    def test_sfexp2(self):
+        self.assertEqual(str(sfexp2(SFFloat(1.234,2))), '2')
+        self.assertEqual(str(sfexpm1(SFFloat(0.1234,2))), '0.13')
+
+    def test_sfcbrt(self):
+        self.assertEqual(str(sfcbrt(SFFloat(0.1234,2))), '0.50')
+
+    def test_sfhypot(self):
+        self.assertEqual(str(sfhypot(SFFloat(1.234,2), SFFloat(2.345, 3))), '2.6')
+        self.assertEqual(str(sfhypot(SFFloat(3.0,2), 4.0)), '5.0')
+
+    def test_rules(self):
+        # a logarithm keeps the sigfigs of its argument as decimal places
+        self.assertEqual(str(sflog(SFFloat(1000,4))), '6.9078')
+        self.assertEqual(str(sflog10(SFFloat(2.0e5,2))), '5.30')
+        # an exponential keeps the decimal places of its argument as sigfigs
+        self.assertEqual(str(sfexp(SFFloat(12.345,5))), '2.30E5')
+        self.assertEqual(str(sfexp(SFFloat(0.0012345,5))), '1.001235')
+        # other functions lose a digit per power of ten of their condition number
+        self.assertEqual(str(sfpow(SFFloat(2.0,2), 3)), '8.0')
+        self.assertEqual(str(sftan(SFFloat(1.5707,5))), '1E4')
+        self.assertEqual(str(sfsin(SFFloat(3.14159,6))), '3E-6')
+        self.assertEqual(str(sfsin(SFFloat(0.0,lsd=-2))), '0.00')
+        self.assertEqual(sfsin(SFFloat(0.5)).sigfigs, inf)
+        self.assertIs(type(sfsin(3)), float)
+        self.assertEqual(sfatan2(0.5, 2.0), atan2(0.5, 2.0))
+
 
 
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+HEAVY = {"numpy", "decimal", "sigfig"}
+
+
+def import_times(code):
+    """
+    Return {module: cumulative import time in us} for running code with -X importtime.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImport(unittest.TestCase):
+    def test_import_time(self):
+        times = import_times("import sffloat; str(sffloat.SFFloat(1.234, 2))")
+        self.assertIn("sffloat", times)
+        self.assertEqual(HEAVY & {name.split(".")[0] for name in times}, set())
+
+    def test_lazy_names(self):
+        times = import_times("import sffloat; sffloat.SFArray; sffloat.compile")
+        self.assertIn("sffloat.sfarray", times)
+        self.assertIn("sffloat.sfcompile", times)
+
+    def test_warnings_untouched(self):
+        code = "import warnings; before = list(warnings.filters); import sffloat; " \
+               "assert warnings.filters == before"
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
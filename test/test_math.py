@@ -0,0 +1,84 @@
+from math import inf
+import unittest
+from sffloat import *
+from sffloat import sfmath
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FUNCS1 = [(sfmath.sin, sfsin), (sfmath.cos, sfcos), (sfmath.tan, sftan),
+          (sfmath.log, sflog), (sfmath.log10, sflog10), (sfmath.asin, sfasin),
+          (sfmath.acos, sfacos), (sfmath.atan, sfatan), (sfmath.exp, sfexp),
+          (sfmath.sqrt, sfsqrt), (sfmath.degrees, sfdegrees),
+          (sfmath.radians, sfradians), (sfmath.sinh, sfsinh), (sfmath.cosh, sfcosh),
+          (sfmath.tanh, sftanh), (sfmath.asinh, sfasinh), (sfmath.atanh, sfatanh),
+          (sfmath.log2, sflog2), (sfmath.log1p, sflog1p), (sfmath.exp2, sfexp2),
+          (sfmath.expm1, sfexpm1), (sfmath.cbrt, sfcbrt)]
+FUNCS2 = [(sfmath.atan2, sfatan2), (sfmath.pow, sfpow), (sfmath.hypot, sfhypot)]
+
+
+class TestBatchMath(unittest.TestCase):
+    def setUp(self):
+        self.xs = [SFFloat(0.1234, 2), SFFloat(0.5, 3), 0.75, SFFloat(0.999, 1),
+                   SFFloat(0.25), SFFloat(0.001234, lsd=-4)]
+        self.ys = [SFFloat(2.345, 3), 1.5, SFFloat(0.5, 1), SFFloat(3.0, 2),
+                   SFFloat(0.25), 2.0]
+
+    def assertMatches(self, results, expected, exact=True):
+        self.assertEqual(len(results), len(expected))
+        for r, e in zip(results, expected):
+            self.assertIs(type(r), type(e))
+            if isinstance(e, SFFloat):
+                self.assertEqual(r.sigfigs, e.sigfigs)
+                if exact or e.sigfigs != inf:
+                    self.assertEqual(str(r), str(e))
+                r, e = r.value, e.value
+            if exact:
+                self.assertEqual(r, e)
+            else:
+                self.assertAlmostEqual(r, e, places=12)
+
+    def test_lists(self):
+        for batch, scalar in FUNCS1:
+            self.assertMatches(batch(self.xs), [scalar(x) for x in self.xs])
+            self.assertMatches(batch(iter(self.xs)), [scalar(x) for x in self.xs])
+        for batch, scalar in FUNCS2:
+            self.assertMatches(batch(self.xs, self.ys),
+                               [scalar(x, y) for x, y in zip(self.xs, self.ys)])
+            self.assertMatches(batch(self.xs, SFFloat(2, 2)),
+                               [scalar(x, SFFloat(2, 2)) for x in self.xs])
+            self.assertMatches(batch(0.5, self.ys), [scalar(0.5, y) for y in self.ys])
+        ones = [x + 1 for x in self.xs]
+        self.assertMatches(sfmath.acosh(ones), [sfacosh(x) for x in ones])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_arrays(self):
+        xs = [SFFloat(x) for x in self.xs]
+        ys = [SFFloat(y) for y in self.ys]
+        for batch, scalar in FUNCS1:
+            self.assertMatches(batch(SFArray(xs)).tolist(), [scalar(x) for x in xs],
+                               exact=False)
+            plain = [float(x) for x in xs]
+            self.assertMatches([float(r) for r in batch(np.array(plain))],
+                               [scalar(x) for x in plain], exact=False)
+        for batch, scalar in FUNCS2:
+            self.assertMatches(batch(SFArray(xs), SFArray(ys)).tolist(),
+                               [scalar(x, y) for x, y in zip(xs, ys)], exact=False)
+            self.assertMatches(batch(SFArray(xs), 2.0).tolist(),
+                               [scalar(x, SFFloat(2.0)) for x in xs], exact=False)
+        ones = [x + 1 for x in xs]
+        self.assertMatches(sfmath.acosh(SFArray(ones)).tolist(), [sfacosh(x) for x in ones],
+                           exact=False)
+        large = [SFFloat(551250.34, 12), SFFloat(-400.0, 4), SFFloat(400.5, 4)]
+        self.assertMatches(sfmath.tanh(SFArray(large)).tolist(), [sftanh(x) for x in large],
+                           exact=False)
+
+    def test_except(self):
+        self.assertRaises(ValueError, lambda: sfmath.log([SFFloat(1.0, 2), -1.0]))
+        self.assertRaises(TypeError, lambda: sfmath.pow(1.0, 2.0))
+        if np is not None:
+            self.assertRaises(ValueError, lambda: sfmath.log(SFArray([1.0, 0.0], 2)))
+            self.assertRaises(ValueError, lambda: sfmath.asin(SFArray([2.0], 2)))
+            self.assertRaises(OverflowError, lambda: sfmath.exp(SFArray([1e3], 2)))
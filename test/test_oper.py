@@ -115,6 +115,22 @@ class TestOperMethods(unittest.TestCase):
         x = [a, d, b, c]
         xs = sorted(x)
         self.assertEqual(str(xs), '[SFFloat(1.2,3), SFFloat(1.234,3), 1.234, SFFloat(1.23456,3)]')
+
+    def test_sort_key(self):
+        # sort key orders values like the < operator
+        x = [SFFloat(1.234, 3), SFFloat(1.2, 3), SFFloat(1.23456, 3), SFFloat(1.234, 2)]
+        self.assertEqual(sorted(x, key=SFFloat.sort_key), sorted(x))
+        self.assertEqual([v.sigfigs for v in sorted(x, key=SFFloat.sort_key)], [3, 3, 2, 3])
+        self.assertIs(max(x, key=SFFloat.sort_key), x[2])
+        self.assertIs(min(x, key=SFFloat.sort_key), x[1])
+
+    def test_compare_int(self):
+        # comparisons with ints and with unlimited precision values
+        a = SFFloat(2.0, 2)
+        self.assertTrue(a < 3 and a > 1 and a <= 3 and a >= 1)
+        self.assertFalse(a <= 2 or a >= 2 or a == 2)
+        self.assertTrue(SFFloat(2) <= 2 and SFFloat(2) >= 2 and SFFloat(2) == 2)
+        self.assertTrue(a <= SFFloat(2.0, 2) and a >= SFFloat(2.0, lsd=-1))
         
     def test_ltgt(self):
         # lt and gt operators
@@ -150,6 +166,22 @@ class TestOperMethods(unittest.TestCase):
         self.assertTrue(d >= b)
         self.assertFalse(b >= d)
         
+    def test_int(self):
+        # int and unlimited precision operands
+        a = SFFloat(2.5, 2)
+        self.assertEqual(repr(a*4), 'SFFloat(10.0,2)')
+        self.assertEqual(repr(4-a), 'SFFloat(1.5,2)')
+        self.assertEqual(repr(SFFloat(2)*SFFloat(3)), 'SFFloat(6.0)')
+        self.assertEqual(repr(SFFloat(2)+3), 'SFFloat(5.0)')
+
+    def test_subclass(self):
+        # results keep the operand class
+        class Sub(SFFloat):
+            pass
+        a = Sub(1.234, 3)
+        for result in [a + 1, 1 - a, a * a, 2 / a, -a, abs(a), a.copy()]:
+            self.assertIs(type(result), Sub)
+
     def test_neg(self):
         # neg operator
         a = SFFloat(1.234, 3)
@@ -0,0 +1,65 @@
+import pickle
+import unittest
+import sffloat
+from sffloat import SFFloat, SFArray, sfmath
+
+try:
+    import numpy as np
+    from sffloat import sfparallel
+except ImportError:
+    np = None
+
+
+def scale(values):
+    return values * SFFloat(2.50, 3)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestParallelMethods(unittest.TestCase):
+    def setUp(self):
+        self.xs = SFArray(np.linspace(0.1, 3, 1001), 3)
+        self.ys = SFArray(np.linspace(1, 2, 1001), lsd=-2)
+        self.kernel = sffloat.compile("x * sin(y) + x / y", vars=["x", "y"])
+
+    def assertSame(self, a, b):
+        self.assertTrue(np.array_equal(a.value, b.value))
+        self.assertTrue(np.array_equal(a.lsd, b.lsd))
+
+    def test_processes(self):
+        expected = self.kernel(self.xs, self.ys)
+        self.assertSame(sfparallel.map(self.kernel, self.xs, self.ys, workers=2), expected)
+        self.assertSame(sfparallel.map(self.kernel, self.xs, self.ys, workers=3, chunksize=7),
+                        expected)
+
+    def test_threads(self):
+        expected = self.kernel(self.xs, self.ys)
+        self.assertSame(sfparallel.map(self.kernel, self.xs, self.ys, workers=3, threads=True),
+                        expected)
+
+    def test_in_process(self):
+        self.assertSame(sfparallel.map(scale, self.xs, workers=1), scale(self.xs))
+        self.assertSame(sfparallel.map(sfmath.sin, self.xs, workers=1, chunksize=10),
+                        sfmath.sin(self.xs))
+
+    def test_functions(self):
+        self.assertSame(sfparallel.map(scale, self.xs, workers=2), scale(self.xs))
+        result = sfparallel.map(sfmath.sin, [SFFloat(0.5, 2), 1.0], workers=2)
+        self.assertEqual(str(result), '[0.48, 0.8414709848078965]')
+
+    def test_empty(self):
+        self.assertEqual(len(sfparallel.map(scale, [], workers=2)), 0)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            sfparallel.map(self.kernel, self.xs, self.ys[:10])
+        with self.assertRaises(ValueError):
+            sfparallel.map(scale, self.xs, workers=0)
+        with self.assertRaises(ValueError):
+            sfparallel.map(scale, self.xs, chunksize=0)
+        with self.assertRaises(TypeError):
+            sfparallel.map(scale)
+
+    def test_pickle_kernel(self):
+        kernel = pickle.loads(pickle.dumps(self.kernel))
+        self.assertEqual(kernel.source, self.kernel.source)
+        self.assertEqual(str(kernel(SFFloat(1.5, 2), 2.0)), str(self.kernel(SFFloat(1.5, 2), 2.0)))
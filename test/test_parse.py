@@ -0,0 +1,54 @@
+import io
+import unittest
+from sffloat import SFFloat
+from sffloat.sfparse import parse, iter_values, iter_rows, iter_batches
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestParse(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse("0.001230"), SFFloat(0.00123, 4))
+        self.assertEqual(parse("0.00123"), SFFloat(0.00123, 3))
+        self.assertEqual(parse("1200"), SFFloat(1200, 2))
+        self.assertEqual(parse("1200."), SFFloat(1200, 4))
+        self.assertEqual(parse("1.20e3"), SFFloat(1200, 3))
+        self.assertEqual(parse("-4.5E-7"), SFFloat(-4.5e-7, 2))
+        self.assertEqual(parse(" .50 "), SFFloat(0.5, 2))
+        self.assertEqual(parse("0"), SFFloat(0.0, 1))
+        self.assertEqual(parse("0.00"), SFFloat(0.0, lsd=-2))
+        self.assertEqual(parse("0.99999999999999999999"), SFFloat(1.0, lsd=-20))
+        self.assertEqual(parse("0.99999999999999999999").sigfigs, 21)
+        self.assertEqual(str(parse("0.001230")), '0.001230')
+        self.assertEqual(str(parse("1.20e3")), '1.20E3')
+
+    def test_invalid(self):
+        for text in ["", ".", "e5", "1.2.3", "abc", "nan", "1,5"]:
+            self.assertRaises(ValueError, lambda: parse(text))
+
+    def test_iter_values(self):
+        source = io.StringIO("# header\n1.0 2.50\n\n0.0030\n")
+        values = list(iter_values(source, skip=1))
+        self.assertEqual(values, [SFFloat(1, 2), SFFloat(2.5, 3), SFFloat(0.003, 2)])
+
+    def test_iter_rows(self):
+        lines = ["t,a,b", "1,2.0,3.00", "2,4.5,6e2"]
+        rows = list(iter_rows(lines, columns=[1, 2], skip=1))
+        self.assertEqual(rows, [[SFFloat(2, 2), SFFloat(3, 3)],
+                                [SFFloat(4.5, 2), SFFloat(600, 1)]])
+        rows = list(iter_rows(["1.0 2"], delimiter=None))
+        self.assertEqual(rows, [[SFFloat(1, 2), SFFloat(2, 1)]])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_iter_batches(self):
+        lines = (f"{i}.0,{i * 10}" for i in range(1, 8))
+        batches = list(iter_batches(lines, batch_size=3))
+        self.assertEqual([len(b[0]) for b in batches], [3, 3, 1])
+        self.assertEqual(batches[1][0].tolist(),
+                         [SFFloat(4, 2), SFFloat(5, 2), SFFloat(6, 2)])
+        self.assertEqual(batches[2][1].tolist(), [SFFloat(70, 1)])
+        self.assertRaises(ValueError, lambda: list(iter_batches(["1,2", "3"])))
+        self.assertRaises(ValueError, lambda: list(iter_batches(["1,2"], columns=[])))
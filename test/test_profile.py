@@ -0,0 +1,94 @@
+import importlib
+import json
+import unittest
+from sffloat import SFFloat, SFExact, SFTraced, sfsin, sfatan2, sfcache, sfprofile
+
+
+class TestProfile(unittest.TestCase):
+    def tearDown(self):
+        sfprofile.disable()
+        sfcache.disable()
+
+    def test_collect(self):
+        with sfprofile.collect() as profile:
+            self.assertTrue(sfprofile.enabled())
+            a = SFFloat(1.5, 3)
+            b = a * 2 + 1
+            str(b), f"{b:.2f}", sfsin(a), sfatan2(a, b), a < b, a == b
+        self.assertFalse(sfprofile.enabled())
+        summary = profile.summary()
+        self.assertEqual(summary["SFFloat.__init__"]["calls"], 3)  # with the math functions
+        self.assertEqual(summary["SFFloat.__mul__"]["calls"], 1)
+        self.assertGreaterEqual(summary["SFFloat._from_parts"]["calls"], 2)
+        self.assertEqual(summary["SFFloat.funcwrapper"]["calls"], 1)
+        self.assertEqual(summary["SFFloat.__str__"]["category"], "format")
+        self.assertNotIn("SFFloat.__sub__", summary)
+        self.assertEqual(profile.totals()["math"]["calls"], 2)
+        self.assertEqual(json.loads(json.dumps(summary)), summary)
+        self.assertIn("SFFloat.__add__", profile.report())
+        str(b)
+        self.assertEqual(profile.summary()["SFFloat.__str__"]["calls"], 1)
+
+    def test_restore(self):
+        before = {cls: dict(cls.__dict__) for cls in (SFFloat, SFExact, SFTraced)}
+        with sfprofile.collect():
+            self.assertNotEqual(dict(SFFloat.__dict__), before[SFFloat])
+            self.assertEqual(str(SFExact(1.25, 2) + SFFloat(1.5, 3)), '2.8')
+        self.assertEqual(
+            {cls: dict(cls.__dict__) for cls in (SFFloat, SFExact, SFTraced)}, before
+        )
+
+    def test_subclass(self):
+        with sfprofile.collect() as profile:
+            SFExact(1.25, 2) + 1
+            SFExact(1.25, 2) == 1
+        summary = profile.summary()
+        self.assertEqual(summary["SFExact.__add__"]["calls"], 1)
+        self.assertEqual(summary["SFFloat.__eq__"]["calls"], 1)
+        self.assertEqual(summary["SFExact.__new__"]["calls"], 2)
+        self.assertNotIn("SFExact.__init__", summary)
+
+    def test_construction(self):
+        with sfprofile.collect() as profile:
+            a = SFFloat(1.5, 3)
+            b = -(a * 2 + 1)
+            +b
+        summary = profile.summary()
+        self.assertEqual(summary["SFFloat.__init__"]["calls"], 1)
+        self.assertEqual(summary["SFFloat._from_parts"]["calls"], 3)
+
+    def test_override(self):
+        with sfprofile.collect() as profile:
+            SFTraced(2.0, 3) + 1
+        summary = profile.summary()
+        self.assertEqual(summary["SFTraced.__add__"]["calls"], 1)
+        self.assertEqual(summary["SFTraced.__init__"]["calls"], 1)
+        self.assertEqual(summary["SFFloat._from_parts"]["calls"], 1)
+        self.assertNotIn("SFFloat.__add__", summary)
+        self.assertNotIn("SFFloat.__init__", summary)
+
+    def test_cache(self):
+        with sfprofile.collect() as profile:
+            sfcache.enable()
+            str(SFFloat(1.25, 2))
+        self.assertTrue(sfcache.enabled())
+        sfcache.disable()
+        self.assertNotIn("SFFloat.__str__", profile.summary())
+
+    def test_cache_import(self):
+        methods = SFFloat.__str__, SFFloat.__format__
+        with sfprofile.collect():
+            importlib.reload(sfcache)  # as if first imported while profiling
+        sfcache.enable()
+        sfcache.disable()
+        self.assertEqual((SFFloat.__str__, SFFloat.__format__), methods)
+
+    def test_nested(self):
+        profile = sfprofile.enable()
+        with self.assertRaises(RuntimeError):
+            sfprofile.enable()
+        SFFloat(1.0) + 1
+        self.assertIs(sfprofile.disable(), profile)
+        self.assertIsNone(sfprofile.disable())
+        profile.reset()
+        self.assertEqual(profile.summary(), {})
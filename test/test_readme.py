@@ -17,6 +17,8 @@ class TestReadme(unittest.TestCase):
         code = ""
         output = ""
         readoutput = ""
+        # one module namespace, so that functions defined in a block see its imports
+        namespace = dict(globals())
         for l in lines:
             if state in ["waitcode","waitoutput"] and l.find('```python') == 0:
                 code = ""
@@ -24,7 +26,7 @@ class TestReadme(unittest.TestCase):
             elif state == "readcode":
                 if l.find('```') == 0:
                     redirected_output = sys.stdout = StringIO()
-                    exec(code)
+                    exec(code, namespace)
                     output = redirected_output.getvalue()
                     sys.stdout = old_stdout
                     state = "waitoutput"
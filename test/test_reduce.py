@@ -0,0 +1,83 @@
+import functools
+import math
+import operator
+import random
+import statistics
+import unittest
+from sffloat import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestReduceMethods(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.xs = [SFFloat(rng.uniform(-100, 100), rng.randrange(1, 6)) for _ in range(50)]
+        self.xs += [SFFloat(rng.uniform(0, 1), lsd=rng.randrange(-6, 0)) for _ in range(50)]
+        self.xs += [rng.uniform(-1, 1), SFFloat(2.5), 3]
+        rng.shuffle(self.xs)
+
+    def test_sfsum(self):
+        expected = sum(self.xs)
+        result = sfsum(self.xs)
+        self.assertEqual(result.lsd, expected.lsd)
+        self.assertEqual(result.value, math.fsum(float(x) for x in self.xs))
+        self.assertEqual(str(sfsum(x for x in self.xs)), str(result))
+        self.assertEqual(str(sffsum(self.xs)), str(result))
+        self.assertEqual(str(sfsum([SFFloat(0.00123, 3), SFFloat(0.1234, 4)])), '0.1246')
+
+    def test_sfsum_accuracy(self):
+        values = [SFFloat(1e16, 3), SFFloat(1.0, 3), SFFloat(-1e16, 3)] * 10
+        self.assertEqual(sfsum(values).value, 10.0)
+
+    def test_sfprod(self):
+        factors = [x for x in self.xs if float(x) and (not isinstance(x, SFFloat) or x.sigfigs > 0)]
+        expected = functools.reduce(operator.mul, factors, 1.0)
+        result = sfprod(factors)
+        self.assertEqual(result.value, expected.value)
+        self.assertEqual(result.sigfigs, expected.sigfigs)
+        self.assertEqual(str(sfprod([SFFloat(3.4, 2), SFFloat(3.4, 2), math.pi])), '36')
+        with self.assertRaises(ValueError):
+            sfprod([SFFloat(2.0), SFFloat(0.001, lsd=0)])
+
+    def test_sfmean(self):
+        values = [SFFloat(1.23, 3), SFFloat(4.567, 4), 2.0]
+        result = sfmean(values)
+        self.assertEqual(result.lsd, -2)
+        self.assertEqual(result.value, statistics.fmean([1.23, 4.567, 2.0]))
+        self.assertEqual(str(result), '2.60')
+        with self.assertRaises(ValueError):
+            sfmean([])
+
+    def test_sfstdev(self):
+        values = [SFFloat(1.23, 3), SFFloat(4.567, 4), SFFloat(2.0, 2), SFFloat(3.14, 3)]
+        result = sfstdev(iter(values))
+        self.assertEqual(result.lsd, -1)
+        self.assertAlmostEqual(result.value, statistics.stdev([1.23, 4.567, 2.0, 3.14]))
+        self.assertEqual(str(result), '1.5')
+        with self.assertRaises(ValueError):
+            sfstdev([SFFloat(1.0, 2)])
+
+    def test_floats(self):
+        self.assertEqual(sfsum([1.5, 2.5]), 4.0)
+        self.assertIs(type(sfsum([1.5, 2.5])), float)
+        self.assertIs(type(sfprod([])), float)
+        self.assertEqual(repr(sfsum([SFFloat(1.5), 2.5])), 'SFFloat(4.0)')
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_batches(self):
+        values = [x if isinstance(x, SFFloat) else SFFloat(x) for x in self.xs]
+        batches = [SFArray(values[i:i + 16]) for i in range(0, len(values), 16)]
+        self.assertEqual(str(sfsum(iter(batches))), str(sfsum(values)))
+        self.assertEqual(str(sfsum(SFArray(values))), str(sfsum(values)))
+        self.assertEqual(str(sfmean(batches)), str(sfmean(values)))
+        self.assertEqual(str(sfstdev(batches)), str(sfstdev(values)))
+        factors = [x for x in values if x.value and x.sigfigs > 0]
+        self.assertEqual(repr(sfprod(SFArray(factors))), repr(sfprod(factors)))
+        self.assertEqual(repr(sfprod([SFArray([]), SFFloat(2.0, 3)])), 'SFFloat(2.0,3)')
+        large = [SFFloat(x * 0.001, 3) for x in range(1, 10001)]  # several chunks
+        self.assertEqual(repr(sfsum(SFArray(large))), repr(sfsum(large)))
+        self.assertEqual(repr(sfmean(SFArray(large))), repr(sfmean(large)))
@@ -0,0 +1,70 @@
+import copy
+import io
+import os
+import pickle
+import tempfile
+import unittest
+from math import pi
+from sffloat import SFFloat, SFArray
+
+try:
+    import numpy as np
+    from sffloat import sfstore
+except ImportError:
+    np = None
+
+
+class TestPickle(unittest.TestCase):
+    def test_pickle(self):
+        values = [SFFloat(pi, 4), SFFloat(2.5), SFFloat(1.23, lsd=1)]
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            for value in values:
+                loaded = pickle.loads(pickle.dumps(value, protocol))
+                self.assertEqual(loaded, value)
+                self.assertEqual(loaded.lsd, value.lsd)
+        self.assertEqual(copy.copy(values[0]), values[0])
+        self.assertEqual(copy.deepcopy(values), values)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestStore(unittest.TestCase):
+    def setUp(self):
+        self.values = [SFFloat(pi, 4), SFFloat(2.5), SFFloat(-1.5e-20, 3),
+                       SFFloat(1.23e30, 2), 7.0, SFFloat(1.23, lsd=1)]
+
+    def test_bytes(self):
+        for lsd_dtype in ("int16", "int8"):
+            data = sfstore.dumps(self.values, lsd_dtype)
+            self.assertEqual(len(data), 32 + len(self.values) * (8 + (lsd_dtype == "int16") + 1))
+            loaded = sfstore.loads(data)
+            self.assertEqual(loaded.tolist(), [SFFloat(v) for v in self.values])
+
+    def test_zero_copy(self):
+        data = bytearray(sfstore.dumps(SFArray(self.values)))
+        loaded = sfstore.loads(data)
+        self.assertFalse(loaded.value.flags.owndata)
+        self.assertFalse(loaded.lsd.flags.owndata)
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'values.sff')
+            sfstore.save(path, self.values)
+            for mmap in (True, False):
+                loaded = sfstore.load(path, mmap=mmap)
+                self.assertEqual(loaded[0], SFFloat(pi, 4))
+                self.assertEqual(loaded.tolist(), [SFFloat(v) for v in self.values])
+                self.assertEqual(str(loaded + 2), str(SFArray(self.values) + 2))
+            del loaded
+            sfstore.save(path, [])
+            self.assertEqual(len(sfstore.load(path)), 0)
+        stream = io.BytesIO()
+        sfstore.save(stream, self.values, "int8")
+        self.assertEqual(sfstore.loads(stream.getvalue()).tolist(),
+                         [SFFloat(v) for v in self.values])
+
+    def test_except(self):
+        self.assertRaises(ValueError, lambda: sfstore.loads(b'NOTSFFLOAT' + bytes(30)))
+        self.assertRaises(ValueError, lambda: sfstore.loads(b'SFF'))
+        self.assertRaises(ValueError, lambda: sfstore.dumps(self.values, "float32"))
+        self.assertRaises(OverflowError,
+                          lambda: sfstore.dumps([SFFloat(1.0, lsd=-200)], "int8"))
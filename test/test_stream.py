@@ -0,0 +1,122 @@
+import asyncio
+import time
+import unittest
+from sffloat import SFFloat, sfmath, sfsum
+from sffloat.sfparse import parse
+
+try:
+    import numpy as np
+    from sffloat import sfstream
+except ImportError:
+    np = None
+
+
+async def collect(stage):
+    return [item async for item in stage]
+
+
+async def slow_feed(lines, delay):
+    for line in lines:
+        await asyncio.sleep(delay)
+        yield line
+
+
+async def failing_feed():
+    yield "1.5 2.5"
+    raise OSError("connection lost")
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestStreamMethods(unittest.TestCase):
+    def setUp(self):
+        self.lines = [f"{i * 0.0137:.4f} {i}00" for i in range(1000)]
+        self.values = [parse(text) for line in self.lines for text in line.split()]
+
+    def run_stage(self, stage):
+        return asyncio.run(collect(stage))
+
+    def test_parse(self):
+        feed = sfstream.memory_feed(self.lines)
+        batches = self.run_stage(sfstream.parse(feed, batch_size=300))
+        self.assertEqual([len(batch) for batch in batches], [300] * 6 + [200])
+        values = [item for batch in batches for item in batch]
+        self.assertEqual([str(v) for v in values], [str(v) for v in self.values])
+        self.assertEqual([v.sigfigs for v in values], [v.sigfigs for v in self.values])
+        batches = self.run_stage(sfstream.parse(sfstream.memory_feed([b"1.20 3", b"4e2\n"])))
+        self.assertEqual(str(batches[0]), '[1.20, 3, 400]')
+
+    def test_latency(self):
+        feed = slow_feed(["1.5", "2.25", "3.125"], 0.05)
+        batches = self.run_stage(sfstream.parse(feed, latency=0.01))
+        self.assertEqual([str(batch) for batch in batches], ['[1.5]', '[2.25]', '[3.125]'])
+
+    def test_pipeline(self):
+        async def pipeline():
+            batches = sfstream.parse(sfstream.memory_feed(self.lines), batch_size=128)
+            return await collect(sfstream.format(sfstream.transform(batches, sfmath.sin)))
+        texts = asyncio.run(pipeline())
+        self.assertEqual("".join(texts),
+                         "".join(f"{value}\n" for value in sfmath.sin(self.values)))
+
+    def test_reduce(self):
+        batches = sfstream.parse(sfstream.memory_feed(self.lines), batch_size=500)
+        sums = self.run_stage(sfstream.reduce(batches, sfsum))
+        self.assertEqual([str(s) for s in sums],
+                         [str(sfsum(self.values[i:i + 500])) for i in range(0, 2000, 500)])
+        texts = self.run_stage(sfstream.format(sfstream.reduce(
+            sfstream.parse(sfstream.memory_feed(["1.5 2.5"])))))
+        self.assertEqual(texts, ['2.0\n'])
+
+    def test_backpressure(self):
+        read = []
+
+        async def counted(lines):
+            for line in lines:
+                read.append(line)
+                yield line
+
+        async def pipeline():
+            batches = sfstream.parse(counted(self.lines), batch_size=100)
+            first = await batches.__anext__()
+            await asyncio.sleep(0.05)
+            held = len(read)
+            rest = await collect(batches)
+            return first, held, rest
+        first, held, rest = asyncio.run(pipeline())
+        # the reader stops with at most two batches (100 lines) waiting
+        self.assertLessEqual(held, 151)
+        self.assertEqual(len(first) + sum(len(batch) for batch in rest), 2000)
+
+    def test_responsive(self):
+        async def pipeline():
+            lags = []
+
+            async def ticker():
+                while True:
+                    start = time.perf_counter()
+                    await asyncio.sleep(0.001)
+                    lags.append(time.perf_counter() - start)
+            task = asyncio.create_task(ticker())
+            lines = self.lines * 20
+            batches = sfstream.transform(sfstream.parse(sfstream.memory_feed(lines)),
+                                         sfmath.sin)
+            await collect(sfstream.format(batches))
+            task.cancel()
+            return max(lags)
+        self.assertLess(asyncio.run(pipeline()), 0.25)
+
+    def test_rate(self):
+        start = time.perf_counter()
+        lines = self.run_stage(sfstream.memory_feed(["1.0"] * 5, rate=100))
+        self.assertEqual(len(lines), 5)
+        self.assertGreater(time.perf_counter() - start, 0.035)
+
+    def test_errors(self):
+        with self.assertRaises(OSError):
+            self.run_stage(sfstream.parse(failing_feed()))
+        with self.assertRaises(ValueError):
+            self.run_stage(sfstream.parse(sfstream.memory_feed(["1.5 x"])))
+        with self.assertRaises(ValueError):
+            self.run_stage(sfstream.parse(sfstream.memory_feed([]), batch_size=0))
+        with self.assertRaises(ValueError):
+            self.run_stage(sfstream.transform(sfstream.memory_feed([]), sfmath.sin, pending=0))
@@ -0,0 +1,85 @@
+import io
+import random
+import unittest
+from sffloat import SFFloat
+from sffloat.sfformat import format_sigfigs
+from sffloat.sfparse import iter_rows
+from sffloat.sftable import format_many, write_columns
+
+try:
+    import numpy as np
+    from sffloat import SFArray
+except ImportError:
+    np = None
+
+
+def corpus():
+    # edge cases (ties, carries, powers of ten, zero) plus a reproducible sample
+    values = [SFFloat(2.675, 3), SFFloat(9.996, 3), SFFloat(999.96, 4), SFFloat(0.0, 3),
+              SFFloat(-0.0, 2), SFFloat(1000.0, 4), SFFloat(0.001, 2), SFFloat(0.5, lsd=0),
+              SFFloat(1.5, lsd=0), SFFloat(123.0, lsd=1), SFFloat(0.0004, lsd=-2),
+              SFFloat(9.5e5, 1), SFFloat(1e-320, 2), SFFloat(1.7976931348623157e308, 3),
+              SFFloat(0.1 + 0.2, 17), SFFloat(0.25), 0.1 + 0.2, 1e22]
+    rand = random.Random(4321)
+    for _ in range(3000):
+        places = rand.randint(0, 6)
+        val = round(rand.uniform(-1200, 1200), places)
+        val += rand.choice([0, 0, 0.5 * 10 ** -places, 0.5 * 10 ** (1 - places)])
+        values.append(SFFloat(val, lsd=-rand.randint(0, 6)))
+        val = rand.random() * 10 ** rand.randint(-30, 30)
+        values.append(SFFloat(val, rand.randint(1, 17)))
+    return values
+
+
+def in_notation(value, notation):
+    if not isinstance(value, SFFloat) or value.lsd is None:
+        return str(value)
+    return format_sigfigs(value.value, value.sigfigs, notation) if value.sigfigs > 0 else "0"
+
+
+class TestTableMethods(unittest.TestCase):
+    def test_str(self):
+        values = corpus() + [3, "n/a", SFFloat(2.5)]
+        self.assertEqual(format_many(values), [str(value) for value in values])
+        self.assertEqual(format_many(iter(values[:5])), [str(value) for value in values[:5]])
+        self.assertEqual(format_many([]), [])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_array(self):
+        array = SFArray([value for value in corpus() if abs(float(value)) < 1e300])
+        self.assertEqual(format_many(array), [str(value) for value in array])
+
+    def test_notation(self):
+        values = corpus()
+        for notation in ("std", "sci"):
+            self.assertEqual(format_many(values, notation),
+                             [in_notation(value, notation) for value in values])
+        self.assertEqual(format_many([SFFloat(1234.5, 3), 2.5], "std"), ['1230', '2.5'])
+        with self.assertRaises(ValueError):
+            format_many(values, "eng")
+
+    def test_align(self):
+        values = [SFFloat(1.25, 3), SFFloat(-12.5, 3), SFFloat(1234.0, 2), 0.5]
+        self.assertEqual(format_many(values, align="left"),
+                         ['1.25 ', '-12.5', '1.2E3', '0.5  '])
+        self.assertEqual(format_many(values, align="right"),
+                         [' 1.25', '-12.5', '1.2E3', '  0.5'])
+        self.assertEqual(format_many(values, align="decimal"),
+                         ['  1.25 ', '-12.5  ', '  1.2E3', '  0.5  '])
+        with self.assertRaises(ValueError):
+            format_many(values, align="center")
+
+    def test_write(self):
+        times = [SFFloat(0.5, 2), SFFloat(1.0, 2), SFFloat(1.5, 2)]
+        readings = [SFFloat(12.25, 4), SFFloat(9.996, 3), SFFloat(1234.5, 5)]
+        file = io.StringIO()
+        write_columns(file, [times, readings], header=["t", "reading"])
+        self.assertEqual(file.getvalue(), "t,reading\n0.50,12.25\n1.0,10.0\n1.5,1.2345E3\n")
+        rows = list(iter_rows(io.StringIO(file.getvalue()), skip=1))
+        self.assertEqual([[str(v) for v in row] for row in rows],
+                         [[str(t), str(r)] for t, r in zip(times, readings)])
+        file = io.StringIO()
+        write_columns(file, [times], delimiter="\t", notation="sci")
+        self.assertEqual(file.getvalue(), "5.0E-1\n1.0E0\n1.5E0\n")
+        with self.assertRaises(ValueError):
+            write_columns(io.StringIO(), [times, readings[:2]])
@@ -0,0 +1,88 @@
+import copy
+import gc
+import pickle
+import unittest
+from math import pi
+from sffloat import *
+from sffloat import sftrace
+
+
+def steps(value):
+    return [(node.label, node.sigfigs, node.lsd) for node in value.lineage]
+
+
+class TestTraceMethods(unittest.TestCase):
+    def test_input(self):
+        self.assertEqual(steps(SFTraced(3.4, 2, label="r")), [('r', 2, -1)])
+        self.assertEqual(steps(SFTraced(0.25, lsd=-2)), [('0.25', 2, -2)])
+        self.assertEqual(SFTraced(2.0).lineage, [])
+        value = SFTraced(1.5, 2)
+        self.assertIs(SFTraced(value), value)
+
+    def test_additive(self):
+        a, b = SFTraced(12.5, lsd=-1, label="a"), SFTraced(0.125, lsd=-3, label="b")
+        self.assertEqual(steps(a + b), [('a', 3, -1)])
+        self.assertEqual(steps(b - a), [('a', 3, -1)])
+        self.assertEqual(steps(b + 1.0), [('+', 4, -3), ('b', 3, -3)])
+        self.assertEqual(steps(b + SFFloat(2.5, lsd=-1)), [('2.5', 2, -1)])
+        self.assertEqual(steps(SFFloat(2.5, lsd=-1) + b), [('2.5', 2, -1)])
+        c = SFTraced(10.0, lsd=-1, label="c")
+        self.assertEqual(steps(SFTraced(10.25, lsd=-2) - c), [('-', 1, -1), ('c', 3, -1)])
+
+    def test_multiplicative(self):
+        x, y = SFTraced(1.2345, 5, label="x"), SFTraced(100.0, lsd=0, label="y")
+        self.assertEqual(steps((x * 3 - y) * x), [('-', 2, 0), ('y', 3, 0)])
+        self.assertEqual(steps(pi * SFTraced(3.4, 2, label="r") ** 2), [('r', 2, -1)])
+        self.assertEqual(steps(2 ** SFTraced(3.0, 1, label="e")), [('e', 1, 0)])
+        self.assertEqual(steps(1 / SFTraced(3.0, 2, label="d")), [('d', 2, -1)])
+        self.assertEqual(steps(x / SFFloat(2.0, 2)), [('2.0', 2, -1)])
+        self.assertEqual(steps(SFFloat(2.0, 2) * x), [('2.0', 2, -1)])
+        self.assertEqual(steps(-abs(x)), steps(x))
+
+    def test_explain(self):
+        a = SFTraced(10.25, lsd=-2, label="a")
+        b = SFTraced(10.0, lsd=-1, label="b")
+        self.assertEqual(((a - b) * SFTraced(2.5, 4) + 1).explain(),
+                         "1.6 has 2 sigfigs, lsd -1\n"
+                         "  + at lsd -1 left 2 sigfigs\n"
+                         "  - at lsd -1 left 1 sigfigs\n"
+                         "  from input b with 3 sigfigs, lsd -1")
+        self.assertEqual(SFTraced(2.0).explain(), '2.0 has unlimited sigfigs')
+
+    def test_shared(self):
+        a, b = SFTraced(1.5, 2, label="a"), SFTraced(2.25, 3, label="b")
+        self.assertIs((a + b)._lineage, (b + a)._lineage)
+        self.assertIs((a * b)._lineage, a._lineage)
+        acc = SFTraced(1.0, lsd=-3, label="start")
+        for _ in range(1000):
+            acc = acc * SFFloat(1.001, lsd=-3) + SFTraced(0.5, lsd=-2)
+        self.assertEqual(steps(acc), [('1.001', 4, -3)])
+
+    def test_freed(self):
+        gc.collect()
+        count = len(sftrace._NODES)
+        value = SFTraced(99.5, lsd=-1, label="temporary") - SFTraced(99.0, lsd=-1)
+        self.assertGreater(len(sftrace._NODES), count)
+        del value
+        gc.collect()
+        self.assertEqual(len(sftrace._NODES), count)
+
+    def test_values(self):
+        a, b = SFTraced(12.5, 3), SFTraced(0.5, 1)
+        plain_a, plain_b = SFFloat(12.5, 3), SFFloat(0.5, 1)
+        for result, expected in [(a + b, plain_a + plain_b), (a * b, plain_a * plain_b),
+                                 (a / b, plain_a / plain_b), (a ** b, plain_a ** plain_b),
+                                 (plain_a - b, plain_a - plain_b)]:
+            self.assertIsInstance(result, SFTraced)
+            self.assertEqual(result, expected)
+            self.assertEqual(str(result), str(expected))
+        self.assertEqual(pickle.loads(pickle.dumps(a)), a)
+        x, y = SFTraced(2.0, 3, label="x"), SFTraced(3.0, 2, label="y")
+        c = x * y + SFTraced(0.25, lsd=-2)
+        for other in [pickle.loads(pickle.dumps(c)), copy.copy(c), copy.deepcopy(c)]:
+            self.assertIsInstance(other, SFTraced)
+            self.assertEqual(other, c)
+            self.assertEqual(other.lineage, c.lineage)
+            self.assertEqual(other.explain(), c.explain())
+        self.assertEqual(pickle.loads(pickle.dumps(x * y)).lineage[-1].label, "y")
+        self.assertNotIsInstance(plain_a + plain_b, SFTraced)
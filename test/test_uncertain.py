@@ -0,0 +1,172 @@
+import copy
+import math
+import pickle
+import unittest
+from sffloat import *
+from sffloat import sfmath, sfparallel, sfstore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestUncertainMethods(unittest.TestCase):
+    def test_create(self):
+        x = SFUncertain(1.234, 0.05)
+        self.assertEqual((x.value, x.uncertainty, x.lsd, x.sigfigs), (1.234, 0.05, -2, 3))
+        self.assertEqual(SFUncertain(1.234, 0.096).lsd, -1)
+        self.assertEqual(SFUncertain(1234.0, 20).lsd, 1)
+        self.assertEqual(SFUncertain(SFFloat(1.5, 2)).uncertainty, 0.05)
+        self.assertEqual(SFUncertain("2.5").lsd, None)
+        self.assertIs(SFUncertain(x), x)
+        self.assertEqual(SFUncertain(x, 0.5).lsd, -1)
+        for bad in [-0.1, float("inf"), float("nan")]:
+            with self.assertRaises(ValueError):
+                SFUncertain(1.0, bad)
+
+    def test_arithmetic(self):
+        x, y = SFUncertain(1.234, 0.05), SFUncertain(2.0, 0.1)
+        for result, val, err in [
+            (x + y, 3.234, math.hypot(0.05, 0.1)),
+            (x - y, -0.766, math.hypot(0.05, 0.1)),
+            (x * y, 2.468, math.hypot(2.0 * 0.05, 1.234 * 0.1)),
+            (x / y, 0.617, math.hypot(0.05 / 2.0, 1.234 * 0.1 / 4.0)),
+            (x ** y, 1.234 ** 2, math.hypot(2 * 1.234 * 0.05, 1.234 ** 2 * math.log(1.234) * 0.1)),
+            (3 * x, 3.702, 0.15),
+            (1 - x, -0.234, 0.05),
+            (2 ** x, 2 ** 1.234, 2 ** 1.234 * math.log(2) * 0.05),
+            (x + SFFloat(1.5, 2), 2.734, math.hypot(0.05, 0.05)),
+            (-x, -1.234, 0.05),
+            (abs(-x), 1.234, 0.05),
+        ]:
+            self.assertIsInstance(result, SFUncertain)
+            self.assertAlmostEqual(result.value, val)
+            self.assertAlmostEqual(result.uncertainty, err)
+        self.assertEqual((SFUncertain(2.0) * 3.0).lsd, None)
+        with self.assertRaises(ZeroDivisionError):
+            x / 0
+        with self.assertRaises(TypeError):
+            x + "1"
+
+    def test_math(self):
+        x, y = SFUncertain(0.5, 0.01), SFUncertain(2.0, 0.1)
+        for func, derivative in [
+            (sfsin, math.cos), (sfcos, lambda v: -math.sin(v)),
+            (sftan, lambda v: 1 / math.cos(v) ** 2), (sflog, lambda v: 1 / v),
+            (sflog10, lambda v: 1 / (v * math.log(10))), (sfexp, math.exp),
+            (sfasin, lambda v: 1 / math.sqrt(1 - v * v)),
+            (sfacos, lambda v: -1 / math.sqrt(1 - v * v)),
+            (sfatan, lambda v: 1 / (1 + v * v)), (sfsqrt, lambda v: 0.5 / math.sqrt(v)),
+            (sfdegrees, lambda v: 180 / math.pi), (sfradians, lambda v: math.pi / 180),
+            (sfsinh, math.cosh), (sflog2, lambda v: 1 / (v * math.log(2))),
+            (sfcbrt, lambda v: v ** (-2 / 3) / 3),
+        ]:
+            result = func(x)
+            self.assertIsInstance(result, SFUncertain)
+            self.assertAlmostEqual(result.uncertainty, abs(derivative(0.5)) * 0.01)
+        self.assertAlmostEqual(sfpow(x, y).uncertainty, (x ** y).uncertainty)
+        self.assertAlmostEqual(sfatan2(x, y).uncertainty,
+                               math.hypot(2.0 * 0.01, 0.5 * 0.1) / 4.25)
+        self.assertAlmostEqual(sfatan2(x, 2.0).value, math.atan2(0.5, 2.0))
+        # the derivative of tanh does not overflow for large arguments
+        result = sftanh(SFUncertain(400.0, 0.1))
+        self.assertEqual((result.value, result.uncertainty), (1.0, 0.0))
+        self.assertAlmostEqual(sftanh(SFUncertain(20.0, 0.1)).uncertainty,
+                               0.1 / math.cosh(20.0) ** 2, places=20)
+        # functions without listed derivatives use a secant
+        erf = SFFloat.funcwrapper(math.erf, x)
+        self.assertAlmostEqual(erf.uncertainty, 2 / math.sqrt(math.pi) * math.exp(-0.25) * 0.01,
+                               places=6)
+        self.assertIsInstance(sfsin(SFFloat(0.5, 2)), SFFloat)
+        self.assertNotIsInstance(sfsin(SFFloat(0.5, 2)), SFUncertain)
+        self.assertEqual([type(r) for r in sfmath.sin([x, 0.5])], [SFUncertain, float])
+
+    def test_reduce(self):
+        for func in [sfsum, sfprod, sfmean, sfstdev]:
+            with self.assertRaises(TypeError):
+                func([SFUncertain(1.0, 0.1)] * 2)
+            with self.assertRaises(TypeError):
+                func(iter([1.0, SFFloat(2.0, 2), SFUncertain(1.0, 0.1)]))
+
+    def test_format(self):
+        x = SFUncertain(1.234, 0.05)
+        self.assertEqual(str(x), '1.23')
+        self.assertEqual(f"{x:pm}", '1.23 ± 0.05')
+        self.assertEqual(f"{SFUncertain(1234.0, 20):pm}", '1.23E3 ± 20')
+        self.assertEqual(f"{SFUncertain(2.5):pm}", '2.5 ± 0')
+        self.assertEqual(f"{x:.3f}", '1.230')
+        self.assertEqual(repr(x), 'SFUncertain(1.234, 0.05)')
+
+    def test_copy(self):
+        x = SFUncertain(1.234, 0.05)
+        for other in [pickle.loads(pickle.dumps(x)), copy.copy(x), x.copy()]:
+            self.assertIsInstance(other, SFUncertain)
+            self.assertEqual((other.value, other.uncertainty), (x.value, x.uncertainty))
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestUncertainArrayMethods(unittest.TestCase):
+    def setUp(self):
+        self.a = SFUncertainArray([0.25, 0.5, 0.75, 0.9], [0.01, 0.002, 0.0, 0.03])
+        self.b = SFUncertainArray(SFArray([2.0, 1.5, 4.0, 3.1], 2))
+
+    def assertMatches(self, array, scalars):
+        self.assertIsInstance(array, SFUncertainArray)
+        self.assertEqual(len(array), len(scalars))
+        for item, scalar in zip(array, scalars):
+            self.assertAlmostEqual(item.value, scalar.value)
+            self.assertAlmostEqual(item.uncertainty, scalar.uncertainty)
+            self.assertEqual(item.lsd, scalar.lsd)
+
+    def test_create(self):
+        self.assertTrue(np.array_equal(self.b.uncertainty, [0.05, 0.05, 0.05, 0.05]))
+        self.assertEqual(self.a.lsd.tolist(), [-2, -3, SFArray.LSD_INF, -2])
+        items = SFUncertainArray([SFUncertain(1.5, 0.2), SFFloat(2.5, 2), 3.0])
+        self.assertEqual(items.uncertainty.tolist(), [0.2, 0.05, 0.0])
+        self.assertEqual(SFUncertainArray(np.array([1.0, 2.0])).uncertainty.tolist(), [0.0, 0.0])
+        self.assertEqual(str(self.a), '[0.25, 0.500, 0.75, 0.90]')
+        self.assertEqual(repr(self.a[1]), 'SFUncertain(0.5, 0.002)')
+        self.assertEqual(self.a[1:3].uncertainty.tolist(), [0.002, 0.0])
+        with self.assertRaises(ValueError):
+            SFUncertainArray([1.0, 2.0], -1.0)
+
+    def test_arithmetic(self):
+        a, b, x = self.a, self.b, SFUncertain(1.5, 0.1)
+        pairs = list(zip(a, b))
+        self.assertMatches(a + b, [p + q for p, q in pairs])
+        self.assertMatches(a - b, [p - q for p, q in pairs])
+        self.assertMatches(a * b, [p * q for p, q in pairs])
+        self.assertMatches(a / b, [p / q for p, q in pairs])
+        self.assertMatches(a ** b, [p ** q for p, q in pairs])
+        self.assertMatches(2 ** a, [2 ** p for p in a])
+        self.assertMatches(a * x, [p * x for p in a])
+        self.assertMatches(x - a, [x - p for p in a])
+        self.assertMatches(SFArray([1.0, 2.0, 3.0, 4.0], 3) + a,
+                           [SFFloat(v, 3) + p for v, p in zip([1.0, 2.0, 3.0, 4.0], a)])
+        self.assertMatches(-a, [-p for p in a])
+        with self.assertRaises(ZeroDivisionError):
+            a / SFUncertainArray([1.0, 0.0, 1.0, 1.0])
+
+    def test_math(self):
+        a, b = self.a, self.b
+        for name in ["sin", "cos", "tan", "log", "log10", "asin", "acos", "atan", "exp",
+                     "sqrt", "degrees", "radians", "sinh", "log2", "cbrt"]:
+            func = getattr(sfmath, name)
+            self.assertMatches(func(a), [func([p])[0] for p in a])
+        self.assertMatches(sfmath.atan2(a, b), [sfatan2(p, q) for p, q in zip(a, b)])
+        self.assertMatches(sfmath.pow(a, 2.0), [sfpow(p, 2.0) for p in a])
+        with self.assertRaises(ValueError):
+            sfmath.log(-a)
+        for func in [sfsum, sfprod, sfmean, sfstdev]:
+            with self.assertRaises(TypeError):
+                func(a)
+        large = SFUncertainArray([400.0, 20.0], 0.1)
+        self.assertMatches(sfmath.tanh(large), [sftanh(p) for p in large])
+
+    def test_store(self):
+        self.assertRaises(TypeError, sfstore.dumps, self.a)
+        self.assertRaises(TypeError, sfstore.dumps, [SFFloat(1.0, 2), SFUncertain(1.0, 0.1)])
+        self.assertRaises(TypeError, sfparallel.map, lambda v: v, self.a, workers=1)
+        self.assertRaises(TypeError, sfparallel.map, lambda v: v, self.a, workers=2,
+                          threads=True)
@@ -0,0 +1,180 @@
+import copy
+import operator
+import pickle
+import unittest
+from sffloat import *
+from sffloat import sfmath, sfparallel, sfstore
+from sffloat.sfunits import Unit, DimensionError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestUnitMethods(unittest.TestCase):
+    def test_parse(self):
+        force = Unit.parse("kg*m/s^2")
+        self.assertIs(force, Unit.parse("kg m / s**2"))
+        self.assertIs(force, Unit.parse("kg") * Unit.parse("m") / Unit.parse("s") ** 2)
+        self.assertEqual((force.dimension, force.scale), (Unit.parse("N").dimension, 1.0))
+        self.assertEqual(str(Unit.parse("1/s")), '1/s')
+        self.assertEqual(str(Unit.parse("m*m/m")), 'm')
+        self.assertTrue(Unit.parse("rad").dimensionless)
+        self.assertAlmostEqual(Unit.parse("km/h").factor_to("m/s"), 1 / 3.6)
+        self.assertAlmostEqual(Unit.parse("us").factor_to("s"), 1e-6)
+        self.assertIs(pickle.loads(pickle.dumps(force)), force)
+        for bad in ["furlong", "/s", "kmin", "m^x"]:
+            with self.assertRaises(ValueError):
+                Unit.parse(bad)
+        with self.assertRaises(DimensionError):
+            Unit.parse("m").factor_to("s")
+        with self.assertRaises(ValueError):
+            Unit.parse("m") ** 0.5
+
+
+class TestQuantityMethods(unittest.TestCase):
+    def test_create(self):
+        d = SFQuantity(1.50, 3, "km")
+        self.assertEqual((d.value, d.sigfigs, str(d.unit)), (1.5, 3, 'km'))
+        self.assertEqual(d.magnitude, SFFloat(1.5, 3))
+        self.assertNotIsInstance(d.magnitude, SFQuantity)
+        self.assertEqual(SFQuantity(2.5, lsd=-2, unit="s").sigfigs, 3)
+        self.assertEqual(str(SFQuantity(2.5)), '2.5')
+        self.assertEqual(repr(d), "SFQuantity(1.5,3,'km')")
+        self.assertEqual(repr(SFQuantity(1.5, unit="m")), "SFQuantity(1.5, unit='m')")
+        self.assertEqual(f"{d:.3f}", '1.500 km')
+
+    def test_additive(self):
+        d, e = SFQuantity(1.50, 3, "km"), SFQuantity(250, 3, "m")
+        for result, text in [(d + e, '1.75 km'), (e + d, '1.75E3 m'), (d - e, '1.25 km'),
+                             (e - d, '-1.25E3 m'), (-d, '-1.50 km'), (abs(-d), '1.50 km')]:
+            self.assertIsInstance(result, SFQuantity)
+            self.assertEqual(str(result), text)
+        self.assertEqual(str(SFQuantity(90, 2, "deg") + 1.0), '147 deg')
+        self.assertEqual(str(SFQuantity(0.5, 2, "rad") + SFFloat(1.0, 2)), '1.5 rad')
+        with self.assertRaises(DimensionError):
+            d + SFQuantity(1.0, 2, "s")
+        with self.assertRaises(DimensionError):
+            d + 1.0
+        with self.assertRaises(TypeError):
+            d + "1"
+
+    def test_multiplicative(self):
+        d, t = SFQuantity(1.50, 3, "km"), SFQuantity(12.0, 3, "min")
+        for result, text in [(d / t, '0.125 km/min'), ((d / t).to("m/s"), '2.08 m/s'),
+                             (d * d, '2.25 km^2'), (d ** 2, '2.25 km^2'), (2 * d, '3.00 km'),
+                             (d / 2, '0.750 km'), (2 / d, '1.33 1/km'),
+                             (d * SFQuantity(250, 3, "m"), '375 km*m'),
+                             ((d * SFQuantity(250, 3, "m")) ** 0.5, '612 m')]:
+            self.assertIsInstance(result, SFQuantity)
+            self.assertEqual(str(result), text)
+        self.assertEqual(str(2 ** (d / SFQuantity(500, 3, "m"))), '8.00')
+        with self.assertRaises(DimensionError):
+            2 ** d
+
+    def test_math(self):
+        self.assertEqual(str(sfsqrt(SFQuantity(4.0, 2, "m^2"))), '2.0 m')
+        self.assertEqual(str(sfsqrt(SFQuantity(1.50, 3, "km") * SFQuantity(250, 3, "m"))), '612 m')
+        self.assertEqual(str(sfpow(SFQuantity(2.0, 2, "s"), 3)), '8.0 s^3')
+        self.assertEqual(sfsin(SFQuantity(30.0, 3, "deg")), sfsin(SFFloat(30.0, 3) * pi_over_180))
+        self.assertAlmostEqual(sfatan2(SFQuantity(1.0, 3, "km"), SFQuantity(1000, 3, "m")).value,
+                               0.7853981633974483)
+        with self.assertRaises(DimensionError):
+            sfsin(SFQuantity(1.0, 2, "m"))
+
+    def test_reduce(self):
+        values = [SFQuantity(1.00, 3, "m"), SFQuantity(2.00, 3, "s")]
+        for func in [sfsum, sfprod, sfmean, sfstdev]:
+            with self.assertRaises(TypeError):
+                func(values)
+            with self.assertRaises(TypeError):
+                func(iter([1.0, SFFloat(2.0, 2), SFQuantity(1.0, 2, "km")]))
+
+    def test_subclasses(self):
+        d, u, t = SFQuantity(3.0, 3, "m"), SFUncertain(2.0, 0.1), SFTraced(2.0, 3)
+        for x, y in [(u, d), (d, u)]:
+            for op in [operator.add, operator.sub, operator.mul, operator.truediv]:
+                self.assertRaises(TypeError, op, x, y)
+        self.assertRaises(TypeError, SFUncertain, d)
+        self.assertEqual(repr(t * d), "SFQuantity(6.0,3,'m')")
+        self.assertEqual(repr(d * t), "SFQuantity(6.0,3,'m')")
+        self.assertEqual(repr(t / d), "SFQuantity(0.6666666666666666,3,'1/m')")
+        self.assertRaises(DimensionError, lambda: t + d)
+        self.assertRaises(DimensionError, lambda: d + t)
+
+    def test_compare(self):
+        d = SFQuantity(1.50, 3, "km")
+        self.assertTrue(d > SFQuantity(250, 3, "m"))
+        self.assertEqual(d, SFQuantity(1500.0, 3, "m"))
+        self.assertEqual(hash(d), hash(SFQuantity(1500.0, 3, "m")))
+        self.assertNotEqual(d, SFQuantity(1.5, 3, "s"))
+        with self.assertRaises(DimensionError):
+            d < SFQuantity(1.5, 3, "s")
+
+    def test_copy(self):
+        d = SFQuantity(1.50, 3, "km")
+        for other in [pickle.loads(pickle.dumps(d)), copy.copy(d), d.copy()]:
+            self.assertIsInstance(other, SFQuantity)
+            self.assertEqual((other, other.unit), (d, d.unit))
+
+
+pi_over_180 = 0.017453292519943295
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestQuantityArrayMethods(unittest.TestCase):
+    def setUp(self):
+        self.a = SFQuantityArray([1.0, 2.0, 3.0], 3, "km")
+        self.b = SFQuantityArray([100, 200, 300], 3, "m")
+
+    def assertMatches(self, array, scalars):
+        self.assertIsInstance(array, SFQuantityArray)
+        self.assertEqual([str(item) for item in array], [str(scalar) for scalar in scalars])
+
+    def test_create(self):
+        self.assertEqual(str(self.a), '[1.00, 2.00, 3.00] km')
+        self.assertEqual(repr(self.a[1]), "SFQuantity(2.0,3,'km')")
+        self.assertEqual(str(self.a[1:]), '[2.00, 3.00] km')
+        items = SFQuantityArray([SFQuantity(1.50, 3, "km"), SFQuantity(250, 3, "m")])
+        self.assertEqual(str(items), '[1.50, 0.250] km')
+        self.assertEqual(str(self.a.to("m")), '[1.00E3, 2.00E3, 3.00E3] m')
+        self.assertEqual(str(self.a.copy().unit), 'km')
+
+    def test_arithmetic(self):
+        a, b, x = self.a, self.b, SFQuantity(2.0, 2, "h")
+        pairs = list(zip(a, b))
+        self.assertMatches(a + b, [p + q for p, q in pairs])
+        self.assertMatches(b - a, [q - p for p, q in pairs])
+        self.assertMatches(a * b, [p * q for p, q in pairs])
+        self.assertMatches(a / x, [p / x for p in a])
+        self.assertMatches(x / a, [x / p for p in a])
+        self.assertMatches(a ** 2, [p ** 2 for p in a])
+        self.assertMatches(-a, [-p for p in a])
+        with self.assertRaises(DimensionError):
+            a + x
+
+    def test_math(self):
+        a, b = self.a, self.b
+        self.assertMatches(sfmath.sqrt(a * b), [sfsqrt(p * q) for p, q in zip(a, b)])
+        self.assertEqual([str(item) for item in sfmath.atan2(a, b)],
+                         [str(sfatan2(p, q)) for p, q in zip(a, b)])
+        angles = SFQuantityArray([30.0, 60.0], 2, "deg")
+        self.assertEqual(str(sfmath.sin(angles)), '[0.50, 0.87]')
+        with self.assertRaises(DimensionError):
+            sfmath.sin(a)
+
+    def test_reduce(self):
+        for func in [sfsum, sfprod, sfmean, sfstdev]:
+            with self.assertRaises(TypeError):
+                func(self.a)
+            with self.assertRaises(TypeError):
+                func([SFArray([1.0, 2.0], 2), self.a])
+
+    def test_store(self):
+        self.assertRaises(TypeError, sfstore.dumps, self.a)
+        self.assertRaises(TypeError, sfstore.dumps, [SFFloat(1.0, 2), SFQuantity(1.0, 2, "m")])
+        self.assertRaises(TypeError, sfparallel.map, lambda v: v, self.a, workers=1)
+        self.assertRaises(TypeError, sfparallel.map, lambda v: v, list(self.a), workers=1)
+        to_metres = lambda v: SFQuantityArray(v, unit="m")
+        self.assertRaises(TypeError, sfparallel.map, to_metres, SFArray([1.0]), workers=1)